@@ -0,0 +1,234 @@
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from task1_roman import Roman, np
+from roman_array import RomanArray
+from roman_stream import convert_file
+
+
+def legacy_to_roman(arabicNum):
+    """Прежнее преобразование в римское число вычитанием номиналов - для сравнения."""
+    roman_num = []
+    for num, symbol in Roman._int_to_roman:
+        while arabicNum >= num:
+            roman_num.append(symbol)
+            arabicNum -= num
+    return ''.join(roman_num)
+
+
+def legacy_to_arabic(romanStr):
+    """Прежний посимвольный разбор римского числа - для сравнения."""
+    result = 0
+    i = 0
+    romanStr = romanStr.upper()
+    while i < len(romanStr):
+        if i + 1 < len(romanStr) and romanStr[i:i+2] in Roman._roman_numerals:
+            result += Roman._roman_numerals[romanStr[i:i+2]]
+            i += 2
+        else:
+            result += Roman._roman_numerals[romanStr[i]]
+            i += 1
+    return result
+
+
+class LegacyRoman:
+    """Прежний класс римского числа: экземпляр с __dict__ на каждую операцию, запись заново при каждом str."""
+
+    def __init__(x, value):
+        if value <= 0:
+            raise ValueError("Roman numbers must be positive")
+        x.value = value
+
+    def __add__(x, y):
+        return LegacyRoman(x.value + (y.value if isinstance(y, LegacyRoman) else y))
+
+    def __mul__(x, y):
+        return LegacyRoman(x.value * (y.value if isinstance(y, LegacyRoman) else y))
+
+    def __truediv__(x, y):
+        return LegacyRoman(x.value // (y.value if isinstance(y, LegacyRoman) else y))
+
+    def __str__(x):
+        return legacy_to_roman(x.value)
+
+
+def measure(func: Callable[[], Any]) -> float:
+    """Возвращает время выполнения функции в секундах."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def report(name: str, count: int, elapsed: float, baseline: float) -> None:
+    """Печатает пропускную способность и ускорение относительно прежней реализации."""
+    print(f"  {name:<28} {count / elapsed:>14,.0f} чисел/с  x{baseline / elapsed:.1f}")
+
+
+def bench_tables(count: int = 1_000_000) -> None:
+    """Преобразования через таблицы и пакетные функции против прежних вызовов по одному числу."""
+    rng = random.Random(3)
+    values = [rng.randint(1, Roman.MAX_TABLE) for _ in range(count)]
+    numerals = [legacy_to_roman(value) for value in values]
+    assert Roman.to_roman_many(values) == numerals
+    assert Roman.to_arabic_many(numerals) == values
+    print(f"{count:,} случайных чисел 1-{Roman.MAX_TABLE}")
+
+    print(" арабское -> римское")
+    baseline = measure(lambda: [legacy_to_roman(value) for value in values])
+    report('прежний toRoman', count, baseline, baseline)
+    report('toRoman по таблице', count, measure(lambda: [Roman.toRoman(value) for value in values]), baseline)
+    report('to_roman_many', count, measure(lambda: Roman.to_roman_many(values)), baseline)
+    if np is not None:
+        array = np.array(values, dtype=np.int64)
+        report('to_roman_many (numpy)', count, measure(lambda: Roman.to_roman_many(array)), baseline)
+
+    print(" римское -> арабское")
+    baseline = measure(lambda: [legacy_to_arabic(numeral) for numeral in numerals])
+    report('прежний toArabic', count, baseline, baseline)
+    report('toArabic по таблице', count, measure(lambda: [Roman.toArabic(numeral) for numeral in numerals]), baseline)
+    report('to_arabic_many', count, measure(lambda: Roman.to_arabic_many(numerals)), baseline)
+    if np is not None:
+        array = np.array(numerals)
+        report('to_arabic_many (numpy)', count, measure(lambda: Roman.to_arabic_many(array)), baseline)
+
+
+
+def bench_parse(count: int = 500_000) -> None:
+    """Строгий разбор автоматом против прежнего посимвольного разбора со срезами, без таблицы записей."""
+    rng = random.Random(4)
+    numerals = [legacy_to_roman(rng.randint(1, Roman.MAX_TABLE)) for _ in range(count)]
+    assert [Roman._parse(numeral) for numeral in numerals] == [legacy_to_arabic(numeral) for numeral in numerals]
+    print(f"{count:,} канонических записей, средняя длина {sum(map(len, numerals)) / count:.1f} символа")
+    baseline = measure(lambda: [legacy_to_arabic(numeral) for numeral in numerals])
+    report('прежний toArabic', count, baseline, baseline)
+    report('строгий автомат', count, measure(lambda: [Roman._parse(numeral) for numeral in numerals]), baseline)
+    report('нестрогий разбор', count, measure(lambda: [Roman._parse_lenient(numeral) for numeral in numerals]), baseline)
+    report('toArabic (таблица)', count, measure(lambda: [Roman.toArabic(numeral) for numeral in numerals]), baseline)
+    lowered = [numeral.lower() for numeral in numerals]
+    report('строгий автомат, строчные', count, measure(lambda: [Roman._parse(numeral) for numeral in lowered]), baseline)
+
+
+
+def _corpus(path: str, size: int, seed: int = 6) -> None:
+    """Пишет текст размером около size байт: абзацы с номерами глав, разделов и ссылками на них."""
+    rng = random.Random(seed)
+    words = "the of and to in a is that for it as was with be by on not he this are".split()
+    with open(path, 'w') as f:
+        written = 0
+        while written < size:
+            text = ' '.join(rng.choice(words) for _ in range(rng.randint(20, 60)))
+            paragraph = f"Chapter {Roman.toRoman(rng.randint(1, 3999))}. {text}, see section {Roman.toRoman(rng.randint(1, 99))}.\n"
+            written += f.write(paragraph)
+
+
+def bench_stream(size: int = 32 << 20, workers_list=(1, 2, 4)) -> None:
+    """Пропускная способность потокового преобразования: отображение в память, блоки и пул процессов."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'corpus.txt')
+        _corpus(path, size)
+        print(f"текст {os.path.getsize(path) / (1 << 20):.1f} MB, ядер: {os.cpu_count()}")
+        scenarios = [('блоки по 1 MB', dict(use_mmap=False))]
+        scenarios += [(f'mmap, процессов: {workers}', dict(workers=workers)) for workers in workers_list]
+        reference = None
+        for name, options in scenarios:
+            with open(os.path.join(tmp, 'out.txt'), 'wb') as dst:
+                stats = convert_file(path, dst, **options)
+            with open(os.path.join(tmp, 'out.txt'), 'rb') as f:
+                output = f.read()
+            reference = reference or output
+            print(f"  {name:<22} {stats['mb_per_s']:>7.1f} MB/s, чисел {stats['converted']:,}, "
+                  f"{'совпадает' if output == reference else 'ОТЛИЧАЕТСЯ'}")
+
+
+
+def bench_vinculum(max_power: int = 9, repeat: int = 20) -> None:
+    """Большие числа: прежняя запись повторением M против записи с винкулумом по группам разрядов."""
+    print(f"{'число':>8} {'M*, мс':>10} {'длина':>12} {'винкулум, мкс':>14} {'длина':>6} {'разбор, мкс':>12}")
+    for power in range(4, max_power + 1):
+        value = 10 ** power - 1
+        legacy = measure(lambda: legacy_to_roman(value))
+        numeral = Roman.toRoman(value, vinculum=True)
+        compose = measure(lambda: [Roman.toRoman(value, vinculum=True) for _ in range(repeat)]) / repeat
+        parse = measure(lambda: [Roman.toArabic(numeral) for _ in range(repeat)]) / repeat
+        print(f"{'10^' + str(power) + '-1':>8} {legacy * 1e3:>10.3f} {len(legacy_to_roman(value)):>12,} "
+              f"{compose * 1e6:>14.1f} {len(numeral):>6} {parse * 1e6:>12.1f}")
+    value = 10 ** 18 - 1
+    compose = measure(lambda: [Roman.toRoman(value, vinculum=True) for _ in range(repeat)]) / repeat
+    print(f"  10^18-1 с винкулумом: {compose * 1e6:.1f} мкс; прежним способом - 10^15 букв M")
+
+
+
+def bench_objects(count: int = 300_000) -> None:
+    """Арифметика в цикле: прежний класс с __dict__ против неизменяемых общих экземпляров с кэшем записи."""
+    print(f"{count:,} итераций (a + i) * b / c, результаты сохраняются, затем str каждого")
+
+    def run(cls):
+        a, b, c = cls(7), cls(3), cls(2)
+        results = [(a + i % 500) * b / c for i in range(count)]
+        texts = [str(result) for result in results]
+        return results, texts
+
+    reference = None
+    for name, cls in (('прежний Roman', LegacyRoman), ('Roman', Roman)):
+        elapsed = measure(lambda: run(cls))
+        tracemalloc.start()
+        results, texts = run(cls)
+        memory, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        reference = reference or texts
+        assert texts == reference
+        print(f"  {name:<14} {elapsed:.3f} с, удерживается {memory / (1 << 20):.1f} MB, пик {peak / (1 << 20):.1f} MB, "
+              f"различных объектов {len(set(map(id, results))):,}")
+
+
+
+def bench_array(count: int = 1_000_000) -> None:
+    """Поэлементная арифметика над столбцами: цикл по объектам Roman против RomanArray."""
+    if np is None:
+        print("numpy не установлен, сравнение с RomanArray пропущено")
+        return
+    rng = random.Random(9)
+    left = [rng.randint(1, 1999) for _ in range(count)]
+    right = [rng.randint(1, 1999) for _ in range(count)]
+    print(f"столбцы по {count:,} чисел")
+
+    def objects():
+        a, b = [Roman(value) for value in left], [Roman(value) for value in right]
+        total = [x + y for x, y in zip(a, b)]
+        scaled = [x * 2 / y for x, y in zip(total, b)]
+        return [str(x) for x in scaled]
+
+    def arrays():
+        a, b = RomanArray(left), RomanArray(right)
+        return (((a + b) * 2) / b).to_strings()
+
+    baseline = measure(objects)
+    assert arrays().tolist() == objects()
+    report('объекты Roman', count, baseline, baseline)
+    report('RomanArray', count, measure(arrays), baseline)
+    strings = RomanArray(left).to_strings()
+    baseline = measure(lambda: [Roman(text).value for text in strings.tolist()])
+    report('разбор: Roman(str)', count, baseline, baseline)
+    report('разбор: RomanArray.parse', count, measure(lambda: RomanArray.parse(strings)), baseline)
+
+
+BENCHMARKS = {
+    'tables': bench_tables,
+    'parse': bench_parse,
+    'stream': bench_stream,
+    'vinculum': bench_vinculum,
+    'objects': bench_objects,
+    'array': bench_array,
+}
+
+if __name__ == "__main__":
+    # Запуск выбранных бенчмарков: python benchmark.py [имя ...]
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+        print()
@@ -0,0 +1,163 @@
+import io
+import os
+import pickle
+import random
+import tempfile
+
+from task1_roman import Roman, RomanParseError, VINCULUM, np
+from roman_array import RomanArray
+from roman_stream import RomanConverter, convert_file, convert_stream
+
+def test_roman():
+    """Тестирование арифметики и преобразований римских чисел"""
+    a = Roman("XIV")
+    b = Roman(5)
+    print(f"{a} + {b} = {a + b}, {a} - {b} = {a - b}, {a} * {b} = {a * b}, {a} / {b} = {a / b}")
+    assert str(a + b) == "XIX" and str(a / b) == "II"
+    assert Roman.toRoman(42) == "XLII" and Roman.toArabic("XX") == 20
+    assert Roman.to_roman_many([1, 4, 3999, 4000]) == ["I", "IV", "MMMCMXCIX", "MMMM"]
+    assert Roman.to_arabic_many(["MMXXIV", "xlii", "MMMM"]) == [2024, 42, 4000]
+
+def test_roman_value():
+    """Тестирование неизменяемого значения: общие экземпляры, сравнение, хеш и кэш записи"""
+    a = Roman(5)
+    assert a is Roman("V") is Roman(2) + 3 and pickle.loads(pickle.dumps(a)) is a
+    assert Roman(5000) == Roman(5000) and Roman(5000) is not Roman(5000)
+    assert Roman(3) < Roman(4) <= 4 and max(Roman(9), Roman(12)) == 12
+    assert len({Roman(10), Roman("X"), 10}) == 1
+    assert not hasattr(a, "__dict__") and str(Roman(1994)) is str(Roman(1994))
+    try:
+        a.value = 6
+    except AttributeError as e:
+        print(f"Ошибка: {e}")
+    print(f"Сортировка: {[str(r) for r in sorted([Roman(40), Roman(9), Roman(2024)])]}")
+
+def test_strict_parser():
+    """Тестирование строгого разбора: позиции ошибок и нестрогий режим"""
+    for text, position in (("IIII", 3), ("VX", 1), ("IM", 1), ("XCX", 2), ("MMXA", 3), ("", 0)):
+        try:
+            Roman.toArabic(text)
+        except RomanParseError as e:
+            print(f"Ошибка: {e}")
+            assert e.position == position
+        else:
+            raise AssertionError(f"{text!r} must be rejected")
+    # Нестрогий режим сохраняет прежнее поведение, но неизвестный символ - тоже RomanParseError
+    assert Roman.toArabic("IIII", strict=False) == 4
+    assert Roman.toArabic("IM", strict=False) == 1001
+    assert Roman("viiii", strict=False).value == 9
+    try:
+        Roman.toArabic("XIZ", strict=False)
+    except ValueError as e:
+        print(f"Ошибка: {e}")
+
+def test_parser_fuzz(count: int = 200_000, seed: int = 5):
+    """Фазз-тест: строгий разбор принимает строку тогда и только тогда, когда это запись toRoman"""
+    rng = random.Random(seed)
+    for value in range(1, 10_000):
+        numeral = Roman.toRoman(value)
+        assert Roman._parse(numeral) == value and Roman._parse(numeral.lower()) == value
+    accepted = 0
+    for _ in range(count):
+        text = ''.join(rng.choice("MDCLXVI") for _ in range(rng.randint(1, 8)))
+        try:
+            value = Roman._parse(text)
+        except RomanParseError as e:
+            assert 0 <= e.position < len(text)
+            # Префикс до ошибочного символа должен быть допустимым или пустым
+            prefix = text[:e.position]
+            assert not prefix or Roman.toRoman(Roman._parse(prefix)) == prefix
+        else:
+            assert Roman.toRoman(value) == text, text
+            accepted += 1
+    print(f"Фазз-тест: {count:,} случайных строк, канонических {accepted:,}")
+
+def test_vinculum(count: int = 20_000, seed: int = 8):
+    """Тестирование записи с винкулумом: обратимость до 10^18 и отказ от неканонических записей"""
+    assert Roman.toRoman(4000, vinculum=True) == "I" + VINCULUM + "V" + VINCULUM
+    assert Roman.toRoman(1_000_005, vinculum=True) == "I" + VINCULUM * 2 + "V"
+    assert Roman.toRoman(3999, vinculum=True) == "MMMCMXCIX"
+    print(f"10^18 = {Roman.toRoman(10 ** 18, vinculum=True)}, 10^18 - 1 = {Roman.toRoman(10 ** 18 - 1, vinculum=True)}")
+    rng = random.Random(seed)
+    values = [10 ** power + delta for power in range(19) for delta in (-1, 0, 1) if 10 ** power + delta > 0]
+    values += [rng.randint(1, 10 ** rng.randint(1, 18)) for _ in range(count)]
+    for value in values:
+        numeral = Roman.toRoman(value, vinculum=True)
+        assert Roman.toArabic(numeral) == value and Roman.toArabic(numeral.lower()) == value, value
+    assert Roman.to_roman_many([5000, 7], vinculum=True) == ["V" + VINCULUM, "VII"]
+    assert Roman.to_arabic_many(Roman.to_roman_many(values, vinculum=True)) == values
+    assert Roman.to_arabic_many(["IIII", "V" + VINCULUM], strict=False) == [4, 5000]
+    for text in ("I" + VINCULUM, "IV" + VINCULUM, "M" + VINCULUM, "I" + VINCULUM + "M", VINCULUM + "X"):
+        try:
+            Roman.toArabic(text)
+        except RomanParseError as e:
+            print(f"Ошибка: {e}")
+        else:
+            raise AssertionError(f"{text!r} must be rejected")
+    print(f"Винкулум: {len(values):,} чисел до 10^18 преобразованы туда и обратно")
+
+def test_roman_stream():
+    """Тестирование потокового преобразования: одинаковый результат при любом способе чтения"""
+    text = b"Chapter XIV. Part IIII, VX and mix; XIV_a MMXXIV\nI said MCMXCIX\n" * 2000
+    converter = RomanConverter()
+    result = b"".join(converter.convert(text))
+    print(f"Аннотация: {result[:80]!r}")
+    assert result.startswith(b"Chapter XIV (14). Part IIII, VX and mix; XIV_a MMXXIV (2024)\nI (1) said")
+    assert converter.found == 2000 * 6 and converter.converted == 2000 * 4
+    replaced = b"".join(RomanConverter("replace", min_length=2).convert(text))
+    assert replaced.startswith(b"Chapter 14. Part IIII, VX and mix; XIV_a 2024\nI said 1999\n")
+    # Блоки малого размера режут слова: хвост должен переноситься в следующий блок
+    small = io.BytesIO()
+    convert_stream(io.BytesIO(text), small, RomanConverter(), chunk_size=5)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "roman_stream.txt")
+        with open(path, "wb") as f:
+            f.write(text)
+        for options in ({}, {"use_mmap": False}, {"workers": 3}):
+            output = io.BytesIO()
+            stats = convert_file(path, output, **options)
+            assert output.getvalue() == result == small.getvalue(), options
+            print(f"convert_file {options}: {stats['converted']} чисел, {stats['mb_per_s']:.1f} MB/s")
+
+def test_roman_array():
+    """Тестирование RomanArray: арифметика по правилам Roman, ошибки с номером элемента, запись и разбор"""
+    if np is None:
+        print("RomanArray: numpy не установлен, тест пропущен")
+        return
+    column = RomanArray(["XIV", "v", "MCMXCIX", "V"], strict=False)
+    assert column.values.tolist() == [14, 5, 1999, 5]
+    assert (column + 1).to_strings().tolist() == ["XV", "VI", "MM", "VI"]
+    assert (column * RomanArray([2, 3, 1, 4])).values.tolist() == [28, 15, 1999, 20]
+    assert (column / Roman(5)).values.tolist() == [2, 1, 399, 1]
+    assert (column - 4).values.tolist() == [10, 1, 1995, 1]
+    assert [str(item) for item in column[1:3]] == ["V", "MCMXCIX"] and column[0] is Roman(14)
+    assert RomanArray.parse(column.to_strings()).values.tolist() == column.values.tolist()
+    grid = np.array([["XIV", "V" + VINCULUM], ["XIV", "I"]])
+    assert Roman.to_arabic_many(grid).tolist() == [[14, 5000], [14, 1]]
+    assert Roman.to_arabic_many(np.array([b"IX", b"IX"])).tolist() == [9, 9]
+    assert RomanArray([Roman(7), 3, "IX"]).values.tolist() == [7, 3, 9]
+    assert (RomanArray([4000]) * 1000).to_strings(vinculum=True).tolist() == ["I" + VINCULUM * 2 + "V" + VINCULUM * 2]
+    for action, error in ((lambda: column - RomanArray([1, 5, 1, 1]), ValueError),
+                          (lambda: column / 6, ValueError),
+                          (lambda: RomanArray([3, 0, 2]), ValueError),
+                          (lambda: column + 2.5, TypeError),
+                          (lambda: RomanArray([1.5]), TypeError),
+                          (lambda: column * 2 ** 62, OverflowError),
+                          (lambda: RomanArray(["XIV", "IIII"]), RomanParseError)):
+        try:
+            action()
+        except error as e:
+            print(f"Ошибка: {e}")
+        else:
+            raise AssertionError(f"{error.__name__} expected")
+    print(f"RomanArray: {column}")
+
+if __name__ == "__main__":
+    # Запуск тестирования римских чисел
+    test_roman()
+    test_roman_value()
+    test_strict_parser()
+    test_roman_array()
+    test_parser_fuzz()
+    test_vinculum()
+    test_roman_stream()
@@ -0,0 +1,158 @@
+from task1_roman import Roman, np
+
+# Наибольшее значение int64: результаты сверх него вызывают OverflowError вместо переполнения
+INT64_MAX = 2 ** 63 - 1
+
+
+class RomanArray:
+    """Столбец римских чисел в массиве int64 numpy с поэлементной арифметикой по правилам Roman."""
+
+    __slots__ = ('_values',)
+
+    def __init__(x, values, strict=True):
+        """Конструктор. Принимает целые числа, римские записи или объекты Roman; все значения положительны."""
+        if np is None:
+            raise ImportError("RomanArray requires numpy")
+        if isinstance(values, RomanArray):
+            x._values = values._values
+            return
+        array = np.asarray(values)
+        if array.ndim != 1:
+            raise ValueError("RomanArray must be one-dimensional")
+        if not array.size:
+            array = np.empty(0, dtype=np.int64)
+        elif array.dtype.kind in 'US':
+            array = RomanArray._parse(array, strict)
+        elif array.dtype.kind == 'O':
+            array = np.fromiter((item.value if isinstance(item, Roman) else Roman(item, strict).value
+                                 for item in array), dtype=np.int64, count=len(array))
+        elif array.dtype.kind in 'biu':
+            if array.dtype.kind == 'u' and array.size and array.max() > INT64_MAX:
+                raise OverflowError("Roman numbers in RomanArray must fit in int64")
+            array = array.astype(np.int64)
+        else:
+            raise TypeError("Unsupported type")
+        RomanArray._check(array, "Roman numbers must be positive")
+        array.flags.writeable = False
+        x._values = array
+
+    @classmethod
+    def _wrap(cls, array):
+        """Оборачивает уже проверенный массив int64 без копирования."""
+        x = object.__new__(cls)
+        array.flags.writeable = False
+        x._values = array
+        return x
+
+    @staticmethod
+    def _check(array, message):
+        """Проверяет, что все значения положительны; в ошибке указывается первый неверный элемент."""
+        bad = np.flatnonzero(array <= 0)
+        if bad.size:
+            raise ValueError(f"{message} (element {bad[0]}: {array[bad[0]]})")
+
+    @staticmethod
+    def _parse(strings, strict=True):
+        """Разбирает массив строк пакетно: канонические записи берутся из таблицы."""
+        return Roman.to_arabic_many(strings, strict)
+
+    @classmethod
+    def parse(cls, strings, strict=True):
+        """Создает массив из римских записей, например из столбца строк."""
+        return cls(np.asarray(strings, dtype=str), strict)
+
+    @property
+    def values(x):
+        """Значения в виде массива int64 только для чтения."""
+        return x._values
+
+    def __len__(x):
+        """Возвращает количество чисел в массиве."""
+        return len(x._values)
+
+    def __getitem__(x, index):
+        """Элемент как Roman или срез как RomanArray без копирования."""
+        if isinstance(index, slice):
+            return RomanArray._wrap(x._values[index])
+        return Roman._of(int(x._values[index]))
+
+    def __iter__(x):
+        """Перебирает элементы как объекты Roman."""
+        for value in x._values.tolist():
+            yield Roman._of(value)
+
+    def _operand(x, y, message):
+        """Приводит второй операнд к массиву или числу по правилам Roman: RomanArray, Roman или int."""
+        if isinstance(y, RomanArray):
+            if len(y) != len(x):
+                raise ValueError(f"RomanArray lengths differ: {len(x)} and {len(y)}")
+            return y._values
+        elif isinstance(y, Roman):
+            return y.value
+        elif isinstance(y, (int, np.integer)):
+            return int(y)
+        else:
+            raise TypeError(message)
+
+    @staticmethod
+    def _overflow(mask, operation):
+        """Сообщает о первом элементе, результат которого не помещается в int64."""
+        bad = np.flatnonzero(mask)
+        if bad.size:
+            raise OverflowError(f"Result of {operation} does not fit in int64 (element {bad[0]})")
+
+    def __add__(x, y):
+        """Поэлементное сложение."""
+        y = x._operand(y, "Can only add Roman or int")
+        RomanArray._overflow(x._values > INT64_MAX - np.maximum(y, 0), 'addition')
+        result = x._values + y
+        RomanArray._check(result, "Roman numbers must be positive")
+        return RomanArray._wrap(result)
+
+    def __sub__(x, y):
+        """Поэлементное вычитание."""
+        y = x._operand(y, "Can only subtract Roman or int")
+        RomanArray._overflow(x._values > INT64_MAX + np.minimum(y, 0), 'subtraction')
+        result = x._values - y
+        RomanArray._check(result, "Result must be positive")
+        return RomanArray._wrap(result)
+
+    def __mul__(x, y):
+        """Поэлементное умножение."""
+        y = x._operand(y, "Can only multiply by Roman or int")
+        # Множители int допускаются любые, но результат, как и у Roman, должен остаться положительным
+        RomanArray._overflow(x._values > INT64_MAX // np.maximum(np.abs(y), 1), 'multiplication')
+        result = x._values * y
+        RomanArray._check(result, "Roman numbers must be positive")
+        return RomanArray._wrap(result)
+
+    def __truediv__(x, y):
+        """Поэлементное целочисленное деление."""
+        y = x._operand(y, "Can only divide by Roman or int")
+        if not np.all(y):
+            raise ZeroDivisionError("integer division or modulo by zero")
+        result = x._values // y
+        RomanArray._check(result, "Result must be positive")
+        return RomanArray._wrap(result)
+
+    def to_strings(x, vinculum=False):
+        """Записи всех чисел одной выборкой из таблицы; числа больше 3999 дописываются отдельно."""
+        return Roman.to_roman_many(x._values, vinculum)
+
+    def __str__(x):
+        """Возвращает строковое представление массива."""
+        return '[' + ', '.join(x.to_strings().tolist()) + ']'
+
+    def __repr__(x):
+        """Возвращает представление для отладки."""
+        return f"RomanArray({x._values.tolist()})"
+
+
+if __name__ == "__main__":
+    column = RomanArray(["XIV", "V", "MCMXCIX"])
+    print(column, column.values)
+    print(column + 1, column * RomanArray([2, 3, 2]), column / 2)
+    try:
+        column - RomanArray([1, 5, 1])
+    except ValueError as e:
+        print(f"Ошибка: {e}")
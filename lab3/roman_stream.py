@@ -0,0 +1,199 @@
+import argparse
+import mmap
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from task1_roman import Roman, RomanParseError
+
+MODES = ('annotate', 'replace')
+# Слово из римских цифр; \b в байтовом шаблоне учитывает только ASCII-буквы, цифры и _
+NUMERAL = rb'\b[MDCLXVI]+\b'
+# Байт, на котором слово гарантированно обрывается: по нему безопасно резать текст на части
+_WORD_BYTE = re.compile(rb'\w')
+# Размер окна, которое разбирается одним вызовом re.sub
+WINDOW = 1 << 20
+
+
+class RomanConverter:
+    """Поиск римских чисел в байтовом тексте и замена их арабскими или дописывание значения."""
+
+    def __init__(self, mode='annotate', min_length=1, ignore_case=False):
+        """Конструктор: mode - 'annotate' (XIV -> XIV (14)) или 'replace' (XIV -> 14)."""
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode!r}, expected one of {MODES}")
+        if min_length < 1:
+            raise ValueError("min_length must be positive")
+        self.mode = mode
+        self.min_length = min_length
+        self._pattern = re.compile(NUMERAL, re.IGNORECASE if ignore_case else 0)
+        # Номера глав и разделов повторяются: результат для каждого слова вычисляется один раз
+        self._cache = {}
+        self.found = 0
+        self.converted = 0
+
+    def _substitute(self, match):
+        """Возвращает замену найденного слова; не каноническое римское число остается как есть."""
+        word = match.group()
+        self.found += 1
+        try:
+            replacement = self._cache[word]
+        except KeyError:
+            replacement = self._cache[word] = self._replacement(word)
+        if replacement is None:
+            return word
+        self.converted += 1
+        return replacement
+
+    def _replacement(self, word):
+        """Вычисляет замену слова или None, если это не каноническое римское число."""
+        if len(word) < self.min_length:
+            return None
+        try:
+            value = Roman.toArabic(word.decode('ascii'))
+        except RomanParseError:
+            return None
+        number = str(value).encode('ascii')
+        return number if self.mode == 'replace' else word + b' (' + number + b')'
+
+    def convert(self, data, pos=0, endpos=None, window=WINDOW):
+        """Преобразует data[pos:endpos] окнами по window байт и по частям отдает результат."""
+        # Окна режутся на байтах вне слова, поэтому \b на краях окна совпадает с \b во всем тексте
+        if endpos is None:
+            endpos = len(data)
+        while pos < endpos:
+            cut = min(safe_boundary(data, min(pos + window, endpos)), endpos)
+            yield self._pattern.sub(self._substitute, data[pos:cut])
+            pos = cut
+
+
+def safe_boundary(data, position):
+    """Первая позиция не раньше position, где стоит байт вне слова (или конец данных)."""
+    length = len(data)
+    while position < length and _WORD_BYTE.match(data, position):
+        position += 1
+    return position
+
+
+def _last_boundary(data):
+    """Позиция после последнего байта вне слова или 0, если весь буфер - одно слово."""
+    position = len(data)
+    while position and _WORD_BYTE.match(data, position - 1):
+        position -= 1
+    return position
+
+
+def convert_stream(src, dst, converter, chunk_size=1 << 20):
+    """Читает src блоками и пишет результат в dst; хвост блока с недочитанным словом переносится в следующий."""
+    total = 0
+    carry = b''
+    while True:
+        chunk = src.read(chunk_size)
+        total += len(chunk)
+        data = carry + chunk
+        if not chunk:
+            dst.writelines(converter.convert(data))
+            return total
+        cut = _last_boundary(data)
+        dst.writelines(converter.convert(data, 0, cut))
+        carry = data[cut:]
+
+
+def convert_mapped(path, dst, converter, start=0, end=None):
+    """Преобразует диапазон файла через отображение в память и пишет результат в dst."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        dst.writelines(converter.convert(data, start, len(data) if end is None else end))
+
+
+def split_ranges(path, parts):
+    """Делит файл на parts диапазонов с границами на байтах вне слова."""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        bounds = [0]
+        for part in range(1, parts):
+            bounds.append(max(bounds[-1], safe_boundary(data, size * part // parts)))
+        bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def _convert_part(path, part_path, start, end, mode, min_length, ignore_case):
+    """Задача процесса: преобразует диапазон файла в отдельный файл-часть."""
+    converter = RomanConverter(mode, min_length, ignore_case)
+    with open(part_path, 'wb') as dst:
+        convert_mapped(path, dst, converter, start, end)
+    return converter.found, converter.converted
+
+
+def convert_file(path, dst, mode='annotate', workers=1, use_mmap=True, chunk_size=1 << 20,
+                 min_length=1, ignore_case=False):
+    """Преобразует файл в открытый двоичный поток dst; возвращает статистику с пропускной способностью."""
+    start_time = time.perf_counter()
+    size = os.path.getsize(path) if path != '-' else 0
+    found = converted = 0
+    if workers > 1 and use_mmap and size:
+        ranges = split_ranges(path, workers)
+        with tempfile.TemporaryDirectory() as tmp:
+            parts = [os.path.join(tmp, f'part-{number:04d}') for number in range(len(ranges))]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_convert_part, path, part, start, end, mode, min_length, ignore_case)
+                           for part, (start, end) in zip(parts, ranges)]
+                # Части дописываются в порядке файла по мере готовности
+                for part, future in zip(parts, futures):
+                    part_found, part_converted = future.result()
+                    found += part_found
+                    converted += part_converted
+                    with open(part, 'rb') as f:
+                        shutil.copyfileobj(f, dst)
+    else:
+        converter = RomanConverter(mode, min_length, ignore_case)
+        if path == '-':
+            size = convert_stream(sys.stdin.buffer, dst, converter, chunk_size)
+        elif use_mmap and size:
+            convert_mapped(path, dst, converter)
+        else:
+            with open(path, 'rb') as src:
+                convert_stream(src, dst, converter, chunk_size)
+        found, converted = converter.found, converter.converted
+    elapsed = time.perf_counter() - start_time
+    return {
+        'bytes': size,
+        'seconds': elapsed,
+        'mb_per_s': size / (1 << 20) / elapsed if elapsed else 0.0,
+        'found': found,
+        'converted': converted,
+    }
+
+
+def main(argv=None):
+    """Точка входа командной строки: python roman_stream.py файл [-o результат] [--mode replace] [--workers N]."""
+    parser = argparse.ArgumentParser(description="Find Roman numerals in a text file and convert them to Arabic")
+    parser.add_argument('input', help="input file, '-' for stdin")
+    parser.add_argument('-o', '--output', help="output file (stdout by default)")
+    parser.add_argument('--mode', choices=MODES, default='annotate')
+    parser.add_argument('--workers', type=int, default=1, help="processes for splitting large files")
+    parser.add_argument('--chunk-size', type=int, default=1 << 20, help="read size when not memory-mapped")
+    parser.add_argument('--no-mmap', action='store_true', help="use chunked reads instead of mmap")
+    parser.add_argument('--min-length', type=int, default=1, help="ignore shorter numerals (e.g. 2 skips 'I')")
+    parser.add_argument('--ignore-case', action='store_true', help="also convert lowercase numerals")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be positive")
+    options = dict(mode=args.mode, workers=args.workers, use_mmap=not args.no_mmap,
+                   chunk_size=args.chunk_size, min_length=args.min_length, ignore_case=args.ignore_case)
+    if args.output:
+        with open(args.output, 'wb') as dst:
+            stats = convert_file(args.input, dst, **options)
+    else:
+        stats = convert_file(args.input, sys.stdout.buffer, **options)
+        sys.stdout.buffer.flush()
+    print(f"{stats['bytes'] / (1 << 20):.1f} MB in {stats['seconds']:.3f} s: {stats['mb_per_s']:.1f} MB/s, "
+          f"numerals found {stats['found']:,}, converted {stats['converted']:,}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,30 @@
+from functools import total_ordering
+
+try:
+    import numpy as np
+except ImportError:  # numpy необязателен: пакетные функции работают и со списками
+    np = None
+
+# Черта над буквой (винкулум) умножает её значение на 1000; несколько черт - на 1000 в степени их числа
+VINCULUM = '\u0305'
+
+
+class RomanParseError(ValueError):
+    """Ошибка разбора римского числа: хранит исходную строку и позицию неверного символа."""
+
+    def __init__(self, text, position, reason):
+        super().__init__(f"Invalid Roman numeral {text!r}: {reason} at position {position}")
+        self.text = text
+        self.position = position
+
+
+@total_ordering
 class Roman:
     """Класс для работы с римскими числами, поддерживающий конвертацию и арифметические операции."""
-    
+
+    # Неизменяемое значение без __dict__: число и лениво вычисляемая запись
+    __slots__ = ('value', '_text')
+
     _roman_numerals = {
         'I': 1, 'IV': 4, 'V': 5, 'IX': 9,
         'X': 10, 'XL': 40, 'L': 50, 'XC': 90,
@@ -12,51 +36,274 @@ class Roman:
         (100, 'C'), (90, 'XC'), (50, 'L'), (40, 'XL'),
         (10, 'X'), (9, 'IX'), (5, 'V'), (4, 'IV'), (1, 'I')
     ]
+    # Таблицы всех канонических чисел 1-3999 строятся при загрузке модуля (см. _build_tables)
+    MAX_TABLE = 3999
+    _roman_table = []
+    _arabic_table = {}
+    # Разряды для автомата разбора: (единица, пятерка, десяток, вес) и запись цифр 1-9 через них
+    _places = [('C', 'D', 'M', 100), ('X', 'L', 'C', 10), ('I', 'V', 'X', 1)]
+    _digit_patterns = ['', 'o', 'oo', 'ooo', 'of', 'f', 'fo', 'foo', 'fooo', 'ot']
+    # Переходы автомата (см. _build_automaton): для состояния - словарь символ -> (состояние, прибавка)
+    _automaton = []
+    # Общие экземпляры для 1-3999: Roman(5) и результаты арифметики возвращают один и тот же объект
+    _instances = []
 
-    def __init__(x, value):
+    def __new__(cls, value, strict=True):
         """Конструктор класса. Принимает либо строку с римским числом, либо целое число."""
         if isinstance(value, str):
-            x.value = x.toArabic(value)
+            return cls._of(cls.toArabic(value, strict))
         elif isinstance(value, int):
-            if value <= 0:
-                raise ValueError("Roman numbers must be positive")
-            x.value = value
+            return cls._of(value)
         else:
             raise TypeError("Unsupported type")
 
+    @classmethod
+    def _of(cls, value):
+        """Возвращает экземпляр для положительного целого: общий для 1-3999, новый для больших."""
+        if value <= 0:
+            raise ValueError("Roman numbers must be positive")
+        if value <= cls.MAX_TABLE:
+            return cls._instances[value]
+        return cls._make(value)
+
+    @classmethod
+    def _make(cls, value):
+        """Создает новый экземпляр в обход неизменяемости."""
+        x = object.__new__(cls)
+        object.__setattr__(x, 'value', value)
+        object.__setattr__(x, '_text', None)
+        return x
+
+    def __setattr__(x, name, value):
+        """Запрещает изменение: римское число - неизменяемое значение."""
+        raise AttributeError("Roman numbers are immutable")
+
+    def __delattr__(x, name):
+        """Запрещает удаление атрибутов."""
+        raise AttributeError("Roman numbers are immutable")
+
+    def __reduce__(x):
+        """Сериализация через значение: после загрузки число снова берется из общих экземпляров."""
+        return Roman, (x.value,)
+
+    @classmethod
+    def _build_tables(cls):
+        """Заполняет таблицы: индекс - число, значение - римская запись, и обратный словарь."""
+        cls._roman_table = [''] + [cls._compose(value) for value in range(1, cls.MAX_TABLE + 1)]
+        cls._arabic_table = {numeral: value for value, numeral in enumerate(cls._roman_table) if value}
+        cls._numpy_table = np.array(cls._roman_table) if np is not None else None
+        cls._instances = [None] + [cls._make(value) for value in range(1, cls.MAX_TABLE + 1)]
+
+    @classmethod
+    def _build_automaton(cls):
+        """Строит детерминированный автомат канонической записи: тысячи M*, затем сотни, десятки и единицы."""
+        # Состояние 0 - начало, 1 - после M тысяч, далее по состоянию на (разряд, прочитанная цифра)
+        ids = {(place, digit): 2 + place * 9 + digit - 1 for place in range(3) for digit in range(1, 10)}
+        automaton = [{} for _ in range(2 + len(ids))]
+        for state in (0, 1):
+            automaton[state]['M'] = (1, 1000)
+        for (place, digit), state in ids.items():
+            one, five, ten, weight = cls._places[place]
+            roles = {one: 'o', five: 'f', ten: 't'}
+            for symbol, role in roles.items():
+                pattern = cls._digit_patterns[digit] + role
+                if pattern in cls._digit_patterns:
+                    following = cls._digit_patterns.index(pattern)
+                    automaton[state][symbol] = (ids[place, following], (following - digit) * weight)
+        # Переход в младший разряд возможен из начала, тысяч и любой цифры старшего разряда
+        for place, (one, five, _, weight) in enumerate(cls._places):
+            sources = [0, 1] + [state for (higher, _), state in ids.items() if higher < place]
+            for state in sources:
+                automaton[state].setdefault(one, (ids[place, 1], weight))
+                automaton[state].setdefault(five, (ids[place, 5], 5 * weight))
+        for transitions in automaton:
+            transitions.update({symbol.lower(): step for symbol, step in transitions.items()})
+        cls._automaton = automaton
+        # Для нестрогого разбора: значения символов и вычитательных пар в обоих регистрах
+        cls._symbol_values = {}
+        cls._pair_values = {}
+        for numeral, value in cls._roman_numerals.items():
+            cases = {numeral, numeral.lower()} if len(numeral) == 1 else \
+                {(a + b) for a in (numeral[0], numeral[0].lower()) for b in (numeral[1], numeral[1].lower())}
+            for case in cases:
+                if len(case) == 1:
+                    cls._symbol_values[case] = value
+                else:
+                    cls._pair_values.setdefault(case[0], {})[case[1]] = value
+
+    @staticmethod
+    def _compose(arabicNum):
+        """Собирает римскую запись вычитанием номиналов - для построения таблиц и чисел больше 3999."""
+        roman_num = []
+        for num, symbol in Roman._int_to_roman:
+            while arabicNum >= num:
+                roman_num.append(symbol)
+                arabicNum -= num
+        return ''.join(roman_num)
+
+    @staticmethod
+    def _compose_vinculum(arabicNum):
+        """Собирает запись с винкулумом по группам из трех десятичных разрядов - за время, линейное по числу цифр."""
+        groups = []
+        level = 0
+        while arabicNum:
+            arabicNum, group = divmod(arabicNum, 1000)
+            if group:
+                text = Roman._roman_table[group]
+                if level:
+                    marks = VINCULUM * level
+                    text = marks.join(text) + marks
+                groups.append(text)
+            level += 1
+        return ''.join(reversed(groups))
+
+    @staticmethod
+    def toArabic(romanStr, strict=True):
+        """Преобразует римское число в арабское; strict=False допускает неканоническую запись вроде IIII."""
+        # Канонические записи 1-3999 берутся из таблицы, остальные разбираются автоматом
+        value = Roman._arabic_table.get(romanStr)
+        if value is not None:
+            return value
+        if VINCULUM in romanStr:
+            return Roman._parse_vinculum(romanStr)
+        return Roman._parse(romanStr) if strict else Roman._parse_lenient(romanStr)
+
+    @staticmethod
+    def _parse(romanStr):
+        """Строгий разбор за один проход по таблице переходов, без выделения подстрок."""
+        automaton = Roman._automaton
+        state = 0
+        result = 0
+        for position, char in enumerate(romanStr):
+            step = automaton[state].get(char)
+            if step is None:
+                known = char in Roman._symbol_values
+                reason = f"unexpected {char!r}" if known else f"unknown character {char!r}"
+                raise RomanParseError(romanStr, position, reason)
+            state, delta = step
+            result += delta
+        if not state:
+            raise RomanParseError(romanStr, 0, "empty numeral")
+        return result
+
+    @staticmethod
+    def _parse_vinculum(romanStr):
+        """Строгий разбор записи с винкулумом: группы из трех разрядов с убывающим числом черт над буквами."""
+        automaton = Roman._automaton
+        length = len(romanStr)
+        result = 0
+        group = state = 0
+        level = None
+        position = 0
+        while position < length:
+            char = romanStr[position]
+            if char == VINCULUM:
+                raise RomanParseError(romanStr, position, "overline without a letter")
+            marks = position + 1
+            while marks < length and romanStr[marks] == VINCULUM:
+                marks += 1
+            char_level = marks - position - 1
+            # Новая группа начинается при смене числа черт; уровни групп строго убывают
+            if char_level != level:
+                if level is not None and char_level > level:
+                    raise RomanParseError(romanStr, position, f"overline level {char_level} after {level}")
+                if level is not None:
+                    result += group * 1000 ** level
+                level, group, state = char_level, 0, 0
+            # Тысячи записываются I с чертой, а не M: в каждой группе не больше 999
+            step = automaton[state].get(char)
+            if step is None or step[0] == 1:
+                known = char in Roman._symbol_values
+                reason = f"unexpected {char!r}" if known else f"unknown character {char!r}"
+                raise RomanParseError(romanStr, position, reason)
+            state, delta = step
+            group += delta
+            position = marks
+        if level is None:
+            raise RomanParseError(romanStr, 0, "empty numeral")
+        result += group * 1000 ** level
+        if result <= Roman.MAX_TABLE:
+            raise RomanParseError(romanStr, 0, f"{result} must be written without overlines")
+        return result
+
     @staticmethod
-    def toArabic(romanStr):
-        """Преобразует римское число в арабское."""
+    def _parse_lenient(romanStr):
+        """Прежний нестрогий разбор: пары IV, IX, XL, XC, CD, CM вычитаются, остальные символы складываются."""
         result = 0
         i = 0
-        romanStr = romanStr.upper()
-        while i < len(romanStr):
-            if i + 1 < len(romanStr) and romanStr[i:i+2] in Roman._roman_numerals:
-                result += Roman._roman_numerals[romanStr[i:i+2]]
+        length = len(romanStr)
+        while i < length:
+            char = romanStr[i]
+            if char not in Roman._symbol_values:
+                raise RomanParseError(romanStr, i, f"unknown character {char!r}")
+            pair = Roman._pair_values.get(char)
+            if pair and i + 1 < length and romanStr[i + 1] in pair:
+                result += pair[romanStr[i + 1]]
                 i += 2
             else:
-                result += Roman._roman_numerals[romanStr[i]]
+                result += Roman._symbol_values[char]
                 i += 1
         return result
 
     @staticmethod
-    def toRoman(arabicNum):
-        """Преобразует арабское число в римское."""
+    def toRoman(arabicNum, vinculum=False):
+        """Преобразует арабское число в римское; vinculum=True записывает числа больше 3999 с чертами."""
         if arabicNum <= 0:
             raise ValueError("Roman numbers must be positive")
-        roman_num = []
-        for num, symbol in Roman._int_to_roman:
-            while arabicNum >= num:
-                roman_num.append(symbol)
-                arabicNum -= num
-        return ''.join(roman_num)
+        try:
+            return Roman._roman_table[arabicNum]
+        except (IndexError, TypeError):
+            return Roman._compose_vinculum(arabicNum) if vinculum else Roman._compose(arabicNum)
+
+    @staticmethod
+    def to_roman_many(values, vinculum=False):
+        """Пакетно преобразует числа в римские: список строк или массив строк для массива numpy."""
+        compose = Roman._compose_vinculum if vinculum else Roman._compose
+        if np is not None and isinstance(values, np.ndarray):
+            return Roman._to_roman_array(values, compose)
+        table = Roman._roman_table
+        result = []
+        for index, value in enumerate(values):
+            if value <= 0:
+                raise ValueError(f"Roman numbers must be positive (element {index}: {value})")
+            result.append(table[value] if value <= Roman.MAX_TABLE else compose(value))
+        return result
+
+    @staticmethod
+    def _to_roman_array(values, compose):
+        """Преобразует целочисленный массив numpy одной выборкой из таблицы."""
+        if values.dtype.kind not in 'iu':
+            raise TypeError("Only integer arrays can be converted to Roman numbers")
+        bad = np.flatnonzero(values <= 0)
+        if bad.size:
+            raise ValueError(f"Roman numbers must be positive (element {bad[0]}: {values.flat[bad[0]]})")
+        large = values > Roman.MAX_TABLE
+        if not large.any():
+            return Roman._numpy_table[values]
+        result = Roman._numpy_table[np.where(large, 0, values)].astype(object)
+        result[large] = [compose(int(value)) for value in values[large]]
+        return result
+
+    @staticmethod
+    def to_arabic_many(numerals, strict=True):
+        """Пакетно преобразует римские числа в арабские: список или массив int64 для массива numpy."""
+        table = Roman._arabic_table
+        # Промахи таблицы разбирает toArabic: в том числе записи с винкулумом из to_roman_many
+        parse = Roman.toArabic
+        if np is not None and isinstance(numerals, np.ndarray):
+            # Перебор массива дает медленные np.str_, а tolist - обычные str для поиска в таблице
+            if numerals.dtype.kind == 'S':
+                numerals = np.char.decode(numerals, 'ascii')
+            values = [table.get(numeral) or parse(numeral, strict) for numeral in numerals.ravel().tolist()]
+            return np.asarray(values, dtype=np.int64).reshape(numerals.shape)
+        return [table.get(numeral) or parse(numeral, strict) for numeral in numerals]
 
     def __add__(x, y):
         """Оператор сложения римских чисел."""
         if isinstance(y, Roman):
-            return Roman(x.value + y.value)
+            return Roman._of(x.value + y.value)
         elif isinstance(y, int):
-            return Roman(x.value + y)
+            return Roman._of(x.value + y)
         else:
             raise TypeError("Can only add Roman or int")
 
@@ -70,14 +317,14 @@ class Roman:
             raise TypeError("Can only subtract Roman or int")
         if result <= 0:
             raise ValueError("Result must be positive")
-        return Roman(result)
+        return Roman._of(result)
 
     def __mul__(x, y):
         """Оператор умножения римских чисел."""
         if isinstance(y, Roman):
-            return Roman(x.value * y.value)
+            return Roman._of(x.value * y.value)
         elif isinstance(y, int):
-            return Roman(x.value * y)
+            return Roman._of(x.value * y)
         else:
             raise TypeError("Can only multiply by Roman or int")
 
@@ -91,25 +338,68 @@ class Roman:
             raise TypeError("Can only divide by Roman or int")
         if result <= 0:
             raise ValueError("Result must be positive")
-        return Roman(result)
+        return Roman._of(result)
+
+    def __eq__(x, y):
+        """Сравнивает значение с римским или целым числом."""
+        if isinstance(y, Roman):
+            return x.value == y.value
+        elif isinstance(y, int):
+            return x.value == y
+        return NotImplemented
+
+    def __lt__(x, y):
+        """Оператор сравнения «меньше» с римским или целым числом."""
+        if isinstance(y, Roman):
+            return x.value < y.value
+        elif isinstance(y, int):
+            return x.value < y
+        return NotImplemented
+
+    def __hash__(x):
+        """Хеш совпадает с хешем значения, поэтому Roman(5) и 5 - один ключ словаря."""
+        return hash(x.value)
 
     def __str__(x):
-        """Возвращает строковое представление римского числа."""
-        return x.toRoman(x.value)
+        """Возвращает строковое представление римского числа; запись вычисляется один раз."""
+        text = x._text
+        if text is None:
+            text = x.toRoman(x.value)
+            object.__setattr__(x, '_text', text)
+        return text
+
+Roman._build_automaton()
+Roman._build_tables()
+
+if __name__ == "__main__":
+    # Создание объектов
+    a = Roman("XIV")
+    b = Roman(5)
+
+    # Арифметические операции
+    print(a + b)
+    print(a - b)
+    print(a * b)
+    print(a / b)
+
+    # Альтернативные конструкторы
+    c = Roman.toRoman(42)
+    d = Roman.toArabic("XX")
 
-# Создание объектов
-a = Roman("XIV")
-b = Roman(5)
+    print(c)
+    print(d)
 
-# Арифметические операции
-print(a + b)
-print(a - b)
-print(a * b)
-print(a / b)
+    # Пакетное преобразование
+    print(Roman.to_roman_many([1, 4, 1999, 3999]))
+    print(Roman.to_arabic_many(["MMXXIV", "xlii"]))
 
-# Альтернативные конструкторы
-c = Roman.toRoman(42)
-d = Roman.toArabic("XX")
+    # Строгий и нестрогий разбор
+    try:
+        Roman.toArabic("IIII")
+    except RomanParseError as e:
+        print(f"Ошибка: {e}")
+    print(Roman.toArabic("IIII", strict=False))
 
-print(c)
-print(d)
+    # Большие числа с винкулумом
+    big = Roman.toRoman(1_234_567, vinculum=True)
+    print(big, Roman.toArabic(big))
@@ -0,0 +1,396 @@
+import asyncio
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from task2_queue import Queue
+from queue_async import AsyncQueue
+from queue_mmap import MmapQueue
+from queue_codecs import CODECS
+from queue_priority import PriorityQueue
+from queue_shared import SharedQueue
+
+
+class ListQueue(Queue):
+    """ Прежняя реализация очереди поверх list с pop(0) - для сравнения """
+
+    def _new_storage(self):
+        return []
+
+    def _get(self) -> Any:
+        return self._items.pop(0)
+
+
+def measure(func: Callable[[], Any]) -> float:
+    """ Возвращает время выполнения функции в секундах """
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def fill_and_drain(queue_cls, count: int, bounded: bool) -> Callable[[], None]:
+    """ Готовит сценарий: заполнить очередь count элементами и полностью опустошить её """
+    def run():
+        q = queue_cls(max_size=count if bounded else None)
+        for i in range(count):
+            q.enqueue(i)
+        while not q.is_empty:
+            q.dequeue()
+    return run
+
+
+def bench_ring_buffer() -> None:
+    """ Сравнение list + pop(0) с кольцевым буфером и deque на 10^3..10^6 элементов """
+    print("Заполнение и опустошение очереди (секунды)")
+    print(f"{'n':>9} {'list.pop(0)':>12} {'ring buffer':>12} {'deque':>12}")
+    for power in range(3, 7):
+        count = 10 ** power
+        old = measure(fill_and_drain(ListQueue, count, bounded=True))
+        ring = measure(fill_and_drain(Queue, count, bounded=True))
+        unbounded = measure(fill_and_drain(Queue, count, bounded=False))
+        print(f"{count:>9} {old:>12.4f} {ring:>12.4f} {unbounded:>12.4f}")
+
+
+async def ping_pong(make_queue, rounds: int) -> float:
+    """ Пересылает сообщение между двумя корутинами туда и обратно, возвращает задержку одной передачи в мкс """
+    there, back = make_queue(), make_queue()
+
+    async def echo():
+        for _ in range(rounds):
+            await back.put(await there.get())
+
+    task = asyncio.create_task(echo())
+    start = time.perf_counter()
+    for i in range(rounds):
+        await there.put(i)
+        await back.get()
+    elapsed = time.perf_counter() - start
+    await task
+    return elapsed / (2 * rounds) * 1e6
+
+
+class _AsyncQueueAdapter(AsyncQueue):
+    """ Приводит AsyncQueue к интерфейсу put/get для общего сценария замера """
+
+    put = AsyncQueue.enqueue
+    get = AsyncQueue.dequeue
+
+
+def bench_async_handoff(rounds: int = 100_000) -> None:
+    """ Задержка передачи элемента от корутины к корутине: AsyncQueue против asyncio.Queue """
+    print("Передача между корутинами (мкс на передачу)")
+    for name, factory in (("AsyncQueue", lambda: _AsyncQueueAdapter(max_size=1)),
+                          ("asyncio.Queue", lambda: asyncio.Queue(maxsize=1))):
+        latency = asyncio.run(ping_pong(factory, rounds))
+        print(f"{name:>14}: {latency:.2f}")
+
+
+def bench_mmap(count: int = 20_000_000) -> None:
+    """ Заполнение и опустошение очереди в отображаемых файлах на десятках миллионов элементов """
+    print(f"MmapQueue, {count:,} элементов")
+    with tempfile.TemporaryDirectory() as tmp:
+        with MmapQueue.open(tmp) as q:
+            def fill():
+                for i in range(count):
+                    q.enqueue(i)
+
+            def drain():
+                for _ in range(count):
+                    q.dequeue()
+
+            enqueue_time = measure(fill)
+            resident = len(q._segments)
+            dequeue_time = measure(drain)
+    print(f"  enqueue: {count / enqueue_time:,.0f} оп/с")
+    print(f"  dequeue: {count / dequeue_time:,.0f} оп/с")
+    print(f"  сегментов в памяти после заполнения: {resident}")
+
+
+def allocated(func: Callable[[], Any]) -> Any:
+    """ Возвращает результат функции и объем памяти, оставшейся занятой после её выполнения, в байтах """
+    tracemalloc.start()
+    result = func()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def bench_index(sizes=(1_000, 10_000, 50_000)) -> None:
+    """ Дедупликация перед добавлением: линейный поиск против индекса вхождений """
+    print("Загрузка с проверкой 'item in queue' перед enqueue (секунды)")
+    print(f"{'n':>9} {'перебор':>10} {'индекс':>10} {'ускорение':>10}")
+    for count in sizes:
+        # Половина элементов - повторы
+        items = [i // 2 for i in range(count)]
+
+        def ingest(indexed):
+            def run():
+                q = Queue(indexed=indexed)
+                for item in items:
+                    if item not in q:
+                        q.enqueue(item)
+            return run
+
+        scan = measure(ingest(False))
+        indexed = measure(ingest(True))
+        print(f"{count:>9} {scan:>10.4f} {indexed:>10.4f} {scan / indexed:>9.0f}x")
+
+    count = 100_000
+    _, plain = allocated(lambda: _filled(Queue(), count))
+    _, with_index = allocated(lambda: _filled(Queue(indexed=True), count))
+    print(f"Память на {count:,} различных int: без индекса {plain / count:.1f} Б/элемент, "
+          f"с индексом {with_index / count:.1f} Б/элемент")
+
+
+def _filled(q: Queue, count: int) -> Queue:
+    """ Заполняет очередь числами 0..count-1 """
+    for i in range(count):
+        q.enqueue(i)
+    return q
+
+
+def copy_concat(first: Queue, second: Queue) -> Queue:
+    """ Прежнее объединение очередей с полным копированием элементов """
+    merged = Queue(max_size=first._max_size)
+    merged._items.extend(first._items)
+    merged._items.extend(second._items)
+    return merged
+
+
+def bench_concat(count: int = 1_000_000) -> None:
+    """ Объединение двух очередей по count элементов: копирование против ленивого объединения """
+    first, second = _filled(Queue(), count), _filled(Queue(), count)
+    print(f"Объединение двух очередей по {count:,} элементов")
+    for name, merge in (("копирование", copy_concat), ("ленивое", Queue.__add__)):
+        start = time.perf_counter()
+        merged, extra = allocated(lambda: merge(first, second))
+        elapsed = time.perf_counter() - start
+        drain = measure(lambda: [merged.dequeue() for _ in range(len(merged))])
+        print(f"{name:>12}: объединение {elapsed:.4f} с, +{extra / 1024:,.0f} КиБ, опустошение {drain:.4f} с")
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    """ Возвращает пиковый объем памяти, выделенной во время выполнения функции, в байтах """
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def bench_from_file(count: int = 2_000_000) -> None:
+    """ Загрузка дампа с разделителями: from_string по всему тексту против потокового from_file """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "dump.txt")
+        with open(path, "w") as f:
+            for i in range(count):
+                f.write(f"job-{i}\n" if i % 10 == 9 else f"job-{i},")
+        megabytes = os.path.getsize(path) / 2 ** 20
+
+        def via_string():
+            with open(path) as f:
+                return Queue.from_string(f.read().replace("\n", ","))
+
+        print(f"Загрузка {count:,} элементов ({megabytes:.1f} МиБ)")
+        for name, load in (("from_string", via_string), ("from_file", lambda: Queue.from_file(path))):
+            elapsed = measure(load)
+            peak = peak_memory(load)
+            print(f"{name:>12}: {megabytes / elapsed:6.1f} МиБ/с, пик памяти {peak / 2 ** 20:6.1f} МиБ")
+
+
+def bench_codecs(count: int = 200_000) -> None:
+    """ Матрица кодеков: размер файла, время сохранения и загрузки для разных типов элементов """
+    samples = {
+        'int': lambda i: i,
+        'float': lambda i: i / 3,
+        'str': lambda i: f"job-{i}",
+        'bytes': lambda i: i.to_bytes(8, 'little'),
+        'bytearray': lambda i: bytearray(i.to_bytes(8, 'little') * 64),
+        'tuple': lambda i: (i, i / 3),
+    }
+    print(f"Кодеки сохранения, {count:,} элементов: размер КиБ / сохранение с / загрузка с")
+    print(f"{'тип':>9} " + " ".join(f"{codec:>24}" for codec in CODECS))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "queue.bin")
+        for type_name, make in samples.items():
+            q = Queue.from_iterable(make(i) for i in range(count))
+            cells = []
+            for codec in CODECS:
+                try:
+                    save = measure(lambda: q.save(path, codec))
+                except TypeError:
+                    cells.append(f"{'не поддерживается':>24}")
+                    continue
+                size = os.path.getsize(path) / 1024
+                load = measure(lambda: Queue.load(path, allow_pickle=True))
+                cells.append(f"{size:>9,.0f} / {save:.3f} / {load:.3f}")
+            print(f"{type_name:>9} " + " ".join(cells))
+
+
+def bench_typed(count: int = 1_000_000) -> None:
+    """ Память и скорость: очередь объектов Python против типизированной очереди на массиве """
+    values = [i * 0.5 for i in range(count)]
+    print(f"{count:,} чисел float")
+    for name, make in (("Queue()", lambda: Queue()), ("Queue(typecode='d')", lambda: Queue(typecode='d'))):
+        def fill_one_by_one():
+            q = make()
+            for value in values:
+                q.enqueue(value)
+            return q
+
+        def fill_batch():
+            q = make()
+            q.enqueue_many(values)
+            return q
+
+        # Значения создаются заново, чтобы учесть память под сами объекты float
+        q, footprint = allocated(lambda: _filled_floats(make(), count))
+        one_by_one = measure(fill_one_by_one)
+        batch = measure(fill_batch)
+        full = fill_batch()
+        drain = measure(lambda: full.dequeue_many(count))
+        print(f"{name:>20}: {footprint / count:5.1f} Б/элемент, enqueue {one_by_one:.3f} с, "
+              f"enqueue_many {batch:.3f} с, dequeue_many {drain:.3f} с")
+
+
+def _filled_floats(q: Queue, count: int) -> Queue:
+    """ Заполняет очередь новыми объектами float """
+    for i in range(count):
+        q.enqueue(i * 0.5)
+    return q
+
+
+def bench_priority(count: int = 200_000, levels_list=(10, 100, 1000)) -> None:
+    """ Приоритеты: опрос набора очередей по одной на уровень против двоичной кучи """
+    print(f"{count:,} элементов со случайным приоритетом (секунды на заполнение и опустошение)")
+    print(f"{'уровней':>8} {'опрос очередей':>15} {'PriorityQueue':>14}")
+    for levels in levels_list:
+        rng = random.Random(levels)
+        priorities = [rng.randrange(levels) for _ in range(count)]
+
+        def polling():
+            queues = [Queue() for _ in range(levels)]
+            for i, priority in enumerate(priorities):
+                queues[priority].enqueue(i)
+            for _ in range(count):
+                # Каждое извлечение просматривает очереди, начиная с самого высокого приоритета
+                for q in queues:
+                    if not q.is_empty:
+                        q.dequeue()
+                        break
+
+        def heap():
+            q = PriorityQueue()
+            for i, priority in enumerate(priorities):
+                q.enqueue(i, priority)
+            for _ in range(count):
+                q.dequeue()
+
+        print(f"{levels:>8} {measure(polling):>15.3f} {measure(heap):>14.3f}")
+
+
+def _send(q, count: int, batch: int) -> None:
+    """ Производитель: передает числа 0..count, порциями для SharedQueue """
+    if batch == 1:
+        for i in range(count):
+            q.put(i)
+        return
+    for start in range(0, count, batch):
+        items = range(start, min(start + batch, count))
+        while items:
+            try:
+                items = items[q.enqueue_many(items):]
+            except OverflowError:
+                time.sleep(0)
+
+
+def _receive_shared(q: SharedQueue, count: int, batch: int) -> None:
+    """ Потребитель: забирает count элементов из общей памяти """
+    received = 0
+    while received < count:
+        try:
+            received += len(q.dequeue_many(batch))
+        except IndexError:
+            time.sleep(0)
+
+
+def bench_shared(count: int = 200_000, batch: int = 256) -> None:
+    """ Передача элементов между процессами: multiprocessing.Queue против SharedQueue """
+    print(f"Один производитель и один потребитель, {count:,} элементов")
+
+    def through_pipe():
+        q = multiprocessing.Queue()
+        producer = multiprocessing.Process(target=_send, args=(q, count, 1))
+        producer.start()
+        for _ in range(count):
+            q.get()
+        producer.join()
+
+    def through_shared_memory():
+        with SharedQueue(capacity=1 << 20) as q:
+            producer = multiprocessing.Process(target=_send, args=(q, count, batch))
+            producer.start()
+            _receive_shared(q, count, batch)
+            producer.join()
+
+    for name, scenario in (('multiprocessing.Queue', through_pipe),
+                           (f'SharedQueue (порции по {batch})', through_shared_memory)):
+        print(f"  {name:<30} {count / measure(scenario):>12,.0f} элементов/с")
+
+
+class BareQueue(Queue):
+    """ Очередь с операциями без проверки статистики - для оценки цены выключенной статистики """
+
+    def _put(self, item: Any) -> None:
+        self._items.append(item)
+
+    def _get(self) -> Any:
+        return self._items.popleft()
+
+
+def bench_stats(count: int = 1_000_000, rounds: int = 5) -> None:
+    """ Цена статистики: очередь без проверок, статистика выключена и включена """
+    print(f"Заполнение и опустошение очереди, {count:,} элементов, лучшее из {rounds}")
+    scenarios = (
+        ('без проверок', lambda: BareQueue()),
+        ('статистика выключена', lambda: Queue()),
+        ('статистика включена', lambda: Queue(stats=True)),
+    )
+    baseline = None
+    for name, make in scenarios:
+        def run():
+            q = make()
+            for i in range(count):
+                q.enqueue(i)
+            for _ in range(count):
+                q.dequeue()
+        best = min(measure(run) for _ in range(rounds))
+        baseline = baseline or best
+        print(f"  {name:<22} {best:.3f} с ({(best / baseline - 1) * 100:+.1f}%)")
+
+
+BENCHMARKS = {
+    'ring': bench_ring_buffer,
+    'async': bench_async_handoff,
+    'mmap': bench_mmap,
+    'index': bench_index,
+    'concat': bench_concat,
+    'file': bench_from_file,
+    'codecs': bench_codecs,
+    'typed': bench_typed,
+    'priority': bench_priority,
+    'shared': bench_shared,
+    'stats': bench_stats,
+}
+
+if __name__ == "__main__":
+    # Запуск выбранных бенчмарков: python benchmark.py [имя ...]
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+        print()
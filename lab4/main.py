@@ -1,4 +1,21 @@
+import asyncio
+import multiprocessing
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import queue_codecs
 from task2_queue import Queue
+from queue_blocking import BlockingQueue
+from queue_async import AsyncQueue
+from queue_journal import JournaledQueue
+from queue_mmap import MmapQueue
+from queue_priority import PriorityQueue
+from queue_shared import SharedQueue
+from queue_stats import QueueStats
 
 def test_queue():
     """Тестирование функциональности очереди"""
@@ -32,17 +49,596 @@ def test_queue():
     q2 = Queue.from_string("a, b, c")
     print(f"Очередь из строки: {q2}")
     
-    # Сохранение состояния очереди в файл
-    q2.save("queue.json")
-    
-    # Загрузка состояния очереди из файла
-    q3 = Queue.load("queue.json")
+    # Сохранение состояния очереди в файл и загрузка из него
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "queue.json")
+        q2.save(path)
+        q3 = Queue.load(path)
     print(f"Загруженная очередь: {q3}")
     
     # Объединение двух очередей
     combined = q + q3
     print(f"Объединенная очередь: {combined}")
 
+def test_blocking_queue(producers: int = 4, consumers: int = 4, per_producer: int = 50_000, batch: int = 64):
+    """Нагрузочный тест потокобезопасной очереди: N производителей, M потребителей"""
+    q = BlockingQueue(max_size=1024)
+    received = []
+    stop = threading.Event()
+
+    def produce(offset):
+        # Каждый производитель отдает свой непересекающийся диапазон чисел порциями
+        items = range(offset, offset + per_producer)
+        for start in range(0, per_producer, batch):
+            q.put_many(items[start:start + batch])
+
+    def consume():
+        # Потребитель забирает порции, пока производители не закончат и очередь не опустеет
+        local = []
+        while True:
+            try:
+                local.extend(q.get_many(batch, timeout=0.05))
+            except IndexError:
+                if stop.is_set():
+                    break
+        received.append(local)
+
+    consumer_threads = [threading.Thread(target=consume) for _ in range(consumers)]
+    producer_threads = [threading.Thread(target=produce, args=(i * per_producer,)) for i in range(producers)]
+    start = time.perf_counter()
+    for thread in consumer_threads + producer_threads:
+        thread.start()
+    for thread in producer_threads:
+        thread.join()
+    stop.set()
+    for thread in consumer_threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    # Каждый элемент должен быть получен ровно один раз
+    counts = Counter(item for chunk in received for item in chunk)
+    total = producers * per_producer
+    assert len(counts) == total, f"Потеряно элементов: {total - len(counts)}"
+    assert all(count == 1 for count in counts.values()), "Найдены дубликаты"
+    print(f"BlockingQueue: {producers}x{consumers} потоков, {total} элементов, "
+          f"{total / elapsed:,.0f} элементов/с")
+
+    # Блокирующие операции с таймаутом
+    try:
+        BlockingQueue(max_size=1).get(timeout=0.01)
+    except IndexError as e:
+        print(f"Таймаут get: {e}")
+
+def test_async_queue():
+    """Тестирование асинхронной очереди с обратным давлением"""
+    async def scenario():
+        q = AsyncQueue(max_size=2)
+
+        async def producer():
+            # Третий enqueue приостановится, пока потребитель не освободит место
+            for i in range(5):
+                await q.enqueue(i)
+
+        task = asyncio.create_task(producer())
+        await asyncio.sleep(0)
+        print(f"Очередь заполнена: {q}, полна? {q.is_full}")
+        received = [await q.dequeue()]
+        while len(received) < 5:
+            received.extend(await q.dequeue_many(5))
+        await task
+        print(f"Получено по порядку: {received}")
+
+        q.enqueue_nowait("a")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "async_queue.json")
+            await q.save(path)
+            loaded = await AsyncQueue.load(path)
+        assert list(loaded) == ["a"]
+        print(f"Загруженная асинхронная очередь: {loaded}")
+
+    asyncio.run(scenario())
+
+def test_journaled_queue():
+    """Тестирование восстановления журналируемой очереди после сбоев"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jobs.json")
+
+        # Обычное переоткрытие: снимок + журнал
+        q = JournaledQueue.open(path, max_size=10)
+        for i in range(5):
+            q.enqueue(i)
+        q.dequeue()
+        q.close()
+        assert JournaledQueue.load(path) == _queue_of(1, 2, 3, 4)
+        print(f"Переоткрытая очередь: {JournaledQueue.load(path)}")
+
+        # Сбой без close и оборванная последняя запись
+        q = JournaledQueue.open(path)
+        q.enqueue(5)
+        with open(path + ".wal", "a") as f:
+            f.write('{"seq": 99, "op": "en')
+        recovered = JournaledQueue.open(path)
+        assert recovered == _queue_of(1, 2, 3, 4, 5), recovered
+        print(f"После оборванной записи: {recovered}")
+        recovered.close()
+
+        # Сбой посреди уплотнения: журнал отложен, а новый снимок не записан
+        q = JournaledQueue.open(path)
+        q.enqueue(6)
+        q.flush()
+        os.replace(path + ".wal", path + ".wal.old")
+        with open(path + ".wal", "w") as f:
+            f.write('{"seq": %d, "op": "deq"}\n' % (q._seq + 1))
+        recovered = JournaledQueue.open(path)
+        assert recovered == _queue_of(2, 3, 4, 5, 6), recovered
+        print(f"После сбоя при уплотнении: {recovered}")
+
+        # Фоновое уплотнение по порогу размера журнала
+        recovered._compact_threshold = 256
+        for i in range(50):
+            if recovered.is_full:
+                recovered.dequeue()
+            else:
+                recovered.enqueue(i)
+        recovered.close()
+        assert not os.path.exists(path + ".wal.old")
+        assert JournaledQueue.open(path) == recovered
+        print(f"После уплотнения: {JournaledQueue.open(path)}")
+
+def _enqueue_and_crash(path):
+    """Дочерний процесс: добавляет элементы и аварийно завершается без close"""
+    q = MmapQueue.open(path)
+    for i in range(100, 105):
+        q.enqueue(i)
+    os._exit(1)
+
+def test_mmap_queue():
+    """Тестирование очереди в отображаемых файлах и её переоткрытия после сбоя"""
+    with tempfile.TemporaryDirectory() as tmp:
+        # Маленькие сегменты, чтобы данные разошлись по нескольким файлам
+        with MmapQueue.open(tmp, max_size=1000, segment_size=256) as q:
+            for i in range(100):
+                q.enqueue({"job": i})
+            print(f"Очередь в файлах: {q}, первый элемент {q.peek()}")
+            for _ in range(40):
+                q.dequeue()
+
+        # Процесс падает, не закрыв очередь
+        crashed = multiprocessing.Process(target=_enqueue_and_crash, args=(tmp,))
+        crashed.start()
+        crashed.join()
+
+        with MmapQueue.open(tmp) as q:
+            items = [q.dequeue() for _ in range(len(q))]
+        assert items == [{"job": i} for i in range(40, 100)] + list(range(100, 105)), items
+        print(f"После сбоя восстановлено {len(items)} элементов, последний: {items[-1]}")
+
+def _shared_producer(q, start, count):
+    """Дочерний процесс: кладет числа start..start+count в общую очередь, ожидая места"""
+    for i in range(start, start + count):
+        while True:
+            try:
+                q.enqueue(i)
+                break
+            except OverflowError:
+                time.sleep(0)
+
+def _shared_consumer(q, done, results):
+    """Дочерний процесс: забирает элементы, пока производители не закончили и очередь не опустела"""
+    taken = []
+    while True:
+        try:
+            taken.extend(q.dequeue_many(64))
+        except IndexError:
+            if done.is_set() and q.is_empty:
+                break
+            time.sleep(0)
+    results.put(taken)
+
+def test_shared_queue(producers: int = 3, consumers: int = 3, per_producer: int = 20_000):
+    """Тестирование очереди в общей памяти несколькими процессами: ни потерь, ни дублей"""
+    with SharedQueue(max_size=3) as q:
+        q.enqueue("a")
+        q.enqueue({"b": 2})
+        q.enqueue([3])
+        try:
+            q.enqueue("лишний")
+        except OverflowError as e:
+            print(f"Общая очередь: {e}")
+        assert q.peek() == "a" and q.dequeue() == "a" and len(q) == 2
+
+    # Запись, кончающаяся ровно на конце кольца: следующая должна начаться с его начала
+    with SharedQueue(capacity=64) as q:
+        record = b"x" * (32 - 4 - len(pickle.dumps(b"", protocol=pickle.HIGHEST_PROTOCOL)))
+        for _ in range(5):
+            q.enqueue(record)
+            q.enqueue(record)
+            q.dequeue()
+            q.enqueue(record)
+            assert q.dequeue_many(2) == [record, record] and q.is_empty
+
+    # Интерфейс обычной очереди: перебор, поиск, сравнение, объединение, строка и файлы
+    with SharedQueue.from_string("1, 2, 3", max_size=3) as q, tempfile.TemporaryDirectory() as tmp:
+        assert list(q) == ["1", "2", "3"] and len(q) == 3
+        assert "2" in q and "4" not in q and q.count("3") == 1
+        assert q == Queue.from_string("1,2,3") and q != Queue.from_string("1,2")
+        with q + Queue.from_string("4") as merged:
+            assert list(merged) == ["1", "2", "3", "4"] and merged.is_full
+            assert list(q) == ["1", "2", "3"]
+        path = os.path.join(tmp, "shared.json")
+        q.save(path)
+        assert Queue.load(path) == Queue.from_string("1,2,3")
+        with SharedQueue.load(path, capacity=64) as loaded:
+            assert loaded == q and loaded.is_full
+            try:
+                loaded.enqueue("4")
+                raise AssertionError("max_size is not restored")
+            except OverflowError:
+                pass
+        q.save(path, codec='pickle')
+        try:
+            SharedQueue.load(path)
+            raise AssertionError("pickle must require allow_pickle=True")
+        except ValueError:
+            pass
+
+    # Маленькое кольцо, чтобы записи многократно переходили через его конец
+    with SharedQueue(max_size=1000, capacity=4096) as q:
+        done = multiprocessing.Event()
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=_shared_consumer, args=(q, done, results))
+                   for _ in range(consumers)]
+        senders = [multiprocessing.Process(target=_shared_producer, args=(q, n * per_producer, per_producer))
+                   for n in range(producers)]
+        start = time.perf_counter()
+        for process in workers + senders:
+            process.start()
+        for process in senders:
+            process.join()
+        done.set()
+        taken = Counter()
+        for _ in workers:
+            taken.update(results.get())
+        for process in workers:
+            process.join()
+        elapsed = time.perf_counter() - start
+        total = producers * per_producer
+        assert len(taken) == total and all(n == 1 for n in taken.values()), "Потери или дубли элементов"
+        assert q.is_empty
+        print(f"Общая очередь: {producers} производителя и {consumers} потребителя передали {total} элементов, "
+              f"{total / elapsed:,.0f} элементов/с")
+
+def test_queue_stats():
+    """Тестирование статистики очереди: счетчики, отказы, пиковый размер и время ожидания"""
+    now = [0.0]
+    q = Queue(max_size=3, stats=QueueStats(clock=lambda: now[0]))
+    for item in "abc":
+        q.enqueue(item)
+        now[0] += 0.001
+    try:
+        q.enqueue("d")
+    except OverflowError:
+        pass
+    now[0] += 0.01
+    assert [q.dequeue() for _ in range(3)] == ["a", "b", "c"]
+    try:
+        q.dequeue()
+    except IndexError:
+        pass
+    snapshot = q.stats.snapshot()
+    assert (snapshot["enqueued"], snapshot["dequeued"], snapshot["peak_size"]) == (3, 3, 3)
+    assert (snapshot["rejected_full"], snapshot["rejected_empty"]) == (1, 1)
+    assert abs(snapshot["wait"]["max"] - 0.013) < 1e-9 and snapshot["wait"]["count"] == 3
+    print(f"Статистика очереди: {q.stats}")
+    print(f"Снимок статистики: {q.stats.to_json()}")
+    assert Queue().stats is None
+
+    # Наследники учитывают отказы так же, как Queue
+    with tempfile.TemporaryDirectory() as tmp:
+        journaled = JournaledQueue(max_size=1, path=os.path.join(tmp, "stats.json"), stats=True)
+        for action, error in ((journaled.dequeue, IndexError), (lambda: journaled.dequeue_many(2), IndexError),
+                              (lambda: journaled.enqueue_many([1, 2]), OverflowError),
+                              (lambda: journaled.enqueue(1) or journaled.enqueue(2), OverflowError)):
+            try:
+                action()
+                raise AssertionError("operation must be rejected")
+            except error:
+                pass
+        snapshot = journaled.stats.snapshot()
+        journaled.close()
+    assert (snapshot["rejected_full"], snapshot["rejected_empty"], snapshot["enqueued"]) == (2, 2, 1), snapshot
+
+def test_priority_queue():
+    """Тестирование очереди с приоритетами и отложенной доставкой"""
+    now = [1000.0]
+    q = PriorityQueue(max_size=5, clock=lambda: now[0])
+    q.enqueue("обычная")
+    q.enqueue("срочная-1", priority=-1)
+    q.enqueue("срочная-2", priority=-1)
+    q.enqueue("через минуту", delay=60)
+    print(f"Очередь с приоритетами: {q}, готово {q.ready_size} из {len(q)}")
+    assert [q.dequeue() for _ in range(3)] == ["срочная-1", "срочная-2", "обычная"]
+    try:
+        q.dequeue()
+    except IndexError as e:
+        print(f"Ошибка: {e}")
+    now[0] += 60
+    assert q.dequeue() == "через минуту"
+
+    # Элемент, готовый раньше, обслуживается раньше добавленного позже - независимо от чтения ready_size
+    now[0] = 0.0
+    q = PriorityQueue(clock=lambda: now[0])
+    q.enqueue("готов в 5", delay=5)
+    now[0] = 50.0
+    q.enqueue("добавлен в 50")
+    assert [q.dequeue(), q.dequeue()] == ["готов в 5", "добавлен в 50"]
+    now[0] = 1060.0
+
+    q.enqueue("позже", priority=2, delay=30)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "priority_queue.json")
+        q.save(path)
+        loaded = PriorityQueue.load(path, clock=lambda: now[0])
+    assert loaded.ready_size == 0 and loaded.next_ready_at == 1090.0
+    print(f"Загруженная очередь с приоритетами: {loaded}, ближайшая готовность {loaded.next_ready_at}")
+
+    # Объединение и сравнение с обычной очередью видят элементы, а не записи кучи, и не меняются вместе с ней
+    pq = PriorityQueue()
+    pq.enqueue("lo", priority=5)
+    pq.enqueue("hi", priority=1)
+    combined = Queue.from_string("a") + pq
+    assert list(combined) == ["a", "hi", "lo"]
+    pq.enqueue("x", priority=0)
+    assert list(combined) == ["a", "hi", "lo"] and combined.dequeue_many(3) == ["a", "hi", "lo"]
+    plain = Queue.from_iterable(["x", "hi", "lo"])
+    assert plain == pq and pq == plain and Queue.from_iterable(["hi"]) != pq
+    assert list(pq + Queue.from_string("b")) == ["x", "b", "hi", "lo"]
+
+    # Статистика и опции Queue, понятная ошибка для кодека struct
+    counted = PriorityQueue(max_size=2, stats=True)
+    counted.enqueue_many([1, 2])
+    for action, error in ((lambda: counted.enqueue(3), OverflowError),
+                          (lambda: counted.dequeue_many(5) and counted.dequeue(), IndexError)):
+        try:
+            action()
+            raise AssertionError("operation must be rejected")
+        except error:
+            pass
+    snapshot = counted.stats.snapshot()
+    assert (snapshot["enqueued"], snapshot["dequeued"]) == (2, 2), snapshot
+    assert (snapshot["rejected_full"], snapshot["rejected_empty"]) == (1, 1), snapshot
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            pq.save(os.path.join(tmp, "pq.bin"), codec="struct")
+            raise AssertionError("struct codec cannot store priorities")
+        except ValueError as e:
+            print(f"Ошибка: {e}")
+        assert not os.listdir(tmp)
+
+def test_batch_subclasses():
+    """Тестирование enqueue_many/dequeue_many в наследниках: журнал, пробуждение ожидающих потоков и корутин"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "batch.json")
+        q = JournaledQueue.open(path)
+        q.enqueue(1)
+        q.enqueue_many([2, 3])
+        assert q.dequeue_many(1) == [1]
+        q.close()
+        assert JournaledQueue.load(path) == _queue_of(2, 3), JournaledQueue.load(path)
+
+    q = BlockingQueue(max_size=4)
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(q.get(timeout=3)))
+    waiter.start()
+    time.sleep(0.05)
+    start = time.perf_counter()
+    q.enqueue_many(["x", "y"])
+    waiter.join()
+    assert got == ["x"] and time.perf_counter() - start < 1, "get must wake up on enqueue_many"
+    assert q.dequeue_many(5) == ["y"]
+
+    async def scenario():
+        aq = AsyncQueue()
+        getters = [asyncio.create_task(aq.dequeue()) for _ in range(2)]
+        await asyncio.sleep(0)
+        aq.enqueue_many(["a", "b"])
+        return await asyncio.wait_for(asyncio.gather(*getters), timeout=1)
+
+    assert asyncio.run(scenario()) == ["a", "b"]
+    print("enqueue_many/dequeue_many: журнал, BlockingQueue и AsyncQueue согласованы")
+
+def test_indexed_queue():
+    """Тестирование индекса вхождений: in и count совпадают с перебором после любых операций"""
+    plain, indexed = Queue(), Queue(indexed=True)
+    items = [1, 2, 2, "a", (1, 2), [1], {1}, frozenset({2}), 1.0, True]
+    probes = items + [3, "b", [2], {2}, frozenset({1}), 0]
+    for q in (plain, indexed):
+        q.enqueue_many(items)
+    for step in range(len(items)):
+        for probe in probes:
+            assert (probe in indexed) == (probe in plain), (step, probe)
+            assert indexed.count(probe) == plain.count(probe), (step, probe)
+        assert indexed.dequeue() == plain.dequeue()
+    assert not indexed._index and not indexed._unhashable
+    # Объединение, загрузка и очистка перестраивают индекс
+    merged = Queue.from_string("x,y") + Queue.from_string("y")
+    combined = Queue(indexed=True) + merged
+    assert combined.indexed and combined.count("y") == 2 and "z" not in combined
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "queue.json")
+        merged.save(path)
+        loaded = Queue.load(path, indexed=True)
+        assert loaded.count("y") == 2 and "x" in loaded
+    loaded.clear()
+    assert "x" not in loaded and loaded.count("y") == 0
+    print("Индекс вхождений: in и count совпадают с перебором")
+
+def test_lazy_concat():
+    """Тестирование объединения без копирования: изменения исходных очередей и объединения не видны друг другу"""
+    q1, q2 = Queue.from_iterable(range(3)), Queue.from_iterable("ab")
+    combined = q1 + q2
+    assert type(combined._items).__name__ == "_ChainStorage"
+    assert list(combined) == [0, 1, 2, "a", "b"] and combined.peek() == 0
+    # Изменение исходной очереди копирует её данные в объединение до изменения
+    q1.dequeue()
+    q1.enqueue(3)
+    q2.clear()
+    assert list(combined) == [0, 1, 2, "a", "b"]
+    assert list(q1) == [1, 2, 3] and list(q2) == []
+
+    q1, q2 = Queue.from_iterable(range(3)), Queue.from_iterable("ab")
+    combined = q1 + q2
+    nested = combined + q1
+    # Извлечение из объединения не трогает исходные очереди и зависящие от него объединения
+    assert [combined.dequeue() for _ in range(4)] == [0, 1, 2, "a"]
+    combined.enqueue("c")
+    assert list(combined) == ["b", "c"] and len(combined) == 2
+    assert list(q1) == [0, 1, 2] and list(q2) == ["a", "b"]
+    assert list(nested) == [0, 1, 2, "a", "b", 0, 1, 2]
+    assert nested.dequeue_many(10) == [0, 1, 2, "a", "b", 0, 1, 2] and nested.is_empty
+    # Исчерпанные и удаленные объединения снимают регистрацию у исходных очередей
+    del combined, nested
+    assert not q1._views and not q2._views
+    assert list(q1 + Queue()) == [0, 1, 2] and list(Queue() + Queue()) == []
+    print("Объединение очередей: копирование только при изменении (copy-on-write)")
+
+def test_from_file():
+    """Тестирование чтения из файла блоками: элементы на границах блоков склеиваются, пустые пропускаются"""
+    text = "alpha, beta,,gamma\r\nдельта,\n\n  epsilon  ,zeta-long-token\n,omega"
+    expected = ["alpha", "beta", "gamma", "дельта", "epsilon", "zeta-long-token", "omega"]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "items.txt")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        for chunk_size in (1, 2, 3, 5, 7, 16, 1 << 20):
+            assert list(Queue.from_file(path, chunk_size=chunk_size)) == expected, chunk_size
+        assert list(Queue.from_file(path, delimiters=",", chunk_size=4))[:2] == ["alpha", "beta"]
+        try:
+            Queue.from_file(path, max_size=6, chunk_size=3)
+            raise AssertionError("max_size is not enforced")
+        except OverflowError:
+            pass
+        empty = os.path.join(tmp, "empty.txt")
+        open(empty, "w").close()
+        assert Queue.from_file(empty).is_empty
+    for chunk_size in (1, 3, 1000):
+        q = Queue.from_iterable((i * i for i in range(10)), chunk_size=chunk_size)
+        assert list(q) == [i * i for i in range(10)], chunk_size
+    print("Чтение из файла: результат не зависит от размера блока")
+
+def test_typed_queue():
+    """Тестирование типизированной очереди: буфер без роста ёмкости и индекс по сохраненным значениям"""
+    q = Queue(max_size=1000, typecode='i')
+    q.enqueue_many(range(1000))
+    for i in range(2000):
+        q.dequeue()
+        q.enqueue(i)
+        assert list(q.buffer()[-2:]) == list(q)[-2:]
+    assert len(q._items._data) == 1000, len(q._items._data)
+
+    q = Queue(typecode='f', indexed=True)
+    q.enqueue(0.1)
+    q.dequeue()
+    assert 0.1 not in q and not q._index
+    q.enqueue_many([0.1, 0.2])
+    stored = q.peek()
+    assert stored in q and q.count(stored) == 1
+    q.dequeue_many(2)
+    assert not q._index
+
+    # Отрицательное количество ничего не извлекает и не портит буфер
+    q = Queue(max_size=10, typecode='i')
+    q.enqueue_many([1, 2, 3])
+    assert len(q.dequeue_many(-1)) == 0 and list(q) == [1, 2, 3] and len(q) == 3
+
+    # Сохранение и загрузка без явного typecode возвращают типизированную очередь
+    with tempfile.TemporaryDirectory() as tmp:
+        for codec in (None, 'json', 'pickle'):
+            path = os.path.join(tmp, f"typed-{codec}")
+            q.save(path, codec)
+            loaded = Queue.load(path, allow_pickle=True)
+            assert loaded.typecode == 'i' and list(loaded.buffer()) == [1, 2, 3], codec
+        path = os.path.join(tmp, "plain.bin")
+        Queue.from_iterable([1, 2]).save(path, 'struct')
+        assert Queue.load(path).typecode is None
+        path = os.path.join(tmp, "async.bin")
+        asyncio.run(AsyncQueue(typecode='d').save(path))
+        assert asyncio.run(AsyncQueue.load(path)).typecode == 'd'
+
+    # Объединение типизированных очередей остается типизированным
+    a, b = Queue(typecode='d'), Queue(typecode='d')
+    a.enqueue_many([1.5, 2.5])
+    b.enqueue(3.5)
+    combined = a + b
+    combined.enqueue(4)
+    assert combined.typecode == 'd' and list(combined.buffer()) == [1.5, 2.5, 3.5, 4.0]
+    assert type(combined.peek()) is float and list(a) == [1.5, 2.5]
+    print("Типизированная очередь: ёмкость не растет, индекс пуст после извлечения, тип переживает save/load и +")
+
+def test_codecs():
+    """Тестирование кодеков: сохранение и загрузка, определение формата, атомарная запись и запрет pickle"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "queue.bin")
+        samples = {
+            "json": _queue_of(1, "two", [3], None),
+            "pickle": _queue_of(b"raw", (1, 2), bytearray(b"buffer" * 100), {"k": 1}),
+            "struct": _queue_of(1, 2, -3, 2 ** 62),
+        }
+        for codec, q in samples.items():
+            q.save(path, codec)
+            assert queue_codecs.detect(path) == codec
+            loaded = Queue.load(path, allow_pickle=codec == "pickle")
+            assert loaded == q, (codec, loaded)
+        assert type(loaded.peek()) is int
+        floats = Queue(typecode='d')
+        floats.enqueue_many([0.5, 1.5])
+        floats.save(path)
+        assert queue_codecs.detect(path) == "struct" and list(Queue.load(path, typecode='d')) == [0.5, 1.5]
+
+        # bytearray действительно уходит вне потока pickle и возвращается тем же типом
+        samples["pickle"].save(path, "pickle")
+        with open(path, "rb") as f:
+            f.seek(4)
+            assert queue_codecs._COUNT.unpack(f.read(8))[0] == 1
+        assert Queue.load(path, allow_pickle=True).dequeue_many(3)[2] == bytearray(b"buffer" * 100)
+
+        # Без явного разрешения pickle не разбирается
+        try:
+            Queue.load(path)
+        except ValueError as e:
+            print(f"Ошибка: {e}")
+        else:
+            raise AssertionError("pickle must require allow_pickle=True")
+
+        # Ошибка кодека оставляет прежний файл целым
+        samples["json"].save(path)
+        try:
+            _queue_of(1, 2.0).save(path, "struct")
+        except TypeError as e:
+            print(f"Ошибка: {e}")
+        assert Queue.load(path) == samples["json"] and not os.path.exists(path + ".tmp")
+    print("Кодеки: json, pickle и struct сохраняют и загружают очередь без потерь")
+
+def _queue_of(*items):
+    """Вспомогательная функция: очередь из перечисленных элементов"""
+    q = Queue()
+    for item in items:
+        q.enqueue(item)
+    return q
+
 if __name__ == "__main__":
     # Запуск тестирования очереди
     test_queue()
+    test_blocking_queue()
+    test_async_queue()
+    test_journaled_queue()
+    test_mmap_queue()
+    test_shared_queue()
+    test_priority_queue()
+    test_queue_stats()
+    test_batch_subclasses()
+    test_indexed_queue()
+    test_lazy_concat()
+    test_from_file()
+    test_typed_queue()
+    test_codecs()
@@ -0,0 +1,123 @@
+import asyncio
+from collections import deque
+from typing import Any, Callable, Deque, Iterable, List, Optional
+
+from task2_queue import Queue
+
+
+class AsyncQueue(Queue):
+    """ Очередь для asyncio: enqueue/dequeue приостанавливают корутину вместо выброса исключения """
+
+    def __init__(self, max_size: Optional[int] = None, **options):
+        """ Инициализирует очередь и списки ожидающих корутин """
+        super().__init__(max_size, **options)
+        self._getters: Deque[asyncio.Future] = deque()
+        self._putters: Deque[asyncio.Future] = deque()
+
+    @staticmethod
+    def _wakeup_next(waiters: Deque[asyncio.Future]) -> None:
+        """ Будит первую ожидающую корутину, пропуская отмененные """
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    async def _wait_turn(self, waiters: Deque[asyncio.Future], blocked: Callable[[], bool]) -> None:
+        """ Ждет своей очереди в порядке прихода, пока операция заблокирована """
+        # Новая корутина встает за уже ожидающими, разбуженная - в начало, чтобы не терять очередность
+        newcomer = True
+        while blocked() or (newcomer and waiters):
+            waiter = asyncio.get_running_loop().create_future()
+            if newcomer:
+                waiters.append(waiter)
+            else:
+                waiters.appendleft(waiter)
+            newcomer = False
+            try:
+                await waiter
+            except BaseException:
+                waiter.cancel()
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                elif not blocked():
+                    # Сигнал уже был отдан этой корутине - передаем его следующей
+                    self._wakeup_next(waiters)
+                raise
+
+    def enqueue_nowait(self, item: Any) -> None:
+        """ Добавляет элемент без ожидания, если очередь не полна """
+        Queue.enqueue(self, item)
+        self._wakeup_next(self._getters)
+
+    def dequeue_nowait(self) -> Any:
+        """ Извлекает первый элемент без ожидания """
+        item = Queue.dequeue(self)
+        self._wakeup_next(self._putters)
+        return item
+
+    def enqueue_many(self, items: Iterable[Any]) -> None:
+        """ Добавляет порцию элементов без ожидания и будит ожидающих потребителей """
+        items = list(items)
+        Queue.enqueue_many(self, items)
+        # Каждый разбуженный потребитель сам будит следующего, пока очередь не пуста
+        if items:
+            self._wakeup_next(self._getters)
+
+    async def enqueue(self, item: Any) -> None:
+        """ Добавляет элемент, приостанавливаясь, пока очередь заполнена """
+        await self._wait_turn(self._putters, lambda: self.is_full)
+        self._put(item)
+        self._wakeup_next(self._getters)
+        if not self.is_full:
+            self._wakeup_next(self._putters)
+
+    async def dequeue(self) -> Any:
+        """ Извлекает первый элемент, приостанавливаясь, пока очередь пуста """
+        await self._wait_turn(self._getters, lambda: self.is_empty)
+        item = self._get()
+        self._wakeup_next(self._putters)
+        if not self.is_empty:
+            self._wakeup_next(self._getters)
+        return item
+
+    async def dequeue_many(self, max_items: int) -> List[Any]:
+        """ Дожидается хотя бы одного элемента и забирает до max_items элементов разом """
+        if max_items < 1:
+            raise ValueError("max_items must be positive")
+        await self._wait_turn(self._getters, lambda: self.is_empty)
+        batch = [self._get() for _ in range(min(max_items, self.size))]
+        for _ in batch:
+            self._wakeup_next(self._putters)
+        if not self.is_empty:
+            self._wakeup_next(self._getters)
+        return batch
+
+    def clear(self) -> None:
+        """ Очищает очередь и будит ожидающих производителей """
+        super().clear()
+        while self._putters and not self.is_full:
+            self._wakeup_next(self._putters)
+
+    @classmethod
+    def from_string(cls, string: str) -> 'AsyncQueue':
+        """ Создает очередь из строки, элементы разделены запятой """
+        queue = cls()
+        if string:
+            for item in string.split(','):
+                queue.enqueue_nowait(item.strip())
+        return queue
+
+    async def save(self, filename: str, codec: Optional[str] = None) -> None:
+        """ Сохраняет снимок очереди в файл в отдельном потоке, не блокируя цикл событий """
+        snapshot = Queue(max_size=self._max_size, typecode=self._typecode)
+        snapshot._items.extend(self._items)
+        await asyncio.to_thread(snapshot.save, filename, codec)
+
+    @classmethod
+    async def load(cls, filename: str, allow_pickle: bool = False) -> 'AsyncQueue':
+        """ Загружает очередь из файла в отдельном потоке, не блокируя цикл событий """
+        loaded = await asyncio.to_thread(Queue.load, filename, allow_pickle=allow_pickle)
+        queue = cls(max_size=loaded._max_size, typecode=loaded.typecode)
+        queue._items = loaded._items
+        return queue
@@ -0,0 +1,125 @@
+import threading
+import time
+from typing import Any, Iterable, List, Optional, Sequence
+
+from task2_queue import Queue
+
+
+class BlockingQueue(Queue):
+    """ Потокобезопасная очередь с блокирующими put/get для схемы производитель-потребитель """
+
+    def __init__(self, max_size: Optional[int] = None, **options):
+        """ Инициализирует очередь и условные переменные над общей блокировкой """
+        super().__init__(max_size, **options)
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    @staticmethod
+    def _deadline(timeout: Optional[float]) -> Optional[float]:
+        """ Переводит таймаут в момент времени, после которого ожидание прекращается """
+        if timeout is None:
+            return None
+        if timeout < 0:
+            raise ValueError("Timeout must be non-negative")
+        return time.monotonic() + timeout
+
+    @staticmethod
+    def _wait(condition: threading.Condition, deadline: Optional[float]) -> bool:
+        """ Ждет сигнала условия до дедлайна; возвращает False, если время вышло """
+        if deadline is None:
+            condition.wait()
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        condition.wait(remaining)
+        return True
+
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None) -> None:
+        """ Добавляет элемент, при заполненной очереди ожидая освобождения места """
+        deadline = self._deadline(timeout)
+        with self._not_full:
+            while self.is_full:
+                if not block or not self._wait(self._not_full, deadline):
+                    self._reject_full()
+            self._put(item)
+            self._not_empty.notify()
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """ Извлекает первый элемент, при пустой очереди ожидая его появления """
+        deadline = self._deadline(timeout)
+        with self._not_empty:
+            while self.is_empty:
+                if not block or not self._wait(self._not_empty, deadline):
+                    self._reject_empty()
+            item = self._get()
+            self._not_full.notify()
+            return item
+
+    def put_many(self, items: Iterable[Any], timeout: Optional[float] = None) -> None:
+        """ Добавляет все элементы, захватывая блокировку один раз на каждую порцию свободного места """
+        pending = list(items)
+        deadline = self._deadline(timeout)
+        position = 0
+        with self._not_full:
+            while position < len(pending):
+                while self.is_full:
+                    if not self._wait(self._not_full, deadline):
+                        if self._stats is not None:
+                            self._stats.on_reject_full()
+                        raise OverflowError(f"Queue is full, {position} of {len(pending)} items added")
+                if self._max_size is None:
+                    free = len(pending) - position
+                else:
+                    free = min(self._max_size - self.size, len(pending) - position)
+                for item in pending[position:position + free]:
+                    self._put(item)
+                position += free
+                self._not_empty.notify(free)
+
+    def get_many(self, max_items: int, timeout: Optional[float] = None) -> List[Any]:
+        """ Извлекает до max_items элементов за один захват блокировки, ожидая хотя бы один """
+        if max_items < 1:
+            raise ValueError("max_items must be positive")
+        deadline = self._deadline(timeout)
+        with self._not_empty:
+            while self.is_empty:
+                if not self._wait(self._not_empty, deadline):
+                    self._reject_empty()
+            batch = [self._get() for _ in range(min(max_items, self.size))]
+            self._not_full.notify(len(batch))
+            return batch
+
+    def enqueue(self, item: Any) -> None:
+        """ Добавляет элемент без ожидания, если очередь не полна """
+        self.put(item, block=False)
+
+    def dequeue(self) -> Any:
+        """ Извлекает первый элемент без ожидания """
+        return self.get(block=False)
+
+    def enqueue_many(self, items: Iterable[Any]) -> None:
+        """ Добавляет порцию элементов без ожидания под блокировкой и будит ожидающих потребителей """
+        items = list(items)
+        with self._lock:
+            super().enqueue_many(items)
+            self._not_empty.notify(len(items))
+
+    def dequeue_many(self, count: int) -> Sequence[Any]:
+        """ Извлекает до count элементов без ожидания под блокировкой и будит ожидающих производителей """
+        with self._lock:
+            batch = super().dequeue_many(count)
+            self._not_full.notify(len(batch))
+            return batch
+
+    def peek(self) -> Any:
+        """ Возвращает первый элемент очереди без его удаления """
+        with self._lock:
+            return super().peek()
+
+    def clear(self) -> None:
+        """ Очищает очередь и будит ожидающих производителей """
+        with self._lock:
+            super().clear()
+            self._not_full.notify_all()
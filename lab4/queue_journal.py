@@ -0,0 +1,254 @@
+import json
+import os
+import threading
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from task2_queue import Queue
+
+# Метка отсутствующего элемента в записи журнала
+_NO_ITEM = object()
+
+
+class JournaledQueue(Queue):
+    """ Очередь с журналом упреждающей записи: каждая операция дописывается в лог вместо перезаписи файла """
+
+    def __init__(self, max_size: Optional[int] = None, path: Optional[str] = None,
+                 fsync_every: Optional[int] = None, compact_threshold: int = 1 << 20, **options):
+        """ Инициализирует очередь; при заданном path восстанавливает состояние из снимка и журнала """
+        super().__init__(max_size, **options)
+        self._path = path
+        self._fsync_every = fsync_every
+        self._compact_threshold = compact_threshold
+        self._lock = threading.RLock()
+        self._seq = 0
+        self._log = None
+        self._log_bytes = 0
+        self._unsynced = 0
+        self._compactor: Optional[threading.Thread] = None
+        if path is not None:
+            self._recover()
+
+    @property
+    def _log_path(self) -> str:
+        """ Путь к текущему журналу """
+        return self._path + '.wal'
+
+    @property
+    def _old_log_path(self) -> str:
+        """ Путь к журналу, отложенному на время фонового уплотнения """
+        return self._path + '.wal.old'
+
+    @classmethod
+    def open(cls, path: str, max_size: Optional[int] = None, **options) -> 'JournaledQueue':
+        """ Открывает журналируемую очередь по пути к снимку, создавая её при отсутствии файлов """
+        return cls(max_size=max_size, path=path, **options)
+
+    @staticmethod
+    def _read_log(filename: str) -> Tuple[List[dict], int]:
+        """ Читает записи журнала до первой оборванной или поврежденной; возвращает их и длину целой части """
+        records = []
+        valid_bytes = 0
+        if not os.path.exists(filename):
+            return records, valid_bytes
+        with open(filename, 'rb') as f:
+            for line in f:
+                # Запись без перевода строки - недописанный хвост после сбоя
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+                valid_bytes += len(line)
+        return records, valid_bytes
+
+    def _apply(self, record: dict) -> None:
+        """ Применяет запись журнала к содержимому очереди """
+        op = record['op']
+        if op == 'enq':
+            self._put(record['item'])
+        elif op == 'deq':
+            self._get()
+        elif op == 'clr':
+            Queue.clear(self)
+
+    def _recover(self) -> None:
+        """ Восстанавливает очередь: снимок, затем записи отложенного и текущего журналов по порядку номеров """
+        if os.path.exists(self._path):
+            with open(self._path, 'r') as f:
+                data = json.load(f)
+            self._max_size = data['max_size']
+            self._items = self._new_storage()
+            self._items.extend(data['items'])
+            self._reindex()
+            self._seq = data.get('seq', 0)
+        for filename in (self._old_log_path, self._log_path):
+            records, valid_bytes = self._read_log(filename)
+            for record in records:
+                if record['seq'] <= self._seq:
+                    continue
+                if record['seq'] != self._seq + 1:
+                    break
+                self._apply(record)
+                self._seq = record['seq']
+            if os.path.exists(filename) and valid_bytes < os.path.getsize(filename):
+                # Отбрасываем оборванную запись, чтобы новые дописывались с целой границы
+                with open(filename, 'r+b') as f:
+                    f.truncate(valid_bytes)
+        # Фиксируем восстановленное состояние в снимке и начинаем журнал с чистого листа
+        self._write_snapshot(list(self._items), self._seq)
+        for filename in (self._old_log_path, self._log_path):
+            if os.path.exists(filename):
+                os.remove(filename)
+        self._log = open(self._log_path, 'a', encoding='utf-8')
+        self._log_bytes = 0
+
+    def _write_snapshot(self, items: List[Any], seq: int) -> None:
+        """ Атомарно записывает снимок через временный файл и переименование """
+        tmp_path = self._path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'max_size': self._max_size, 'items': items, 'seq': seq}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path)
+
+    def _append_record(self, op: str, item: Any = _NO_ITEM) -> None:
+        """ Дописывает операцию в журнал до её применения к очереди """
+        if self._log is None:
+            return
+        record = {'seq': self._seq + 1, 'op': op}
+        if item is not _NO_ITEM:
+            record['item'] = item
+        line = json.dumps(record) + '\n'
+        self._log.write(line)
+        self._log.flush()
+        self._seq += 1
+        self._log_bytes += len(line)
+        self._unsynced += 1
+        if self._fsync_every is not None and self._unsynced >= self._fsync_every:
+            os.fsync(self._log.fileno())
+            self._unsynced = 0
+
+    def _maybe_compact(self) -> None:
+        """ Запускает фоновое уплотнение, когда журнал перерос порог; вызывается после применения операции """
+        if self._log is not None and self._log_bytes >= self._compact_threshold:
+            self.compact(wait=False)
+
+    def enqueue(self, item: Any) -> None:
+        """ Добавляет элемент в очередь, предварительно записав операцию в журнал """
+        with self._lock:
+            if self.is_full:
+                self._reject_full()
+            self._append_record('enq', item)
+            self._put(item)
+            self._maybe_compact()
+
+    def dequeue(self) -> Any:
+        """ Удаляет и возвращает первый элемент, предварительно записав операцию в журнал """
+        with self._lock:
+            if self.is_empty:
+                self._reject_empty()
+            self._append_record('deq')
+            item = self._get()
+            self._maybe_compact()
+            return item
+
+    def enqueue_many(self, items: Iterable[Any]) -> None:
+        """ Добавляет порцию элементов, записав в журнал каждый из них до применения """
+        with self._lock:
+            items = list(items)
+            if self._max_size is not None and self.size + len(items) > self._max_size:
+                self._reject_full()
+            for item in items:
+                self._append_record('enq', item)
+            self._extend(items)
+            self._maybe_compact()
+
+    def dequeue_many(self, count: int) -> Sequence[Any]:
+        """ Удаляет и возвращает до count первых элементов, записав в журнал каждое извлечение """
+        with self._lock:
+            if self.is_empty:
+                self._reject_empty()
+            for _ in range(min(count, self.size)):
+                self._append_record('deq')
+            batch = super().dequeue_many(count)
+            self._maybe_compact()
+            return batch
+
+    def clear(self) -> None:
+        """ Очищает очередь, предварительно записав операцию в журнал """
+        with self._lock:
+            self._append_record('clr')
+            super().clear()
+            self._maybe_compact()
+
+    def compact(self, wait: bool = True) -> None:
+        """ Переносит содержимое журнала в новый снимок; при wait=False - в фоновом потоке """
+        if wait:
+            self._compactor_join()
+        with self._lock:
+            # Одновременно идет не больше одного уплотнения
+            if self._log is None or self._compactor is not None:
+                return
+            # Откладываем текущий журнал и сразу открываем новый, чтобы не задерживать операции
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._log.close()
+            os.replace(self._log_path, self._old_log_path)
+            self._log = open(self._log_path, 'a', encoding='utf-8')
+            self._log_bytes = 0
+            self._unsynced = 0
+            items, seq = list(self._items), self._seq
+            self._compactor = threading.Thread(target=self._finish_compaction, args=(items, seq))
+            self._compactor.start()
+        if wait:
+            self._compactor_join()
+
+    def _finish_compaction(self, items: List[Any], seq: int) -> None:
+        """ Записывает снимок и удаляет отложенный журнал, записи которого в него вошли """
+        self._write_snapshot(items, seq)
+        os.remove(self._old_log_path)
+        self._compactor = None
+
+    def _compactor_join(self) -> None:
+        """ Дожидается завершения фонового уплотнения, если оно идет """
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def flush(self) -> None:
+        """ Сбрасывает журнал на диск вместе с fsync """
+        with self._lock:
+            if self._log is not None:
+                self._log.flush()
+                os.fsync(self._log.fileno())
+                self._unsynced = 0
+
+    def close(self) -> None:
+        """ Дожидается уплотнения, сбрасывает и закрывает журнал """
+        self._compactor_join()
+        self.flush()
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def __enter__(self) -> 'JournaledQueue':
+        """ Поддержка менеджера контекста """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """ Закрывает журнал при выходе из блока with """
+        self.close()
+
+    def save(self, filename: Optional[str] = None, codec: Optional[str] = None) -> None:
+        """ Уплотняет журнал в снимок; с другим именем файла сохраняет очередь как Queue.save """
+        if filename is None or filename == self._path:
+            self.compact(wait=True)
+        else:
+            super().save(filename, codec)
+
+    @classmethod
+    def load(cls, filename: str, **options) -> 'JournaledQueue':
+        """ Загружает очередь из снимка и журнала, переживая оборванную последнюю запись """
+        return cls.open(filename, **options)
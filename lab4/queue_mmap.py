@@ -0,0 +1,202 @@
+import mmap
+import os
+import pickle
+import struct
+from typing import Any, Dict, Optional
+
+# Заголовок: сигнатура, max_size (-1 - без ограничения), размер сегмента,
+# голова (сегмент, смещение), хвост (сегмент, смещение), количество элементов
+_HEADER = struct.Struct('<4sqQQQQQQ')
+_MAGIC = b'MMQ1'
+_LENGTH = struct.Struct('<I')
+# Длина-маркер: остаток сегмента пуст, следующая запись лежит в начале следующего сегмента
+_SKIP = 0xFFFFFFFF
+
+
+class MmapQueue:
+    """ Персистентная очередь в отображаемых в память файлах-сегментах для объемов больше ОЗУ """
+
+    def __init__(self, path: str, max_size: Optional[int] = None, segment_size: int = 64 << 20):
+        """ Открывает очередь в каталоге path, создавая её при отсутствии заголовка """
+        self._path = path
+        os.makedirs(path, exist_ok=True)
+        header_path = os.path.join(path, 'header')
+        if not os.path.exists(header_path):
+            with open(header_path, 'wb') as f:
+                f.write(_HEADER.pack(_MAGIC, -1 if max_size is None else max_size,
+                                     segment_size, 0, 0, 0, 0, 0))
+        self._header_file = open(header_path, 'r+b')
+        self._header = mmap.mmap(self._header_file.fileno(), _HEADER.size)
+        magic, stored_max, self._segment_size, *_ = _HEADER.unpack_from(self._header)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a memory-mapped queue")
+        self._max_size = None if stored_max < 0 else stored_max
+        (self._head_seg, self._head_off, self._tail_seg,
+         self._tail_off, self._count) = _HEADER.unpack_from(self._header)[3:]
+        # В памяти держим только горячие сегменты: головной и хвостовой
+        self._segments: Dict[int, mmap.mmap] = {}
+        self._remove_stale_segments()
+
+    @classmethod
+    def open(cls, path: str, max_size: Optional[int] = None, segment_size: int = 64 << 20) -> 'MmapQueue':
+        """ Открывает или создает очередь в каталоге path """
+        return cls(path, max_size=max_size, segment_size=segment_size)
+
+    def _segment_path(self, number: int) -> str:
+        """ Возвращает путь к файлу сегмента """
+        return os.path.join(self._path, f'{number:08d}.seg')
+
+    def _remove_stale_segments(self) -> None:
+        """ Удаляет сегменты вне диапазона голова-хвост, оставшиеся после сбоя """
+        for name in os.listdir(self._path):
+            if name.endswith('.seg'):
+                number = int(name[:-4])
+                if not self._head_seg <= number <= self._tail_seg:
+                    os.remove(os.path.join(self._path, name))
+
+    def _segment(self, number: int, min_size: int = 0) -> mmap.mmap:
+        """ Отображает сегмент в память, создавая файл нужного размера при необходимости """
+        segment = self._segments.get(number)
+        if segment is None:
+            path = self._segment_path(number)
+            with open(path, 'a+b') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < max(self._segment_size, min_size):
+                    f.truncate(max(self._segment_size, min_size))
+                segment = mmap.mmap(f.fileno(), 0)
+            self._segments[number] = segment
+        return segment
+
+    def _release(self, number: int, delete: bool = False) -> None:
+        """ Убирает сегмент из памяти и при delete=True удаляет его файл """
+        segment = self._segments.pop(number, None)
+        if segment is not None:
+            segment.close()
+        if delete and os.path.exists(self._segment_path(number)):
+            os.remove(self._segment_path(number))
+
+    def _store_header(self) -> None:
+        """ Фиксирует указатели головы и хвоста в заголовке """
+        _HEADER.pack_into(self._header, 0, _MAGIC, -1 if self._max_size is None else self._max_size,
+                          self._segment_size, self._head_seg, self._head_off,
+                          self._tail_seg, self._tail_off, self._count)
+
+    @property
+    def size(self) -> int:
+        """ Возвращает количество элементов в очереди """
+        return self._count
+
+    @property
+    def is_empty(self) -> bool:
+        """ Проверяет, пуста ли очередь """
+        return self._count == 0
+
+    @property
+    def is_full(self) -> bool:
+        """ Проверяет, заполнена ли очередь до максимального размера """
+        return self._max_size is not None and self._count >= self._max_size
+
+    def __len__(self) -> int:
+        """ Возвращает количество элементов в очереди """
+        return self._count
+
+    def enqueue(self, item: Any) -> None:
+        """ Дописывает запись в хвостовой сегмент, затем сдвигает хвост в заголовке """
+        if self.is_full:
+            raise OverflowError("Queue is full")
+        payload = pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+        needed = _LENGTH.size + len(payload)
+        segment = self._segment(self._tail_seg, needed)
+        if self._tail_off + needed > len(segment):
+            # Запись не помещается: помечаем остаток сегмента и переходим к следующему
+            if self._tail_off + _LENGTH.size <= len(segment):
+                _LENGTH.pack_into(segment, self._tail_off, _SKIP)
+            if self._tail_seg != self._head_seg:
+                self._release(self._tail_seg)
+            self._tail_seg += 1
+            self._tail_off = 0
+            segment = self._segment(self._tail_seg, needed)
+        _LENGTH.pack_into(segment, self._tail_off, len(payload))
+        segment[self._tail_off + _LENGTH.size:self._tail_off + needed] = payload
+        self._tail_off += needed
+        self._count += 1
+        self._store_header()
+
+    def _read_head(self) -> memoryview:
+        """ Находит запись в голове очереди, пропуская хвосты прочитанных сегментов """
+        while True:
+            segment = self._segment(self._head_seg)
+            offset = self._head_off
+            if offset + _LENGTH.size <= len(segment):
+                (length,) = _LENGTH.unpack_from(segment, offset)
+                if length != _SKIP:
+                    start = offset + _LENGTH.size
+                    return memoryview(segment)[start:start + length]
+            # Сегмент полностью прочитан - сначала фиксируем переход к следующему, затем удаляем файл
+            finished = self._head_seg
+            self._head_seg += 1
+            self._head_off = 0
+            self._store_header()
+            self._release(finished, delete=True)
+
+    def peek(self) -> Any:
+        """ Возвращает первый элемент очереди без его удаления """
+        if self.is_empty:
+            raise IndexError("Queue is empty")
+        with self._read_head() as record:
+            return pickle.loads(record)
+
+    def dequeue(self) -> Any:
+        """ Читает запись в голове, затем сдвигает голову в заголовке """
+        if self.is_empty:
+            raise IndexError("Queue is empty")
+        with self._read_head() as record:
+            item = pickle.loads(record)
+            self._head_off += _LENGTH.size + len(record)
+        self._count -= 1
+        if self._count == 0 and self._head_seg == self._tail_seg:
+            # Очередь опустела - начинаем сегмент заново, не держа мертвые данные
+            self._head_off = self._tail_off = 0
+        self._store_header()
+        return item
+
+    def clear(self) -> None:
+        """ Удаляет все элементы и файлы сегментов """
+        for number in range(self._head_seg, self._tail_seg + 1):
+            self._release(number, delete=True)
+        self._head_seg = self._tail_seg = self._tail_seg + 1
+        self._head_off = self._tail_off = 0
+        self._count = 0
+        self._store_header()
+
+    def flush(self) -> None:
+        """ Сбрасывает изменения отображенных сегментов и заголовка на диск """
+        for segment in self._segments.values():
+            segment.flush()
+        self._header.flush()
+
+    def close(self) -> None:
+        """ Сбрасывает данные на диск и освобождает отображения """
+        if self._header.closed:
+            return
+        self.flush()
+        for number in list(self._segments):
+            self._release(number)
+        self._header.close()
+        self._header_file.close()
+
+    def __enter__(self) -> 'MmapQueue':
+        """ Поддержка менеджера контекста """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """ Закрывает очередь при выходе из блока with """
+        self.close()
+
+    def __str__(self) -> str:
+        """ Возвращает строковое представление очереди """
+        return f"MmapQueue({self._path!r}, size={self._count})"
+
+    def __repr__(self) -> str:
+        """ Возвращает строковое представление очереди с максимальным размером """
+        return f"MmapQueue(path={self._path!r}, max_size={self._max_size}, size={self._count})"
@@ -0,0 +1,202 @@
+import heapq
+import time
+from itertools import count
+from typing import Any, Callable, Iterator, List, Optional
+
+import queue_codecs
+from task2_queue import Queue
+
+
+class PriorityQueue(Queue):
+    """ Очередь с приоритетами на двоичной куче с порядком FIFO внутри приоритета и отложенной доставкой """
+
+    # Куча записей не читается объединениями напрямую: Queue + PriorityQueue копирует элементы
+    _chainable = False
+
+    def __init__(self, max_size: Optional[int] = None, clock: Callable[[], float] = time.time, **options):
+        """ Инициализирует очередь; clock - источник времени для отложенной доставки, options - как у Queue """
+        super().__init__(max_size, **options)
+        if self._index is not None or self._typecode is not None:
+            raise ValueError("PriorityQueue supports neither indexed nor typed storage")
+        # Готовые элементы: (приоритет, порядковый номер, элемент)
+        # Отложенные: (момент готовности, приоритет, порядковый номер, элемент)
+        self._delayed: List[tuple] = []
+        self._counter = count()
+        self._clock = clock
+
+    def _new_storage(self) -> List[tuple]:
+        """ Хранилище готовых элементов - куча записей """
+        return []
+
+    def _put(self, item: Any) -> None:
+        """ Помещает элемент с нулевым приоритетом без проверки размера """
+        self._promote()
+        heapq.heappush(self._items, (0, next(self._counter), item))
+
+    def _get(self) -> Any:
+        """ Извлекает готовый элемент с наименьшим приоритетом """
+        return self.dequeue()
+
+    def _extend(self, items) -> None:
+        """ Добавляет порцию элементов с нулевым приоритетом и одной проверкой размера """
+        if self._max_size is not None and self.size + len(items) > self._max_size:
+            self._reject_full()
+        for item in items:
+            self._put(item)
+        if self._stats is not None:
+            self._stats.on_put_many(len(items), self.size)
+
+    def _promote(self) -> None:
+        """ Переносит наступившие отложенные элементы в кучу готовых в порядке их готовности """
+        if not self._delayed:
+            return
+        now = self._clock()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, priority, _, item = heapq.heappop(self._delayed)
+            heapq.heappush(self._items, (priority, next(self._counter), item))
+
+    @property
+    def size(self) -> int:
+        """ Возвращает количество элементов в очереди, включая отложенные """
+        return len(self._items) + len(self._delayed)
+
+    @property
+    def ready_size(self) -> int:
+        """ Возвращает количество элементов, доступных для извлечения сейчас """
+        self._promote()
+        return len(self._items)
+
+    @property
+    def next_ready_at(self) -> Optional[float]:
+        """ Возвращает момент готовности ближайшего отложенного элемента или None """
+        return self._delayed[0][0] if self._delayed else None
+
+    def enqueue(self, item: Any, priority: int = 0, delay: Optional[float] = None,
+                at: Optional[float] = None) -> None:
+        """ Добавляет элемент с приоритетом; delay (секунды) или at (момент времени) откладывают его видимость """
+        if self.is_full:
+            self._reject_full()
+        # Наступившие отложенные элементы встают в очередь раньше добавляемого сейчас
+        self._promote()
+        if delay is not None:
+            at = self._clock() + delay
+        if at is not None and at > self._clock():
+            heapq.heappush(self._delayed, (at, priority, next(self._counter), item))
+        else:
+            heapq.heappush(self._items, (priority, next(self._counter), item))
+        if self._stats is not None:
+            self._stats.on_put(self.size)
+
+    def dequeue(self) -> Any:
+        """ Удаляет и возвращает готовый элемент с наименьшим приоритетом """
+        item = heapq.heappop(self._ready_items())[2]
+        if self._stats is not None:
+            # Время ожидания считается по самому раннему добавлению: для очереди с приоритетами оно приблизительно
+            self._stats.on_get(self.size)
+        return item
+
+    def peek(self) -> Any:
+        """ Возвращает готовый элемент с наименьшим приоритетом без его удаления """
+        return self._ready_items()[0][2]
+
+    def dequeue_many(self, count: int) -> List[Any]:
+        """ Удаляет и возвращает до count готовых элементов в порядке приоритета """
+        ready = self._ready_items()
+        if self._stats is None:
+            return [heapq.heappop(ready)[2] for _ in range(min(count, len(ready)))]
+        batch = []
+        for _ in range(min(count, len(ready))):
+            batch.append(heapq.heappop(ready)[2])
+            self._stats.on_get(self.size)
+        return batch
+
+    def _ready_items(self) -> List[tuple]:
+        """ Возвращает кучу готовых элементов или сообщает, почему извлекать нечего """
+        self._promote()
+        if not self._items:
+            if self._stats is not None:
+                self._stats.on_reject_empty()
+            if self._delayed:
+                raise IndexError("No items are ready yet")
+            raise IndexError("Queue is empty")
+        return self._items
+
+    def clear(self) -> None:
+        """ Очищает очередь от всех элементов, включая отложенные """
+        if self._stats is not None:
+            self._stats.on_clear(self.size)
+        self._items.clear()
+        self._delayed.clear()
+
+    def _entries(self) -> List[tuple]:
+        """ Возвращает записи в порядке извлечения: готовые, затем отложенные по моменту готовности """
+        self._promote()
+        return sorted(self._items) + sorted(self._delayed)
+
+    def __iter__(self) -> Iterator[Any]:
+        """ Перебирает элементы в порядке извлечения без их удаления """
+        return (entry[-1] for entry in self._entries())
+
+    def __str__(self) -> str:
+        """ Возвращает строковое представление очереди """
+        return f"PriorityQueue({list(self)})"
+
+    def __repr__(self) -> str:
+        """ Возвращает строковое представление очереди с максимальным размером """
+        return f"PriorityQueue(max_size={self._max_size}, items={list(self)})"
+
+    def __contains__(self, item: Any) -> bool:
+        """ Проверяет, содержится ли элемент в очереди """
+        return any(entry[-1] == item for entry in self._items + self._delayed)
+
+    def count(self, item: Any) -> int:
+        """ Возвращает количество вхождений элемента """
+        return sum(1 for entry in self._items + self._delayed if entry[-1] == item)
+
+    def __eq__(self, other: object) -> bool:
+        """ Сравнивает очереди по элементам в порядке извлечения """
+        if not isinstance(other, Queue):
+            return False
+        return list(self) == list(other)
+
+    def __add__(self, other: 'Queue') -> 'PriorityQueue':
+        """ Объединяет очереди; элементы обычной очереди получают нулевой приоритет """
+        merged = PriorityQueue(max_size=self._max_size, clock=self._clock)
+        for queue in (self, other):
+            if isinstance(queue, PriorityQueue):
+                for priority, _, item in sorted(queue._items):
+                    heapq.heappush(merged._items, (priority, next(merged._counter), item))
+                for at, priority, _, item in sorted(queue._delayed):
+                    heapq.heappush(merged._delayed, (at, priority, next(merged._counter), item))
+            else:
+                for item in queue:
+                    heapq.heappush(merged._items, (0, next(merged._counter), item))
+        return merged
+
+    def save(self, filename: str, codec: Optional[str] = None) -> None:
+        """ Сохраняет очередь вместе с приоритетами и моментами готовности; по умолчанию в JSON """
+        if codec == 'struct':
+            # struct хранит только однородные числа, а записям нужны приоритет и момент готовности
+            raise ValueError("PriorityQueue can be saved only with the 'json' or 'pickle' codec")
+        entries = [[priority, None, item] for priority, _, item in sorted(self._items)]
+        entries += [[priority, at, item] for at, priority, _, item in sorted(self._delayed)]
+        data = {
+            'max_size': self._max_size,
+            'entries': entries
+        }
+        queue_codecs.dump(data, filename, codec or 'json')
+
+    @classmethod
+    def load(cls, filename: str, clock: Callable[[], float] = time.time,
+             allow_pickle: bool = False) -> 'PriorityQueue':
+        """ Загружает очередь, восстанавливая порядок FIFO внутри приоритетов; pickle - только с allow_pickle=True """
+        data = queue_codecs.load(filename, allow_pickle)
+        queue = cls(max_size=data['max_size'], clock=clock)
+        for priority, at, item in data['entries']:
+            if at is None:
+                queue._items.append((priority, next(queue._counter), item))
+            else:
+                queue._delayed.append((at, priority, next(queue._counter), item))
+        heapq.heapify(queue._items)
+        heapq.heapify(queue._delayed)
+        return queue
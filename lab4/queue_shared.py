@@ -0,0 +1,305 @@
+import multiprocessing
+import pickle
+import struct
+from multiprocessing import shared_memory
+from typing import Any, Iterable, Iterator, List, Optional
+
+import queue_codecs
+from task2_queue import Queue
+
+# Заголовок общей памяти: голова, хвост (байтовые смещения в кольце), количество элементов,
+# занято байт (вместе с пропущенными хвостами), max_size (-1 - без ограничения), ёмкость кольца
+_HEADER = struct.Struct('<QQQQqQ')
+_LENGTH = struct.Struct('<I')
+# Длина-маркер: до конца кольца записей нет, следующая лежит в начале
+_SKIP = 0xFFFFFFFF
+
+
+def _attach(name: str, inherited: bool) -> shared_memory.SharedMemory:
+    """ Подключается к существующему блоку общей памяти, не поручая его удаление трекеру ресурсов процесса """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # До Python 3.13 подключение регистрирует блок в трекере ресурсов. Дочерние процессы делят
+        # трекер с создателем, и повторная регистрация безвредна; трекер постороннего процесса
+        # удалил бы блок при завершении этого процесса
+        memory = shared_memory.SharedMemory(name=name)
+        if not inherited:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(memory._name, 'shared_memory')
+        return memory
+
+
+class SharedQueue:
+    """ Очередь в общей памяти для нескольких процессов: кольцо записей «длина + pickle» под общей блокировкой """
+
+    def __init__(self, max_size: Optional[int] = None, capacity: int = 1 << 20, lock=None):
+        """ Создает блок общей памяти с кольцом на capacity байт """
+        self._memory = shared_memory.SharedMemory(create=True, size=_HEADER.size + capacity)
+        self._lock = lock if lock is not None else multiprocessing.Lock()
+        self._owner = True
+        self._buffer = self._memory.buf
+        _HEADER.pack_into(self._buffer, 0, 0, 0, 0, 0, -1 if max_size is None else max_size, capacity)
+
+    @classmethod
+    def attach(cls, name: str, lock) -> 'SharedQueue':
+        """ Подключается к очереди, созданной другим процессом, по имени блока и общей блокировке """
+        queue = cls.__new__(cls)
+        queue._attach(name, lock, inherited=False)
+        return queue
+
+    def __getstate__(self) -> tuple:
+        """ При передаче в дочерний процесс передаются только имя блока и блокировка """
+        return self._memory.name, self._lock
+
+    def __setstate__(self, state: tuple) -> None:
+        """ Подключается к блоку общей памяти в дочернем процессе """
+        self._attach(*state, inherited=True)
+
+    def _attach(self, name: str, lock, inherited: bool) -> None:
+        """ Подключается к блоку общей памяти без права его освобождать """
+        self._memory = _attach(name, inherited)
+        self._lock = lock
+        self._owner = False
+        self._buffer = self._memory.buf
+
+    @property
+    def name(self) -> str:
+        """ Возвращает имя блока общей памяти """
+        return self._memory.name
+
+    def _header(self) -> List[int]:
+        """ Читает заголовок: голова, хвост, количество, занято, max_size, ёмкость """
+        return list(_HEADER.unpack_from(self._buffer, 0))
+
+    def _store(self, header: List[int]) -> None:
+        """ Записывает заголовок """
+        _HEADER.pack_into(self._buffer, 0, *header)
+
+    @property
+    def size(self) -> int:
+        """ Возвращает количество элементов в очереди """
+        with self._lock:
+            return self._header()[2]
+
+    @property
+    def is_empty(self) -> bool:
+        """ Проверяет, пуста ли очередь """
+        return self.size == 0
+
+    @property
+    def is_full(self) -> bool:
+        """ Проверяет, заполнена ли очередь до максимального размера """
+        with self._lock:
+            _, _, count, _, max_size, _ = self._header()
+        return max_size >= 0 and count >= max_size
+
+    def __len__(self) -> int:
+        """ Возвращает количество элементов в очереди """
+        return self.size
+
+    def _write(self, header: List[int], payload: bytes) -> None:
+        """ Кладет запись в хвост кольца; при нехватке места выбрасывает OverflowError """
+        head, tail, count, used, max_size, capacity = header
+        if max_size >= 0 and count >= max_size:
+            raise OverflowError("Queue is full")
+        needed = _LENGTH.size + len(payload)
+        if needed > capacity:
+            raise ValueError("Item is larger than the shared buffer")
+        # Запись не делится: если до конца кольца не помещается, остаток пропускается.
+        # Перенос решается по месту, а не по остатку: хвост ровно в конце кольца дает нулевой остаток
+        wrap = tail + needed > capacity
+        waste = capacity - tail if wrap else 0
+        if used + waste + needed > capacity:
+            raise OverflowError("Queue is full")
+        if waste >= _LENGTH.size:
+            _LENGTH.pack_into(self._buffer, _HEADER.size + tail, _SKIP)
+        position = 0 if wrap else tail
+        start = _HEADER.size + position
+        _LENGTH.pack_into(self._buffer, start, len(payload))
+        self._buffer[start + _LENGTH.size:start + needed] = payload
+        header[1] = position + needed
+        header[2] = count + 1
+        header[3] = used + waste + needed
+
+    def _locate(self, header: List[int]) -> int:
+        """ Пропускает хвост кольца без записей и возвращает смещение записи в голове """
+        head, _, _, _, _, capacity = header
+        if capacity - head < _LENGTH.size or \
+                _LENGTH.unpack_from(self._buffer, _HEADER.size + head)[0] == _SKIP:
+            header[3] -= capacity - head
+            header[0] = head = 0
+        return head
+
+    def _read(self, header: List[int], remove: bool) -> Any:
+        """ Читает запись в голове кольца и при remove=True удаляет её """
+        if not header[2]:
+            raise IndexError("Queue is empty")
+        head = self._locate(header)
+        start = _HEADER.size + head
+        (length,) = _LENGTH.unpack_from(self._buffer, start)
+        item = pickle.loads(self._buffer[start + _LENGTH.size:start + _LENGTH.size + length])
+        if remove:
+            header[0] = head + _LENGTH.size + length
+            header[2] -= 1
+            header[3] -= _LENGTH.size + length
+            if not header[2]:
+                # Очередь опустела - кольцо начинается заново
+                header[0] = header[1] = header[3] = 0
+        return item
+
+    def enqueue(self, item: Any) -> None:
+        """ Добавляет элемент, если в очереди есть место """
+        payload = pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            header = self._header()
+            self._write(header, payload)
+            self._store(header)
+
+    def dequeue(self) -> Any:
+        """ Удаляет и возвращает первый элемент из очереди """
+        with self._lock:
+            header = self._header()
+            item = self._read(header, remove=True)
+            self._store(header)
+        return item
+
+    def peek(self) -> Any:
+        """ Возвращает первый элемент очереди без его удаления """
+        with self._lock:
+            return self._read(self._header(), remove=False)
+
+    def enqueue_many(self, items: Iterable[Any]) -> int:
+        """ Добавляет элементы за один захват блокировки, пока есть место; возвращает число добавленных """
+        payloads = [pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL) for item in items]
+        added = 0
+        with self._lock:
+            header = self._header()
+            try:
+                for payload in payloads:
+                    self._write(header, payload)
+                    added += 1
+            except OverflowError:
+                if not added:
+                    raise
+            finally:
+                self._store(header)
+        return added
+
+    def dequeue_many(self, count: int) -> List[Any]:
+        """ Удаляет и возвращает до count первых элементов за один захват блокировки """
+        with self._lock:
+            header = self._header()
+            if not header[2]:
+                raise IndexError("Queue is empty")
+            items = [self._read(header, remove=True) for _ in range(min(count, header[2]))]
+            self._store(header)
+        return items
+
+    def _snapshot(self) -> List[Any]:
+        """ Читает все элементы от головы к хвосту за один захват блокировки, не изменяя очередь """
+        with self._lock:
+            # Чтение идет по копии заголовка, которая не записывается обратно
+            header = self._header()
+            return [self._read(header, remove=True) for _ in range(header[2])]
+
+    def __iter__(self) -> Iterator[Any]:
+        """ Перебирает снимок элементов от первого к последнему без их удаления """
+        return iter(self._snapshot())
+
+    def __contains__(self, item: Any) -> bool:
+        """ Проверяет, содержится ли элемент в очереди """
+        return any(other is item or other == item for other in self._snapshot())
+
+    def count(self, item: Any) -> int:
+        """ Возвращает количество вхождений элемента """
+        return sum(1 for other in self._snapshot() if other is item or other == item)
+
+    def __eq__(self, other: object) -> bool:
+        """ Сравнивает очередь с другой общей или обычной очередью по элементам """
+        if not isinstance(other, (SharedQueue, Queue)):
+            return False
+        mine, theirs = self._snapshot(), list(other)
+        return len(mine) == len(theirs) and all(a is b or a == b for a, b in zip(mine, theirs))
+
+    # Очередь изменяемая: сравнение по содержимому не совместимо с хешированием
+    __hash__ = None
+
+    def __add__(self, other: Any) -> 'SharedQueue':
+        """ Объединяет очереди в новую общую очередь; кольцо расширяется, если элементы не помещаются """
+        items = self._snapshot() + list(other)
+        with self._lock:
+            _, _, _, _, max_size, capacity = self._header()
+        payloads = [pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL) for item in items]
+        needed = sum(_LENGTH.size + len(payload) for payload in payloads)
+        # Как и Queue.__add__, объединение сохраняет max_size левой очереди, даже если элементов больше
+        queue = SharedQueue(capacity=max(capacity, needed))
+        header = queue._header()
+        for payload in payloads:
+            queue._write(header, payload)
+        header[4] = max_size
+        queue._store(header)
+        return queue
+
+    @classmethod
+    def from_string(cls, string: str, max_size: Optional[int] = None, capacity: int = 1 << 20) -> 'SharedQueue':
+        """ Создает очередь из строки, элементы разделены запятой """
+        queue = cls(max_size=max_size, capacity=capacity)
+        if string:
+            queue.enqueue_many(item.strip() for item in string.split(','))
+        return queue
+
+    def save(self, filename: str, codec: Optional[str] = None) -> None:
+        """ Сохраняет снимок очереди в файл в формате обычной очереди; по умолчанию в JSON """
+        max_size = self._header()[4]
+        data = {
+            'max_size': None if max_size < 0 else max_size,
+            'items': self._snapshot()
+        }
+        queue_codecs.dump(data, filename, codec or 'json')
+
+    @classmethod
+    def load(cls, filename: str, capacity: int = 1 << 20, lock=None,
+             allow_pickle: bool = False) -> 'SharedQueue':
+        """ Загружает очередь из файла любого кодека в новый блок общей памяти; pickle - только с allow_pickle=True """
+        data = queue_codecs.load(filename, allow_pickle)
+        queue = cls(max_size=data['max_size'], capacity=capacity, lock=lock)
+        try:
+            items = list(data['items'])
+            if items and queue.enqueue_many(items) < len(items):
+                raise OverflowError("Saved items do not fit in the shared buffer")
+        except BaseException:
+            queue.close()
+            raise
+        return queue
+
+    def clear(self) -> None:
+        """ Очищает очередь от всех элементов """
+        with self._lock:
+            header = self._header()
+            header[0:4] = [0, 0, 0, 0]
+            self._store(header)
+
+    def close(self) -> None:
+        """ Отключается от общей памяти; создатель очереди также освобождает блок """
+        self._buffer = None
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+    def __enter__(self) -> 'SharedQueue':
+        """ Поддержка менеджера контекста """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """ Закрывает очередь при выходе из блока with """
+        self.close()
+
+    def __str__(self) -> str:
+        """ Возвращает строковое представление очереди """
+        return f"SharedQueue({self.name!r}, size={self.size})"
+
+    def __repr__(self) -> str:
+        """ Возвращает строковое представление очереди с максимальным размером """
+        max_size = self._header()[4]
+        return f"SharedQueue(name={self.name!r}, max_size={None if max_size < 0 else max_size}, size={self.size})"
@@ -1,13 +1,451 @@
-import json
-from typing import Any, Optional
+import re
+import weakref
+from array import array
+from collections import Counter, deque
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Union
+
+import queue_codecs
+from queue_stats import QueueStats
+
+# Предел предварительного выделения слотов кольцевого буфера: при очень большом
+# max_size буфер стартует с этой ёмкости и дальше растёт удвоением
+_PREALLOC_LIMIT = 1 << 16
+
+# Метка пустого кэша первого элемента ленивого объединения
+_NOTHING = object()
+
+
+class _RingBuffer:
+    """ Кольцевой буфер фиксированной ёмкости с O(1) добавлением в конец и извлечением из начала """
+
+    __slots__ = ('_slots', '_head', '_count')
+
+    def __init__(self, capacity: int):
+        """ Выделяет слоты под capacity элементов """
+        self._slots = [None] * capacity
+        self._head = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """ Возвращает количество элементов в буфере """
+        return self._count
+
+    def __iter__(self) -> Iterator[Any]:
+        """ Перебирает элементы от первого к последнему """
+        slots = self._slots
+        capacity = len(slots)
+        head = self._head
+        for i in range(self._count):
+            yield slots[(head + i) % capacity]
+
+    def __getitem__(self, index: int) -> Any:
+        """ Возвращает элемент по логическому индексу от начала буфера """
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Ring buffer index out of range")
+        return self._slots[(self._head + index) % len(self._slots)]
+
+    def _grow(self) -> None:
+        """ Удваивает ёмкость, раскладывая элементы с нулевого слота """
+        items = list(self)
+        self._slots = items + [None] * max(1, len(items))
+        self._head = 0
+
+    def append(self, item: Any) -> None:
+        """ Добавляет элемент в конец буфера """
+        if self._count == len(self._slots):
+            self._grow()
+        self._slots[(self._head + self._count) % len(self._slots)] = item
+        self._count += 1
+
+    def extend(self, items: Iterable[Any]) -> None:
+        """ Добавляет элементы в конец буфера по порядку """
+        for item in items:
+            self.append(item)
+
+    def popleft(self) -> Any:
+        """ Удаляет и возвращает первый элемент буфера """
+        if not self._count:
+            raise IndexError("pop from an empty ring buffer")
+        item = self._slots[self._head]
+        self._slots[self._head] = None
+        self._head = (self._head + 1) % len(self._slots)
+        self._count -= 1
+        return item
+
+    def clear(self) -> None:
+        """ Удаляет все элементы, сохраняя выделенные слоты """
+        self._slots = [None] * len(self._slots)
+        self._head = 0
+        self._count = 0
+
+
+class _ArrayRingBuffer:
+    """ Кольцевой буфер чисел в непрерывном array.array: элементы хранятся без упаковки в объекты Python """
+
+    __slots__ = ('_data', '_head', '_count')
+
+    def __init__(self, typecode: str, capacity: int):
+        """ Выделяет непрерывный массив под capacity чисел типа typecode """
+        self._data = array(typecode, [0]) * max(1, capacity)
+        self._head = 0
+        self._count = 0
+
+    @property
+    def typecode(self) -> str:
+        """ Возвращает код типа элементов массива """
+        return self._data.typecode
+
+    def __len__(self) -> int:
+        """ Возвращает количество элементов в буфере """
+        return self._count
+
+    def __iter__(self) -> Iterator[Any]:
+        """ Перебирает элементы от первого к последнему """
+        data = self._data
+        capacity = len(data)
+        head = self._head
+        for i in range(self._count):
+            yield data[(head + i) % capacity]
+
+    def __getitem__(self, index: int) -> Any:
+        """ Возвращает элемент по логическому индексу от начала буфера """
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Ring buffer index out of range")
+        return self._data[(self._head + index) % len(self._data)]
+
+    def _as_array(self, items: Iterable[Any]) -> array:
+        """ Приводит порцию к массиву нужного типа; объекты с подходящим буфером копируются побайтно """
+        if isinstance(items, array) and items.typecode == self.typecode:
+            return items
+        result = array(self.typecode)
+        try:
+            view = memoryview(items)
+        except TypeError:
+            result.extend(items)
+            return result
+        with view:
+            if view.format == self.typecode and view.contiguous:
+                result.frombytes(view.cast('B'))
+            else:
+                result.extend(view.tolist())
+        return result
+
+    def to_array(self) -> array:
+        """ Возвращает копию элементов в порядке очереди одним массивом """
+        data, head, count = self._data, self._head, self._count
+        first = min(count, len(data) - head)
+        return data[head:head + first] + data[0:count - first]
+
+    def _grow(self, min_capacity: int) -> None:
+        """ Переносит элементы в начало нового массива ёмкостью не меньше min_capacity """
+        self._relayout(max(min_capacity, 2 * len(self._data)))
+
+    def _relayout(self, capacity: int) -> None:
+        """ Переносит элементы в начало нового массива ёмкостью capacity """
+        items = self.to_array()
+        self._data = items + array(self.typecode, [0]) * (capacity - len(items))
+        self._head = 0
+
+    def append(self, item: Any) -> None:
+        """ Добавляет число в конец буфера """
+        if self._count == len(self._data):
+            self._grow(self._count + 1)
+        self._data[(self._head + self._count) % len(self._data)] = item
+        self._count += 1
+
+    def extend(self, items: Iterable[Any]) -> None:
+        """ Добавляет порцию чисел не более чем двумя копированиями срезов """
+        items = self._as_array(items)
+        needed = self._count + len(items)
+        if needed > len(self._data):
+            self._grow(needed)
+        data = self._data
+        tail = (self._head + self._count) % len(data)
+        first = min(len(items), len(data) - tail)
+        data[tail:tail + first] = items[:first]
+        data[0:len(items) - first] = items[first:]
+        self._count = needed
+
+    def popleft(self) -> Any:
+        """ Удаляет и возвращает первое число буфера """
+        if not self._count:
+            raise IndexError("pop from an empty ring buffer")
+        item = self._data[self._head]
+        self._head = (self._head + 1) % len(self._data)
+        self._count -= 1
+        return item
+
+    def popleft_many(self, count: int) -> array:
+        """ Удаляет и возвращает до count первых чисел одним массивом """
+        data, head = self._data, self._head
+        count = max(0, min(count, self._count))
+        first = min(count, len(data) - head)
+        result = data[head:head + first] + data[0:count - first]
+        self._head = (head + count) % len(data)
+        self._count -= count
+        return result
+
+    def buffer(self) -> memoryview:
+        """ Возвращает memoryview на элементы без копирования; разорванный по кругу буфер сначала выпрямляется """
+        if self._head + self._count > len(self._data):
+            self._relayout(len(self._data))
+        return memoryview(self._data)[self._head:self._head + self._count]
+
+    def clear(self) -> None:
+        """ Удаляет все элементы, сохраняя выделенный массив """
+        self._head = 0
+        self._count = 0
+
+
+class _ChainStorage:
+    """ Ленивое объединение очередей: читает элементы из хранилищ исходных очередей без копирования """
+
+    __slots__ = ('_owner', '_segments', '_front', '_tail', '_count')
+
+    def __init__(self, owner: 'Queue', sources: Iterable['Queue']):
+        """ Запоминает непустые исходные очереди как сегменты и регистрируется у них как зависимое представление """
+        self._owner = weakref.ref(owner)
+        # Сегмент: [исходная очередь, её хранилище, прочитано, осталось, итератор чтения]
+        self._segments = deque()
+        self._front = _NOTHING
+        self._tail = deque()
+        self._count = 0
+        for source in sources:
+            storage = source._items
+            if len(storage):
+                self._segments.append([source, storage, 0, len(storage), iter(storage)])
+                self._count += len(storage)
+                source._add_view(owner)
+
+    def __len__(self) -> int:
+        """ Возвращает количество элементов в объединении """
+        return self._count
+
+    def __iter__(self) -> Iterator[Any]:
+        """ Перебирает непрочитанные элементы сегментов, затем добавленные после объединения """
+        if self._front is not _NOTHING:
+            yield self._front
+        for _, storage, consumed, remaining, _ in self._segments:
+            yield from islice(storage, consumed, consumed + remaining)
+        yield from self._tail
+
+    def __getitem__(self, index: int) -> Any:
+        """ Возвращает элемент по логическому индексу; первый элемент кэшируется """
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Chain index out of range")
+        if index == 0:
+            if self._front is _NOTHING:
+                owner = self._owner()
+                # Чтение первого элемента сдвигает курсор сегмента - зависимые объединения фиксируются заранее
+                if owner is not None and owner._views:
+                    owner._detach_views()
+                self._front = self._pull()
+            return self._front
+        return next(islice(self, index, None))
+
+    def _pull(self) -> Any:
+        """ Читает очередной элемент из первого сегмента или из собственного хвоста """
+        if not self._segments:
+            return self._tail.popleft()
+        segment = self._segments[0]
+        item = next(segment[4])
+        segment[2] += 1
+        segment[3] -= 1
+        if not segment[3]:
+            self._segments.popleft()
+            self._release(segment[0])
+        return item
+
+    def _release(self, source: 'Queue') -> None:
+        """ Снимает регистрацию у исходной очереди, если на неё больше не ссылается ни один сегмент """
+        owner = self._owner()
+        if owner is not None and all(segment[0] is not source for segment in self._segments):
+            source._discard_view(owner)
+
+    def append(self, item: Any) -> None:
+        """ Добавляет элемент в собственный хвост, не трогая исходные очереди """
+        self._tail.append(item)
+        self._count += 1
+
+    def extend(self, items: Iterable[Any]) -> None:
+        """ Добавляет элементы в собственный хвост по порядку """
+        for item in items:
+            self.append(item)
+
+    def popleft(self) -> Any:
+        """ Удаляет и возвращает первый элемент объединения """
+        if not self._count:
+            raise IndexError("pop from an empty chain")
+        if self._front is not _NOTHING:
+            item, self._front = self._front, _NOTHING
+        else:
+            item = self._pull()
+        self._count -= 1
+        return item
+
+    def clear(self) -> None:
+        """ Отказывается от всех сегментов и хвоста """
+        segments, self._segments = self._segments, deque()
+        for segment in segments:
+            self._release(segment[0])
+        self._front = _NOTHING
+        self._tail.clear()
+        self._count = 0
+
 
 class Queue:
     """ Класс для реализации очереди с ограниченным размером """
 
-    def __init__(self, max_size: Optional[int] = None):
-        """ Инициализирует объект очереди с возможностью задания максимального размера """
-        self._items = []
+    # Хранилище - элементы в порядке FIFO, и все изменения идут через _detach_views: объединения могут читать его
+    # напрямую. Очереди с другим хранилищем (куча PriorityQueue) попадают в объединение копией
+    _chainable = True
+
+    def __init__(self, max_size: Optional[int] = None, indexed: bool = False, typecode: Optional[str] = None,
+                 stats: Union[bool, QueueStats] = False):
+        """ Инициализирует очередь: максимальный размер, индекс вхождений, тип чисел typecode и сбор статистики """
         self._max_size = max_size
+        self._typecode = typecode
+        self._items = self._new_storage()
+        self._index: Optional[Counter] = Counter() if indexed else None
+        self._unhashable = 0
+        # Выключенная статистика стоит одной проверки на None в каждой операции
+        self._stats: Optional[QueueStats] = QueueStats() if stats is True else stats or None
+        # Ленивые объединения, читающие из хранилища этой очереди
+        self._views: Optional[weakref.WeakValueDictionary] = None
+
+    def _new_storage(self):
+        """ Создает хранилище: массив чисел для типизированной очереди, иначе кольцевой буфер или deque """
+        if self._typecode is not None:
+            capacity = 1024 if self._max_size is None else self._max_size
+            return _ArrayRingBuffer(self._typecode, min(capacity, _PREALLOC_LIMIT))
+        if self._max_size is None:
+            return deque()
+        return _RingBuffer(min(self._max_size, _PREALLOC_LIMIT))
+
+    def _put(self, item: Any) -> None:
+        """ Помещает элемент в конец хранилища без проверки размера """
+        if self._views:
+            self._detach_views()
+        self._items.append(item)
+        if self._index is not None:
+            # Типизированное хранилище приводит число к своему типу - в индекс идет сохраненное значение
+            if isinstance(self._items, _ArrayRingBuffer):
+                item = self._items[-1]
+            self._index_add(item)
+        if self._stats is not None:
+            self._stats.on_put(len(self._items))
+
+    def _get(self) -> Any:
+        """ Извлекает элемент из начала хранилища без проверки на пустоту """
+        if self._views:
+            self._detach_views()
+        item = self._items.popleft()
+        if self._index is not None:
+            self._index_remove(item)
+        if self._stats is not None:
+            self._stats.on_get(len(self._items))
+        return item
+
+    def _extend(self, items: Sequence[Any]) -> None:
+        """ Добавляет порцию элементов с одной проверкой размера на всю порцию """
+        if self._max_size is not None and self.size + len(items) > self._max_size:
+            self._reject_full()
+        if self._views:
+            self._detach_views()
+        if self._index is not None and isinstance(self._items, _ArrayRingBuffer):
+            items = self._items._as_array(items)
+        self._items.extend(items)
+        if self._index is not None:
+            for item in items:
+                self._index_add(item)
+        if self._stats is not None:
+            self._stats.on_put_many(len(items), len(self._items))
+
+    def _reject_full(self) -> None:
+        """ Учитывает отказ в статистике и сообщает о переполнении """
+        if self._stats is not None:
+            self._stats.on_reject_full()
+        raise OverflowError("Queue is full")
+
+    def _reject_empty(self) -> None:
+        """ Учитывает отказ в статистике и сообщает о пустой очереди """
+        if self._stats is not None:
+            self._stats.on_reject_empty()
+        raise IndexError("Queue is empty")
+
+    def _index_add(self, item: Any) -> None:
+        """ Учитывает элемент в индексе; нехешируемые элементы только подсчитываются """
+        try:
+            self._index[item] += 1
+        except TypeError:
+            self._unhashable += 1
+
+    def _index_remove(self, item: Any) -> None:
+        """ Убирает элемент из индекса, удаляя ключи с нулевой кратностью """
+        try:
+            count = self._index[item]
+        except TypeError:
+            self._unhashable -= 1
+            return
+        if count > 1:
+            self._index[item] = count - 1
+        else:
+            del self._index[item]
+
+    def _reindex(self) -> None:
+        """ Перестраивает индекс по текущему содержимому хранилища """
+        if self._index is None:
+            return
+        self._index.clear()
+        self._unhashable = 0
+        for item in self._items:
+            self._index_add(item)
+
+    def _add_view(self, view: 'Queue') -> None:
+        """ Регистрирует ленивое объединение, читающее из хранилища этой очереди """
+        # Очередь нехешируема (определен __eq__), поэтому ключом служит id
+        if self._views is None:
+            self._views = weakref.WeakValueDictionary()
+        self._views[id(view)] = view
+
+    def _discard_view(self, view: 'Queue') -> None:
+        """ Снимает регистрацию ленивого объединения """
+        if self._views is not None:
+            self._views.pop(id(view), None)
+
+    def _detach_views(self) -> None:
+        """ Перед изменением хранилища копирует его данные в зависящие от него объединения (copy-on-write) """
+        views, self._views = self._views, None
+        for view in list(views.values()):
+            view._materialize()
+
+    def _materialize(self) -> None:
+        """ Заменяет ленивое объединение собственным хранилищем с копией элементов """
+        if not isinstance(self._items, _ChainStorage):
+            return
+        if self._views:
+            self._detach_views()
+        storage = self._new_storage()
+        storage.extend(self._items)
+        self._items.clear()
+        self._items = storage
+
+    @property
+    def stats(self) -> Optional[QueueStats]:
+        """ Возвращает статистику очереди или None, если она не собирается """
+        return self._stats
+
+    @property
+    def indexed(self) -> bool:
+        """ Проверяет, включен ли индекс вхождений """
+        return self._index is not None
 
     @property
     def size(self) -> int:
@@ -27,52 +465,125 @@ class Queue:
     def enqueue(self, item: Any) -> None:
         """ Добавляет элемент в очередь, если она не полна """
         if self.is_full:
-            raise OverflowError("Queue is full")
-        self._items.append(item)
+            self._reject_full()
+        self._put(item)
 
     def dequeue(self) -> Any:
         """ Удаляет и возвращает первый элемент из очереди """
         if self.is_empty:
-            raise IndexError("Queue is empty")
-        return self._items.pop(0)
+            self._reject_empty()
+        return self._get()
+
+    def enqueue_many(self, items: Iterable[Any]) -> None:
+        """ Добавляет порцию элементов с одной проверкой размера; типизированная очередь копирует массив целиком """
+        if not hasattr(items, '__len__'):
+            items = list(items)
+        self._extend(items)
+
+    def dequeue_many(self, count: int) -> Sequence[Any]:
+        """ Удаляет и возвращает до count первых элементов: массив для типизированной очереди, иначе список """
+        if self.is_empty:
+            self._reject_empty()
+        if self._index is None and self._stats is None and not self._views \
+                and isinstance(self._items, _ArrayRingBuffer):
+            return self._items.popleft_many(count)
+        batch = [self._get() for _ in range(min(count, self.size))]
+        return array(self._typecode, batch) if self._typecode is not None else batch
+
+    @property
+    def typecode(self) -> Optional[str]:
+        """ Возвращает код типа чисел типизированной очереди или None """
+        return self._typecode
+
+    def buffer(self) -> memoryview:
+        """ Возвращает memoryview на элементы типизированной очереди для передачи без копирования """
+        if not isinstance(self._items, _ArrayRingBuffer):
+            raise TypeError("Only typed queues expose a buffer")
+        return self._items.buffer()
+
+    def __buffer__(self, flags: int) -> memoryview:
+        """ Протокол буфера (Python 3.12+): memoryview(queue) для типизированной очереди """
+        return self.buffer()
 
     def peek(self) -> Any:
         """ Возвращает первый элемент очереди без его удаления """
         if self.is_empty:
-            raise IndexError("Queue is empty")
+            self._reject_empty()
         return self._items[0]
 
     def clear(self) -> None:
         """ Очищает очередь от всех элементов """
+        if self._views:
+            self._detach_views()
+        if self._stats is not None:
+            self._stats.on_clear(len(self._items))
         self._items.clear()
+        if self._index is not None:
+            self._index.clear()
+            self._unhashable = 0
 
     def __str__(self) -> str:
         """ Возвращает строковое представление очереди """
-        return f"Queue({self._items})"
+        return f"Queue({list(self._items)})"
 
     def __repr__(self) -> str:
         """ Возвращает строковое представление очереди с максимальным размером """
-        return f"Queue(max_size={self._max_size}, items={self._items})"
+        return f"Queue(max_size={self._max_size}, items={list(self._items)})"
 
     def __len__(self) -> int:
         """ Возвращает количество элементов в очереди """
         return self.size
 
+    def __iter__(self) -> Iterator[Any]:
+        """ Перебирает элементы от первого к последнему без их удаления """
+        return iter(self._items)
+
     def __contains__(self, item: Any) -> bool:
-        """ Проверяет, содержится ли элемент в очереди """
+        """ Проверяет, содержится ли элемент в очереди; в индексированном режиме за O(1) """
+        if self._index is not None:
+            try:
+                if item in self._index:
+                    return True
+            except TypeError:
+                return item in self._items
+            # Хешируемый элемент может быть равен нехешируемому (frozenset и set) - тогда нужен перебор
+            if not self._unhashable:
+                return False
         return item in self._items
 
+    def count(self, item: Any) -> int:
+        """ Возвращает количество вхождений элемента; в индексированном режиме за O(1) """
+        if self._index is not None and not self._unhashable:
+            try:
+                return self._index[item]
+            except TypeError:
+                pass
+        return sum(1 for other in self._items if other is item or other == item)
+
     def __add__(self, other: 'Queue') -> 'Queue':
-        """ Объединяет две очереди в одну """
-        new_queue = Queue(max_size=self._max_size)
-        new_queue._items = self._items + other._items
+        """ Объединяет две очереди в одну без копирования элементов; исходные очереди остаются неизменными """
+        typecode = self._typecode if self._typecode == other._typecode else None
+        new_queue = Queue(max_size=self._max_size, indexed=self.indexed, typecode=typecode)
+        if typecode is not None:
+            # Массивы чисел копируются срезами: результат сразу отдает buffer() и приводит новые элементы к типу
+            for queue in (self, other):
+                items = queue._items
+                new_queue._items.extend(items.to_array() if isinstance(items, _ArrayRingBuffer) else list(items))
+            new_queue._reindex()
+            return new_queue
+        sources = [queue if queue._chainable else Queue.from_iterable(queue) for queue in (self, other)]
+        new_queue._items = _ChainStorage(new_queue, sources)
+        new_queue._reindex()
         return new_queue
 
     def __eq__(self, other: object) -> bool:
-        """ Сравнивает две очереди на равенство """
+        """ Сравнивает две очереди на равенство по элементам в порядке извлечения """
         if not isinstance(other, Queue):
             return False
-        return self._items == other._items
+        # Вторая очередь перебирается своим __iter__: её хранилище может быть устроено иначе
+        if len(self) != len(other):
+            return False
+        return all(a is b or a == b for a, b in zip(self._items, other))
 
     @classmethod
     def from_string(cls, string: str) -> 'Queue':
@@ -84,20 +595,73 @@ class Queue:
                 queue.enqueue(item)
         return queue
 
-    def save(self, filename: str) -> None:
-        """ Сохраняет очередь в файл в формате JSON """
+    @classmethod
+    def from_iterable(cls, iterable: Iterable[Any], max_size: Optional[int] = None,
+                      chunk_size: int = 65536) -> 'Queue':
+        """ Создает очередь из итерируемого объекта, добавляя элементы порциями по chunk_size """
+        queue = cls(max_size=max_size)
+        iterator = iter(iterable)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            queue._extend(chunk)
+        return queue
+
+    @classmethod
+    def from_file(cls, filename: str, max_size: Optional[int] = None, delimiters: str = ',\n',
+                  chunk_size: int = 1 << 20, encoding: str = 'utf-8') -> 'Queue':
+        """ Создает очередь из текстового файла, читая его блоками; пустые элементы пропускаются """
+        queue = cls(max_size=max_size)
+        with open(filename, 'r', encoding=encoding) as f:
+            for tokens in cls._read_tokens(f, delimiters, chunk_size):
+                queue._extend(tokens)
+        return queue
+
+    @staticmethod
+    def _read_tokens(f, delimiters: str, chunk_size: int) -> Iterator[List[str]]:
+        """ Читает файл блоками и возвращает элементы каждого блока; элемент на границе блоков склеивается """
+        splitter = re.compile('[' + re.escape(delimiters) + ']')
+        rest = ''
+        while True:
+            block = f.read(chunk_size)
+            if not block:
+                break
+            parts = splitter.split(rest + block)
+            # Последняя часть может продолжиться в следующем блоке
+            rest = parts.pop()
+            tokens = [token for token in map(str.strip, parts) if token]
+            if tokens:
+                yield tokens
+        rest = rest.strip()
+        if rest:
+            yield [rest]
+
+    def save(self, filename: str, codec: Optional[str] = None) -> None:
+        """ Сохраняет очередь в файл: JSON по умолчанию, типизированная очередь - сырым массивом ('struct') """
+        if codec is None:
+            codec = 'struct' if self._typecode is not None else 'json'
+        if codec == 'struct' and isinstance(self._items, _ArrayRingBuffer):
+            items = self._items.to_array()
+        else:
+            items = list(self._items)
         data = {
             'max_size': self._max_size,
-            'items': self._items
+            'items': items
         }
-        with open(filename, 'w') as f:
-            json.dump(data, f)
+        if self._typecode is not None:
+            data['typecode'] = self._typecode
+        queue_codecs.dump(data, filename, codec)
 
     @classmethod
-    def load(cls, filename: str) -> 'Queue':
-        """ Загружает очередь из файла в формате JSON """
-        with open(filename, 'r') as f:
-            data = json.load(f)
-        queue = cls(max_size=data['max_size'])
-        queue._items = data['items']
+    def load(cls, filename: str, indexed: bool = False, typecode: Optional[str] = None,
+             allow_pickle: bool = False) -> 'Queue':
+        """ Загружает очередь из файла, определяя формат автоматически; pickle - только с allow_pickle=True """
+        data = queue_codecs.load(filename, allow_pickle)
+        if typecode is None:
+            # Типизированная очередь восстанавливается с сохраненным типом и снова хранит сырой массив
+            typecode = data.get('typecode')
+        queue = cls(max_size=data['max_size'], indexed=indexed, typecode=typecode)
+        queue._items.extend(data['items'])
+        queue._reindex()
         return queue
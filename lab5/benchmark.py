@@ -0,0 +1,177 @@
+import filecmp
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Callable
+
+from task1_collection import Queue, QueueCollection
+from queue_dispatcher import Dispatcher, MODES
+
+
+def measure(func: Callable[[], Any]) -> float:
+    """ Возвращает время выполнения функции в секундах """
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _collection(queues: int, items: int) -> QueueCollection:
+    """ Коллекция из queues очередей по items элементов-словарей """
+    collection = QueueCollection()
+    for i in range(queues):
+        queue = Queue()
+        queue._items = [{'id': i * items + j, 'payload': f'item-{j}'} for j in range(items)]
+        collection.add(queue)
+    return collection
+
+
+def _same_tree(first: str, second: str) -> bool:
+    """ Проверяет, что два каталога содержат одинаковые файлы с одинаковым содержимым """
+    names = sorted(os.listdir(first))
+    if names != sorted(os.listdir(second)):
+        return False
+    _, mismatch, errors = filecmp.cmpfiles(first, second, names, shallow=False)
+    return not mismatch and not errors
+
+
+def bench_parallel(queues: int = 2_000, items: int = 200, workers_list=(1, 2, 4, 8)) -> None:
+    """ Масштабирование сохранения и загрузки шардированной коллекции по числу процессов """
+    collection = _collection(queues, items)
+    print(f"{queues:,} очередей по {items} элементов, ядер: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as tmp:
+        single = os.path.join(tmp, 'single.json')
+        print(f"  один файл: save {measure(lambda: collection.save(single)):.3f} с, "
+              f"load {measure(lambda: QueueCollection.load(single)):.3f} с")
+        print(f"{'процессов':>10} {'save, с':>9} {'load, с':>9} {'совпадает':>10}")
+        reference = os.path.join(tmp, 'workers-1')
+        for workers in workers_list:
+            directory = os.path.join(tmp, f'workers-{workers}')
+            save_time = measure(lambda: collection.save_sharded(directory, queues_per_shard=64, workers=workers))
+            load_time = measure(lambda: QueueCollection.load_sharded(directory, workers=workers))
+            identical = _same_tree(reference, directory)
+            print(f"{workers:>10} {save_time:>9.3f} {load_time:>9.3f} {'да' if identical else 'нет':>10}")
+
+
+def _uneven(queues: int, heavy: int, heavy_items: int, seed: int = 1) -> QueueCollection:
+    """ Коллекция с неравной нагрузкой: heavy очередей по heavy_items элементов, у остальных 0-2 элемента """
+    rng = random.Random(seed)
+    heavy_slots = set(rng.sample(range(queues), heavy))
+    collection = QueueCollection()
+    for slot in range(queues):
+        queue = Queue()
+        queue._items = list(range(heavy_items if slot in heavy_slots else rng.randrange(3)))
+        collection.add(queue)
+    return collection
+
+
+def bench_dispatch(queues: int = 10_000, heavy: int = 50, heavy_items: int = 400) -> None:
+    """ Выборка из всех очередей коллекции: поиск непустой перебором против диспетчера с активным множеством """
+    total = sum(len(queue._items) for queue in _uneven(queues, heavy, heavy_items))
+    print(f"{queues:,} очередей, {heavy} нагруженных по {heavy_items}, всего {total:,} элементов")
+
+    def scan(collection):
+        # Прежний способ: перебор очередей по кругу до первой непустой
+        position = 0
+        for _ in range(total):
+            while collection[position].is_empty:
+                position = (position + 1) % queues
+            collection[position].dequeue()
+            position = (position + 1) % queues
+
+    def dispatcher(mode):
+        def run(collection):
+            dispatch = Dispatcher(collection, mode=mode).dispatch
+            for _ in range(total):
+                dispatch()
+        return run
+
+    scenarios = [('перебор очередей', scan)] + [(f'Dispatcher {mode}', dispatcher(mode)) for mode in MODES]
+    for name, scenario in scenarios:
+        collection = _uneven(queues, heavy, heavy_items)
+        elapsed = measure(lambda: scenario(collection))
+        print(f"  {name:<20} {elapsed:.3f} с, {total / elapsed:,.0f} элементов/с")
+
+
+def bench_route(count: int = 200_000, shards: int = 16) -> None:
+    """ Маршрутизация по ключу через согласованное хеширование против одной очереди """
+    keys = [f'user-{i % 5_000}' for i in range(count)]
+    print(f"{count:,} элементов, {len(set(keys)):,} ключей, {shards} очередей")
+
+    def single():
+        queue = Queue()
+        for key in keys:
+            queue.enqueue(key)
+
+    collection = QueueCollection()
+    for _ in range(shards):
+        collection.add(Queue())
+
+    def routed():
+        for key in keys:
+            collection.route(key, key)
+
+    for name, scenario in (('одна Queue', single), ('route по ключу', routed)):
+        elapsed = measure(scenario)
+        print(f"  {name:<16} {count / elapsed:>12,.0f} элементов/с")
+    stats = collection.route_stats()
+    print(f"  баланс: максимум/среднее {stats['max_over_mean']:.3f}, "
+          f"доли кольца от {stats['ownership_min']:.3f} до {stats['ownership_max']:.3f}")
+    # При добавлении очереди ключи должны переехать только на неё - около 1/(N+1)
+    unique = sorted(set(keys))
+    before = [collection._ring.lookup(key) for key in unique]
+    collection.add(Queue())
+    moved = sum(old != collection._ring.lookup(key) for old, key in zip(before, unique))
+    print(f"  добавление очереди переместило {moved / len(unique):.1%} ключей (ожидается ~{1 / (shards + 1):.1%})")
+
+
+def bench_aggregates(queues: int = 10_000, operations: int = 50_000, queries: int = 200) -> None:
+    """ Сводка по коллекции: полный перебор очередей против агрегатов по уведомлениям """
+    print(f"{queues:,} очередей, {operations:,} изменений, {queries} запросов сводки")
+    rng = random.Random(7)
+    plan = [rng.randrange(queues) for _ in range(operations)]
+
+    def build():
+        collection = QueueCollection()
+        for _ in range(queues):
+            collection.add(Queue(max_size=8))
+        return collection
+
+    def churn(collection):
+        for step, slot in enumerate(plan):
+            queue = collection[slot]
+            if step % 3 and not queue.is_full:
+                queue.enqueue(step)
+            elif not queue.is_empty:
+                queue.dequeue()
+
+    def scan_summary(collection):
+        sizes = [(queue.size, slot) for slot, queue in enumerate(collection)]
+        return sum(size for size, _ in sizes), sum(queue.is_full for queue in collection), max(sizes), min(sizes)
+
+    collection = build()
+    churn_time = measure(lambda: churn(collection))
+    scan_time = measure(lambda: [scan_summary(collection) for _ in range(queries)])
+    tracked = build()
+    tracked.aggregates()
+    tracked_churn = measure(lambda: churn(tracked))
+    tracked_time = measure(lambda: [tracked.aggregates() for _ in range(queries)])
+    assert tracked.total_items == sum(queue.size for queue in collection)
+    print(f"  изменения без агрегатов {churn_time:.3f} с, с агрегатами {tracked_churn:.3f} с")
+    print(f"  запрос сводки: перебор {scan_time / queries * 1e3:.3f} мс, агрегаты {tracked_time / queries * 1e3:.4f} мс")
+
+
+BENCHMARKS = {
+    'parallel': bench_parallel,
+    'dispatch': bench_dispatch,
+    'route': bench_route,
+    'aggregates': bench_aggregates,
+}
+
+if __name__ == "__main__":
+    # Запуск выбранных бенчмарков: python benchmark.py [имя ...]
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+        print()
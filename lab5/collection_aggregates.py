@@ -0,0 +1,106 @@
+import heapq
+from itertools import count
+from typing import Dict, List, Optional
+
+
+class CollectionAggregates:
+    """ Агрегаты коллекции по уведомлениям очередей: число элементов и полных очередей, самая полная и пустая """
+
+    def __init__(self):
+        """ Создает пустые агрегаты """
+        self.total = 0
+        self.full = 0
+        # Ключ записи - позиция в коллекции: одна и та же очередь может стоять на нескольких позициях
+        self._queues: Dict[int, object] = {}
+        self._sizes: Dict[int, int] = {}
+        self._order: Dict[int, int] = {}
+        # Позиции каждой очереди по её id - для рассылки уведомлений и одной подписки на очередь
+        self._positions: Dict[int, List[int]] = {}
+        self._serial = count()
+        # Ленивые кучи: запись (размер, порядок, позиция) устаревает, когда размер очереди изменился
+        self._largest: List[tuple] = []
+        self._smallest: List[tuple] = []
+
+    def __len__(self) -> int:
+        """ Возвращает количество отслеживаемых позиций """
+        return len(self._sizes)
+
+    @staticmethod
+    def _is_full(queue, size: int) -> bool:
+        """ Проверяет, заполнена ли очередь при заданном размере """
+        return queue._max_size is not None and size >= queue._max_size
+
+    def attach(self, queue, slot: int) -> None:
+        """ Начинает отслеживать очередь на позиции slot """
+        size = queue.size
+        self._queues[slot] = queue
+        self._sizes[slot] = size
+        self._order[slot] = next(self._serial)
+        self.total += size
+        self.full += self._is_full(queue, size)
+        self._push(slot, size)
+        positions = self._positions.setdefault(id(queue), [])
+        if not positions:
+            queue.add_listener(self._on_change)
+        positions.append(slot)
+
+    def detach(self, queue, slot: int) -> None:
+        """ Перестает отслеживать очередь на позиции slot; её записи в кучах становятся устаревшими """
+        positions = self._positions[id(queue)]
+        positions.remove(slot)
+        if not positions:
+            del self._positions[id(queue)]
+            queue.remove_listener(self._on_change)
+        size = self._sizes.pop(slot)
+        self.total -= size
+        self.full -= self._is_full(queue, size)
+        del self._queues[slot], self._order[slot]
+
+    def remap(self, remap: Dict[int, int]) -> None:
+        """ Переводит позиции очередей после уплотнения коллекции """
+        self._queues = {remap[slot]: queue for slot, queue in self._queues.items()}
+        self._sizes = {remap[slot]: size for slot, size in self._sizes.items()}
+        self._order = {remap[slot]: order for slot, order in self._order.items()}
+        self._positions = {key: [remap[slot] for slot in slots] for key, slots in self._positions.items()}
+        self._rebuild()
+
+    def _on_change(self, queue, old_size: int, new_size: int) -> None:
+        """ Учитывает изменение размера очереди на каждой её позиции за O(log n) """
+        for slot in self._positions[id(queue)]:
+            self.total += new_size - old_size
+            self.full += self._is_full(queue, new_size) - self._is_full(queue, old_size)
+            self._sizes[slot] = new_size
+            self._push(slot, new_size)
+
+    def _push(self, slot: int, size: int) -> None:
+        """ Добавляет актуальную запись в обе кучи, перестраивая их при избытке устаревших записей """
+        order = self._order[slot]
+        heapq.heappush(self._largest, (-size, order, slot))
+        heapq.heappush(self._smallest, (size, order, slot))
+        if len(self._largest) > 2 * len(self._sizes) + 64:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        """ Строит кучи заново только из актуальных записей """
+        self._largest = [(-size, self._order[slot], slot) for slot, size in self._sizes.items()]
+        self._smallest = [(size, self._order[slot], slot) for slot, size in self._sizes.items()]
+        heapq.heapify(self._largest)
+        heapq.heapify(self._smallest)
+
+    def _top(self, heap: List[tuple], sign: int) -> Optional[int]:
+        """ Снимает устаревшие записи с вершины кучи и возвращает позицию очереди на ней """
+        while heap:
+            size, order, slot = heap[0]
+            # Запись актуальна, если размер не менялся и позицию не заняла очередь, добавленная позже
+            if self._sizes.get(slot) == size * sign and self._order[slot] == order:
+                return slot
+            heapq.heappop(heap)
+        return None
+
+    def fullest(self) -> Optional[int]:
+        """ Позиция очереди с наибольшим числом элементов; при равенстве - раньше добавленной """
+        return self._top(self._largest, -1)
+
+    def emptiest(self) -> Optional[int]:
+        """ Позиция очереди с наименьшим числом элементов; при равенстве - раньше добавленной """
+        return self._top(self._smallest, 1)
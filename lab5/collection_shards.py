@@ -0,0 +1,109 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+# Шардированная раскладка коллекции: каталог с индексом и файлами-шардами.
+# Каждая очередь - одна строка JSON в шарде; индекс хранит для очереди файл, смещение и длину записи
+INDEX_NAME = 'index.json'
+
+# Запись шарда: уже закодированные байты или пара (max_size, элементы)
+Record = Union[bytes, Tuple[Optional[int], List[Any]]]
+
+
+def encode_queue(max_size: Optional[int], items: List[Any]) -> bytes:
+    """ Кодирует очередь в строку JSON шарда """
+    return json.dumps({'max_size': max_size, 'items': items}).encode('utf-8') + b'\n'
+
+
+def decode_queue(record: bytes) -> Dict[str, Any]:
+    """ Декодирует строку JSON шарда """
+    return json.loads(record)
+
+
+def shard_name(generation: int, number: int) -> str:
+    """ Возвращает имя файла шарда; поколение меняется при каждом полном сохранении """
+    return f'shard-{generation:04d}-{number:05d}.jsonl'
+
+
+def read_record(directory: str, filename: str, offset: int, length: int) -> bytes:
+    """ Читает одну запись шарда по смещению, не разбирая остальные """
+    with open(os.path.join(directory, filename), 'rb') as f:
+        f.seek(offset)
+        record = f.read(length)
+    if len(record) != length:
+        raise ValueError(f"Shard {filename} is truncated")
+    return record
+
+
+def write_shard(path: str, records: Iterable[Record]) -> List[int]:
+    """ Атомарно записывает шард через временный файл и переименование; возвращает длины записей """
+    lengths = []
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        for record in records:
+            if not isinstance(record, bytes):
+                record = encode_queue(*record)
+            f.write(record)
+            lengths.append(len(record))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return lengths
+
+
+def read_shard(path: str, spans: Sequence[Tuple[int, int]]) -> List[Dict[str, Any]]:
+    """ Читает шард целиком и декодирует записи по списку (смещение, длина) в заданном порядке """
+    with open(path, 'rb') as f:
+        data = f.read()
+    return [decode_queue(data[offset:offset + length]) for offset, length in spans]
+
+
+def run_tasks(func: Callable, tasks: Sequence[tuple], workers: int = 1, processes: bool = True) -> List[Any]:
+    """ Выполняет func для каждого набора аргументов по порядку; при workers > 1 - в пуле процессов или потоков """
+    if workers < 1:
+        raise ValueError("workers must be positive")
+    if workers == 1 or len(tasks) < 2:
+        return [func(*task) for task in tasks]
+    pool_cls = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool_cls(max_workers=min(workers, len(tasks))) as pool:
+        return list(pool.map(func, *zip(*tasks)))
+
+
+def append_record(directory: str, filename: str, record: bytes) -> int:
+    """ Дописывает запись в конец шарда и возвращает её смещение; прежняя запись становится мусором """
+    with open(os.path.join(directory, filename), 'ab') as f:
+        offset = f.tell()
+        f.write(record)
+    return offset
+
+
+def read_index(directory: str) -> Dict[str, Any]:
+    """ Читает индекс шардированной коллекции """
+    with open(os.path.join(directory, INDEX_NAME), 'r') as f:
+        return json.load(f)
+
+
+def write_index(directory: str, generation: int, entries: List[Optional[list]],
+                names: Optional[Dict[str, int]] = None, ring: Optional[Dict[str, Any]] = None) -> None:
+    """ Атомарно записывает индекс: [файл, смещение, длина, max_size, размер] или None на очередь, имена и метки кольца """
+    path = os.path.join(directory, INDEX_NAME)
+    tmp_path = path + '.tmp'
+    index = {'generation': generation, 'queues': entries}
+    if names:
+        index['names'] = names
+    if ring:
+        index['ring'] = ring
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def remove_stale_shards(directory: str, generation: int) -> None:
+    """ Удаляет шарды прежних поколений и недописанные временные файлы """
+    prefix = shard_name(generation, 0)[:len('shard-0000-')]
+    for name in os.listdir(directory):
+        if (name.startswith('shard-') and not name.startswith(prefix)) or name.endswith('.jsonl.tmp'):
+            os.remove(os.path.join(directory, name))
@@ -0,0 +1,253 @@
+import filecmp
+import os
+import tempfile
+
+from queue_dispatcher import Dispatcher, _tenants
+from task1_collection import Queue, QueueCollection
+
+
+def _routed_slots(collection, keys):
+    """Позиции очередей, в которые маршрутизируются ключи"""
+    return {key: collection.route(key, key) for key in keys}
+
+def test_route_labels():
+    """Тестирование маршрутизации: после сохранения и загрузки ключи попадают в те же очереди"""
+    keys = [f"user-{n}" for n in range(200)]
+    collection = QueueCollection()
+    for n in range(8):
+        collection.add(Queue(), name="named" if n == 3 else None)
+    collection.route("warm-up", 0)
+    collection.remove(5)
+    collection.add(Queue())
+    before = _routed_slots(collection, keys)
+    # В файле удаленная позиция 5 выпадает, поэтому позиции после неё сдвигаются на одну
+    shift = {slot: slot - (slot > 5) for slot in range(len(collection) + 1)}
+    with tempfile.TemporaryDirectory() as tmp:
+        for codec in ('json', 'struct'):
+            numbers = QueueCollection([Queue() for _ in range(8)])
+            numbers.route(0, 0)
+            path = os.path.join(tmp, f"numbers.{codec}")
+            numbers.save(path, codec)
+            assert _routed_slots(QueueCollection.load(path), keys) == _routed_slots(numbers, keys), codec
+        path = os.path.join(tmp, "collection.json")
+        collection.save(path)
+        loaded = QueueCollection.load(path)
+        assert loaded.names == {"named": 3}
+        assert _routed_slots(loaded, keys) == {key: shift[slot] for key, slot in before.items()}
+        directory = os.path.join(tmp, "shards")
+        collection.save_sharded(directory, queues_per_shard=3)
+        assert _routed_slots(QueueCollection.load_sharded(directory), keys) == before
+        lazy = QueueCollection.open(directory, max_loaded=2)
+        assert _routed_slots(lazy, keys) == before
+        # Новая очередь получает свежую метку, а не метку удаленной
+        lazy.add(Queue())
+        lazy.save()
+        reopened = QueueCollection.open(directory)
+        assert _routed_slots(reopened, keys) == _routed_slots(lazy, keys)
+    print("Маршрутизация: метки кольца переживают save/load, save_sharded и open")
+
+def test_aggregates_shared_queue():
+    """Тестирование агрегатов, когда одна очередь стоит в коллекции на двух позициях"""
+    shared = Queue(max_size=2)
+    collection = QueueCollection([Queue(), shared])
+    assert collection.total_items == 0
+    collection.add(shared)
+    shared.enqueue("x")
+    assert collection.total_items == sum(len(queue) for queue in collection) == 2
+    collection.remove(1)
+    shared.enqueue("y")
+    assert collection.total_items == 2 and collection.full_count == 1 and collection.fullest() == 2
+    collection.compact()
+    assert collection.fullest() == 1 and collection.emptiest() == 0
+    collection.remove(1)
+    shared.clear()
+    collection[0].enqueue("z")
+    assert collection.total_items == 1 and collection.full_count == 0 and collection.fullest() == 0
+    print("Агрегаты: очередь на двух позициях учитывается на каждой и снимается без ошибок")
+
+def test_lazy_eviction():
+    """Тестирование вытеснения: очередь, которую держит вызывающий код, не теряет изменений"""
+    with tempfile.TemporaryDirectory() as directory:
+        QueueCollection([Queue.from_string(str(n)) for n in range(3)]).save_sharded(directory)
+        lazy = QueueCollection.open(directory, max_loaded=1)
+        q0 = lazy[0]
+        lazy[1]
+        assert lazy.loaded_count == 1
+        q0.enqueue("after eviction")
+        lazy.save()
+        assert list(QueueCollection.open(directory)[0]._items) == ["0", "after eviction"]
+        assert lazy[0] is q0
+        lazy[2]
+        q0.enqueue("again")
+        assert lazy[0] is q0 and list(q0._items) == ["0", "after eviction", "again"]
+        lazy.save_sharded(directory)
+        assert list(QueueCollection.load_sharded(directory)[0]._items) == ["0", "after eviction", "again"]
+        # Без внешних ссылок вытесненная очередь читается заново из шарда
+        del q0
+        lazy[1]
+        assert list(lazy[0]._items) == ["0", "after eviction", "again"]
+    print("Вытеснение: удерживаемая очередь остается той же и сохраняет изменения")
+
+def test_positions_after_remove():
+    """Тестирование индексов после удаления: позиции не сдвигаются, len считает только очереди"""
+    collection = QueueCollection([Queue.from_string(str(n)) for n in range(4)])
+    collection.remove(3)
+    collection.remove(1)
+    assert len(collection) == 2 and collection.slot_count == 4
+    assert [slot for slot, _ in collection.items()] == [0, 2]
+    assert all(collection[slot] is queue for slot, queue in collection.items())
+    for index in (-1, 1):
+        try:
+            collection[index]
+            raise AssertionError("removed position must not be readable")
+        except IndexError:
+            pass
+    view = collection[1:]
+    assert len(view) == 1 and view.slot_count == 3
+    assert [(index, queue.peek()) for index, queue in view.items()] == [(1, "2")]
+    collection.compact()
+    assert collection.slot_count == len(collection) == 2 and collection[-1].peek() == "2"
+    print("Позиции: после удаления len и slot_count расходятся до уплотнения")
+
+def test_auto_compaction():
+    """Тестирование уплотнения: remove уплотняет позиции, когда надгробий больше compact_ratio"""
+    collection = QueueCollection([Queue.from_string(str(n)) for n in range(6)])
+    collection.add(Queue.from_string("named"), name="named")
+    assert collection.remove(0) is None and collection.remove(2) is None and collection.remove(4) is None
+    assert collection.tombstones == 3 and collection.slot_count == 7
+    remap = collection.remove(5)
+    assert remap == {1: 0, 3: 1, 6: 2}
+    assert collection.tombstones == 0 and collection.slot_count == len(collection) == 3
+    assert [queue.peek() for queue in collection] == ["1", "3", "named"]
+    assert collection.index_of("named") == 2 and collection[len(collection) - 1] is collection["named"]
+    manual = QueueCollection([Queue() for _ in range(4)], compact_ratio=None)
+    for slot in range(3):
+        assert manual.remove(slot) is None
+    assert manual.tombstones == 3 and manual.compact() == {3: 0}
+    try:
+        QueueCollection(compact_ratio=1)
+        raise AssertionError("compact_ratio 1 must be rejected")
+    except ValueError:
+        pass
+    print("Уплотнение: remove возвращает отображение позиций, когда надгробий больше доли compact_ratio")
+
+def _sharded_collection():
+    """Коллекция с надгробием и именами, разложенная по нескольким шардам"""
+    collection = QueueCollection(compact_ratio=None)
+    for n in range(40):
+        queue = Queue(max_size=None if n % 3 else 50)
+        for item in range(n % 7):
+            queue.enqueue(f"{n}-{item}" if n % 2 else item)
+        collection.add(queue, name=f"queue-{n}" if n % 10 == 0 else None)
+    collection.route("warm-up", 0)
+    collection.remove(7)
+    collection.remove("queue-20")
+    return collection
+
+def test_parallel_shards():
+    """Тестирование параллельного сохранения: файлы совпадают побайтно, загрузка в workers дает ту же коллекцию"""
+    collection = _sharded_collection()
+    expected = [(slot, queue._max_size, list(queue._items)) for slot, queue in collection.items()]
+    # route добавляет элементы, поэтому маршруты снимаются с отдельной копии коллекции
+    keys = [f"user-{n}" for n in range(100)]
+    routes = _routed_slots(_sharded_collection(), keys)
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = os.path.join(tmp, "workers-1")
+        collection.save_sharded(reference, queues_per_shard=6)
+        files = sorted(os.listdir(reference))
+        assert len(files) > 2
+        for processes in (True, False):
+            directory = os.path.join(tmp, f"workers-4-{processes}")
+            collection.save_sharded(directory, queues_per_shard=6, workers=4, processes=processes)
+            assert sorted(os.listdir(directory)) == files
+            match, mismatch, errors = filecmp.cmpfiles(reference, directory, files, shallow=False)
+            assert not mismatch and not errors, (processes, mismatch, errors)
+            loaded = QueueCollection.load_sharded(directory, workers=3, processes=processes)
+            assert [(slot, queue._max_size, list(queue._items)) for slot, queue in loaded.items()] == expected
+            assert loaded.names == collection.names and loaded.slot_count == collection.slot_count
+            assert _routed_slots(loaded, keys) == routes
+    print("Шарды: сохранение в workers процессах и потоках совпадает с однопоточным, загрузка возвращает ту же коллекцию")
+
+def _order(dispatcher, count=100):
+    """Элементы в порядке выдачи диспетчером"""
+    return [item for _, item in dispatcher.dispatch_many(count)]
+
+def test_dispatcher_modes():
+    """Тестирование порядка выдачи диспетчера в режимах rr, weighted и drr и счетчиков обслуживания"""
+    dispatcher = Dispatcher(_tenants())
+    assert _order(dispatcher) == ["alpha-0", "beta-0", "gamma-0", "alpha-1", "beta-1", "gamma-1",
+                                  "alpha-2", "gamma-2", "alpha-3", "alpha-4", "alpha-5"]
+    assert dispatcher.served == {0: 6, 1: 2, 2: 3}
+    assert dispatcher.starvation() == {slot: {'waiting': 0, 'max_gap': 2} for slot in range(3)}
+    assert dispatcher.stats() == {'dispatched': 11, 'active': 0, 'max_gap': 2}
+    weighted = ["alpha-0", "alpha-1", "alpha-2", "beta-0", "gamma-0",
+                "alpha-3", "alpha-4", "alpha-5", "beta-1", "gamma-1", "gamma-2"]
+    for mode in ('weighted', 'drr'):
+        assert _order(Dispatcher(_tenants(), mode=mode, weights={"alpha": 3})) == weighted, mode
+    # Элемент alpha стоит два кванта: alpha выдает один элемент за ход, остальные - по два
+    dispatcher = Dispatcher(_tenants(), mode='drr', quantum=2, cost=lambda item: 2 if item.startswith("alpha") else 1)
+    assert _order(dispatcher) == ["alpha-0", "beta-0", "beta-1", "gamma-0", "gamma-1",
+                                  "alpha-1", "gamma-2", "alpha-2", "alpha-3", "alpha-4", "alpha-5"]
+    # Перерыв ожидающей очереди растет, пока её не обслужат
+    dispatcher = Dispatcher(_tenants())
+    assert _order(dispatcher, 2) == ["alpha-0", "beta-0"]
+    assert dispatcher.starvation() == {0: {'waiting': 1, 'max_gap': 1}, 1: {'waiting': 0, 'max_gap': 1},
+                                       2: {'waiting': 2, 'max_gap': 2}}
+    try:
+        Dispatcher(_tenants(), mode='fifo')
+        raise AssertionError("unknown mode must be rejected")
+    except ValueError:
+        pass
+    print("Диспетчер: порядок выдачи в режимах rr, weighted и drr и счетчики перерывов")
+
+def test_dispatcher_reactivation():
+    """Тестирование диспетчера: опустевшая очередь возвращается в обход, когда в ней снова появляются элементы"""
+    tenants = _tenants()
+    dispatcher = Dispatcher(tenants)
+    assert len(dispatcher.dispatch_many(100)) == 11 and dispatcher.active_count == 0
+    assert dispatcher.dispatch_many(1) == []
+    try:
+        dispatcher.dispatch()
+        raise AssertionError("dispatch from empty queues must fail")
+    except IndexError:
+        pass
+    tenants["gamma"].enqueue("gamma-late")
+    tenants["beta"].enqueue("beta-late")
+    assert dispatcher.active_count == 2
+    assert dispatcher.dispatch_many(3) == [(2, "gamma-late"), (1, "beta-late")]
+    dispatcher.close()
+    tenants["beta"].enqueue("unseen")
+    assert dispatcher.active_count == 0
+    print("Диспетчер: очередь, ставшая непустой, снова встает в обход")
+
+def test_dispatcher_collection_changes():
+    """Тестирование диспетчера при удалении, добавлении и уплотнении очередей во время выдачи"""
+    tenants = _tenants()
+    dispatcher = Dispatcher(tenants)
+    assert _order(dispatcher, 2) == ["alpha-0", "beta-0"]
+    tenants.remove("beta")
+    assert dispatcher.dispatch() == (2, "gamma-0")
+    assert tenants.compact() == {0: 0, 2: 1}
+    assert dispatcher.dispatch_many(2) == [(0, "alpha-1"), (1, "gamma-1")]
+    assert dispatcher.served == {0: 2, 1: 2}
+    delta = Queue.from_string("delta-0")
+    tenants.add(delta, name="delta")
+    assert dispatcher.dispatch_many(3) == [(0, "alpha-2"), (1, "gamma-2"), (2, "delta-0")]
+    # Второе удаление уплотняет коллекцию автоматически, диспетчер следует новым позициям
+    tenants.remove("gamma")
+    assert tenants.remove("delta") == {0: 0}
+    assert dispatcher.dispatch_many(100) == [(0, "alpha-3"), (0, "alpha-4"), (0, "alpha-5")]
+    assert dispatcher.served == {0: 6}
+    print("Диспетчер: удаление, добавление и уплотнение очередей во время выдачи")
+
+
+if __name__ == "__main__":
+    test_route_labels()
+    test_aggregates_shared_queue()
+    test_lazy_eviction()
+    test_positions_after_remove()
+    test_auto_compaction()
+    test_parallel_shards()
+    test_dispatcher_modes()
+    test_dispatcher_reactivation()
+    test_dispatcher_collection_changes()
@@ -0,0 +1,81 @@
+import bisect
+import hashlib
+from typing import Any, Dict, Hashable, List
+
+
+def stable_hash(key: Any) -> int:
+    """ Детерминированный 64-битный хеш: одинаков во всех процессах, в отличие от встроенного hash() """
+    if isinstance(key, bytes):
+        data = key
+    else:
+        data = f'{type(key).__name__}:{key}'.encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+
+class HashRing:
+    """ Кольцо согласованного хеширования с виртуальными узлами """
+
+    def __init__(self, vnodes: int = 64):
+        """ Создает пустое кольцо; vnodes - число точек каждого узла на кольце """
+        if vnodes < 1:
+            raise ValueError("vnodes must be positive")
+        self._vnodes = vnodes
+        # Отсортированные точки кольца и узлы, которым они принадлежат
+        self._points: List[int] = []
+        self._owners: List[Hashable] = []
+        self._nodes = set()
+
+    def __len__(self) -> int:
+        """ Возвращает количество узлов на кольце """
+        return len(self._nodes)
+
+    def __contains__(self, node: Hashable) -> bool:
+        """ Проверяет, есть ли узел на кольце """
+        return node in self._nodes
+
+    def _node_points(self, node: Hashable) -> List[int]:
+        """ Точки виртуальных узлов узла """
+        return [stable_hash(f'{node}#{replica}') for replica in range(self._vnodes)]
+
+    def add(self, node: Hashable) -> None:
+        """ Добавляет узел: он забирает ключи только у соседей по кольцу, около 1/N всех ключей """
+        if node in self._nodes:
+            raise ValueError(f"Node {node!r} is already on the ring")
+        self._nodes.add(node)
+        for point in self._node_points(node):
+            position = bisect.bisect_left(self._points, point)
+            self._points.insert(position, point)
+            self._owners.insert(position, node)
+
+    def remove(self, node: Hashable) -> None:
+        """ Убирает узел: его ключи переходят к следующим по кольцу узлам """
+        self._nodes.remove(node)
+        for point in self._node_points(node):
+            position = bisect.bisect_left(self._points, point)
+            while self._owners[position] != node:
+                position += 1
+            del self._points[position]
+            del self._owners[position]
+
+    def lookup(self, key: Any) -> Hashable:
+        """ Возвращает узел, отвечающий за ключ: первую точку кольца не меньше хеша ключа """
+        if not self._points:
+            raise LookupError("Hash ring is empty")
+        position = bisect.bisect_left(self._points, stable_hash(key))
+        return self._owners[position % len(self._owners)]
+
+    def ownership(self) -> Dict[Hashable, float]:
+        """ Доля пространства хешей, принадлежащая каждому узлу """
+        shares = dict.fromkeys(self._nodes, 0.0)
+        if not self._points:
+            return shares
+        space = 1 << 64
+        previous = self._points[-1] - space
+        for point, owner in zip(self._points, self._owners):
+            shares[owner] += (point - previous) / space
+            previous = point
+        return shares
+
+    def __repr__(self) -> str:
+        """ Возвращает строковое представление кольца """
+        return f"HashRing(nodes={len(self._nodes)}, vnodes={self._vnodes})"
@@ -0,0 +1,192 @@
+import json
+import os
+import pickle
+import struct
+import sys
+from array import array
+from typing import Any, BinaryIO, Dict, List
+
+# Сигнатуры двоичных форматов; файл без сигнатуры читается как JSON
+_PICKLE_MAGIC = b'QPK5'
+_STRUCT_MAGIC = b'QST1'
+_COUNT = struct.Struct('<Q')
+_QUEUE_HEADER = struct.Struct('<qcQ')
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+CODECS = ('json', 'pickle', 'struct')
+
+
+def _dump_json(state: Dict[str, Any], f: BinaryIO) -> None:
+    """ Текстовый JSON - формат по умолчанию, совместимый с прежними файлами """
+    f.write(json.dumps(state).encode('utf-8'))
+
+
+def _wrap_buffers(state: Dict[str, Any]) -> Dict[str, Any]:
+    """ Оборачивает элементы bytearray в PickleBuffer: только такие буферы pickle отдает вне основного потока """
+    if 'queues' in state:
+        return dict(state, queues=[_wrap_buffers(queue_state) for queue_state in state['queues']])
+    items = state.get('items')
+    if items is None or isinstance(items, array):
+        return state
+    return dict(state, items=[pickle.PickleBuffer(item) if type(item) is bytearray else item for item in items])
+
+
+def _dump_pickle(state: Dict[str, Any], f: BinaryIO) -> None:
+    """ pickle протокола 5: элементы bytearray пишутся отдельными буферами, без копирования в поток pickle """
+    buffers: List[pickle.PickleBuffer] = []
+    data = pickle.dumps(_wrap_buffers(state), protocol=5, buffer_callback=buffers.append)
+    f.write(_PICKLE_MAGIC)
+    f.write(_COUNT.pack(len(buffers)))
+    for buffer in buffers:
+        raw = buffer.raw()
+        f.write(_COUNT.pack(raw.nbytes))
+        f.write(raw)
+    f.write(data)
+
+
+def _typecode(items) -> bytes:
+    """ Определяет тип элементов однородной числовой очереди: 'q' - int64, 'd' - float64 """
+    if isinstance(items, array):
+        if items.typecode in 'bBhHiIlLqQ':
+            return b'q'
+        if items.typecode in 'fd':
+            return b'd'
+    elif all(type(item) is int for item in items):
+        if all(_INT64_MIN <= item <= _INT64_MAX for item in items):
+            return b'q'
+    elif all(type(item) is float for item in items):
+        return b'd'
+    raise TypeError("struct codec supports only homogeneous int64 or float queues")
+
+
+def _pack_queue(state: Dict[str, Any], f: BinaryIO) -> None:
+    """ Записывает очередь как заголовок и сырой буфер массива чисел """
+    items = state['items']
+    typecode = _typecode(items)
+    if not isinstance(items, array) or items.typecode != typecode.decode():
+        items = array(typecode.decode(), items)
+    max_size = state['max_size']
+    f.write(_QUEUE_HEADER.pack(-1 if max_size is None else max_size, typecode, len(items)))
+    if sys.byteorder == 'big':
+        items = array(items.typecode, items)
+        items.byteswap()
+    f.write(memoryview(items).cast('B'))
+
+
+def _dump_struct(state: Dict[str, Any], f: BinaryIO) -> None:
+    """ Компактный формат для однородных числовых очередей: сырые int64/float64 без разбора текста """
+    f.write(_STRUCT_MAGIC)
+    if 'queues' in state:
+        f.write(b'C')
+        f.write(_COUNT.pack(len(state['queues'])))
+        for queue_state in state['queues']:
+            _pack_queue(queue_state, f)
+        _write_extra(state, ('queues',), f)
+    else:
+        f.write(b'Q')
+        _pack_queue(state, f)
+        _write_extra(state, ('max_size', 'items'), f)
+
+
+def _write_extra(state: Dict[str, Any], packed, f: BinaryIO) -> None:
+    """ Дописывает прочие поля (имена, метки кольца, тип очереди) необязательным хвостом JSON """
+    extra = {key: value for key, value in state.items() if key not in packed}
+    if extra:
+        blob = json.dumps(extra).encode('utf-8')
+        f.write(_COUNT.pack(len(blob)))
+        f.write(blob)
+
+
+_DUMPERS = {
+    'json': _dump_json,
+    'pickle': _dump_pickle,
+    'struct': _dump_struct,
+}
+
+
+def dump(state: Dict[str, Any], filename: str, codec: str = 'json') -> None:
+    """ Атомарно сохраняет состояние очереди или коллекции выбранным кодеком: ошибка кодека не портит прежний файл """
+    if codec not in _DUMPERS:
+        raise ValueError(f"Unknown codec {codec!r}, expected one of {CODECS}")
+    tmp_path = filename + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            _DUMPERS[codec](state, f)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, filename)
+
+
+def _read_exact(f: BinaryIO, size: int) -> bytes:
+    """ Читает ровно size байт или сообщает об обрезанном файле """
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("Unexpected end of file")
+    return data
+
+
+def _load_pickle(f: BinaryIO) -> Dict[str, Any]:
+    """ Читает pickle протокола 5 с внешними буферами; они восстанавливаются как bytearray """
+    (count,) = _COUNT.unpack(_read_exact(f, _COUNT.size))
+    buffers = []
+    for _ in range(count):
+        (size,) = _COUNT.unpack(_read_exact(f, _COUNT.size))
+        buffer = bytearray(size)
+        if f.readinto(buffer) != size:
+            raise ValueError("Unexpected end of file")
+        buffers.append(buffer)
+    return pickle.loads(f.read(), buffers=buffers)
+
+
+def _unpack_queue(f: BinaryIO) -> Dict[str, Any]:
+    """ Читает заголовок очереди и её сырой буфер чисел """
+    max_size, typecode, count = _QUEUE_HEADER.unpack(_read_exact(f, _QUEUE_HEADER.size))
+    items = array(typecode.decode())
+    items.frombytes(_read_exact(f, count * items.itemsize))
+    if sys.byteorder == 'big':
+        items.byteswap()
+    return {'max_size': None if max_size < 0 else max_size, 'items': items}
+
+
+def _load_struct(f: BinaryIO) -> Dict[str, Any]:
+    """ Читает компактный числовой формат """
+    kind = _read_exact(f, 1)
+    if kind == b'Q':
+        state = _unpack_queue(f)
+    else:
+        (count,) = _COUNT.unpack(_read_exact(f, _COUNT.size))
+        state = {'queues': [_unpack_queue(f) for _ in range(count)]}
+    # Файлы без хвоста с прочими полями тоже читаются
+    size = f.read(_COUNT.size)
+    if size:
+        (size,) = _COUNT.unpack(size)
+        state.update(json.loads(_read_exact(f, size)))
+    return state
+
+
+def detect(filename: str) -> str:
+    """ Определяет кодек файла по сигнатуре """
+    with open(filename, 'rb') as f:
+        magic = f.read(len(_PICKLE_MAGIC))
+    if magic == _PICKLE_MAGIC:
+        return 'pickle'
+    if magic == _STRUCT_MAGIC:
+        return 'struct'
+    return 'json'
+
+
+def load(filename: str, allow_pickle: bool = False) -> Dict[str, Any]:
+    """ Загружает состояние очереди или коллекции, определяя кодек автоматически """
+    codec = detect(filename)
+    # Разбор pickle может выполнить произвольный код - только для файлов из доверенного источника
+    if codec == 'pickle' and not allow_pickle:
+        raise ValueError(f"{filename} is a pickle file; pass allow_pickle=True to load it from a trusted source")
+    if codec == 'json':
+        with open(filename, 'r') as f:
+            return json.load(f)
+    with open(filename, 'rb') as f:
+        f.seek(len(_PICKLE_MAGIC))
+        if codec == 'pickle':
+            return _load_pickle(f)
+        return _load_struct(f)
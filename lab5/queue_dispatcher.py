@@ -0,0 +1,215 @@
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from task1_collection import Queue, QueueCollection
+
+MODES = ('rr', 'weighted', 'drr')
+
+
+class Dispatcher:
+    """ Справедливая выборка из очередей коллекции: непустые очереди обходятся по кругу за O(1) на элемент """
+
+    def __init__(self, collection: QueueCollection, mode: str = 'rr',
+                 weights: Optional[Dict[Union[int, str], int]] = None, quantum: int = 1,
+                 cost: Optional[Callable[[Any], int]] = None):
+        """ Подписывается на очереди коллекции; mode - 'rr', 'weighted' (weight элементов за ход) или 'drr' """
+        # В режиме 'drr' за ход очереди начисляется quantum * weight единиц, элемент стоит cost(item) единиц
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode!r}, expected one of {MODES}")
+        if collection._directory is not None:
+            raise ValueError("Dispatcher requires an in-memory collection")
+        self._collection = collection
+        self._mode = mode
+        self._quantum = quantum
+        self._cost = cost if cost is not None else (lambda item: 1)
+        # Все словари ключуются id очереди: позиции меняются при уплотнении коллекции
+        self._queues: Dict[int, Queue] = {}
+        self._slot_of: Dict[int, int] = {}
+        self._weights: Dict[int, int] = {}
+        self._deficit: Dict[int, int] = {}
+        # Непустые очереди в порядке обхода; множество исключает повторы
+        self._active: Deque[Queue] = deque()
+        self._active_ids = set()
+        # Ход очереди в голове обхода: оставшийся кредит элементов или None, если ход еще не начат
+        self._turn: Optional[int] = None
+        self._served: Counter = Counter()
+        self._dispatched = 0
+        self._waiting_since: Dict[int, int] = {}
+        self._max_gap: Counter = Counter()
+        self._known = 0
+        self._epoch = collection._epoch
+        self.refresh()
+        for key, weight in (weights or {}).items():
+            self.set_weight(key, weight)
+
+    def refresh(self) -> None:
+        """ Сверяется с коллекцией: подписывается на новые очереди, забывает удаленные, обновляет позиции """
+        present = {}
+        for slot, node in enumerate(self._collection._node_data):
+            if node is not None:
+                present[id(node)] = slot
+                if id(node) not in self._queues:
+                    self._attach(node)
+        for key in list(self._queues):
+            if key not in present:
+                self._queues.pop(key).remove_listener(self._on_change)
+                self._weights.pop(key, None)
+        self._slot_of = present
+        self._known = len(self._collection._node_data)
+        self._epoch = self._collection._epoch
+
+    def _attach(self, queue: Queue) -> None:
+        """ Подписывается на изменения очереди и ставит её в обход, если она не пуста """
+        self._queues[id(queue)] = queue
+        queue.add_listener(self._on_change)
+        if not queue.is_empty:
+            self._activate(queue)
+
+    def _on_change(self, queue: Queue, old_size: int, new_size: int) -> None:
+        """ Очередь, ставшая непустой, встает в конец обхода """
+        if not old_size and new_size:
+            self._activate(queue)
+
+    def _activate(self, queue: Queue) -> None:
+        """ Добавляет очередь в множество активных """
+        key = id(queue)
+        if key not in self._active_ids:
+            self._active_ids.add(key)
+            self._active.append(queue)
+            self._waiting_since[key] = self._dispatched
+
+    def set_weight(self, key: Union[int, str], weight: int) -> None:
+        """ Задает вес очереди по позиции или имени """
+        if weight < 1:
+            raise ValueError("weight must be positive")
+        self._weights[id(self._collection[key])] = weight
+
+    def _end_turn(self) -> None:
+        """ Завершает ход очереди в голове обхода и переносит её в конец """
+        self._active.rotate(-1)
+        self._turn = None
+
+    def _drop_front(self) -> None:
+        """ Убирает опустевшую или удаленную очередь из обхода """
+        key = id(self._active.popleft())
+        self._active_ids.discard(key)
+        self._deficit.pop(key, None)
+        self._turn = None
+
+    def dispatch(self) -> Tuple[int, Any]:
+        """ Извлекает следующий элемент по правилам обхода и возвращает (позиция очереди, элемент) """
+        if self._epoch != self._collection._epoch or self._known != len(self._collection._node_data):
+            self.refresh()
+        while self._active:
+            queue = self._active[0]
+            key = id(queue)
+            # Очередь могли опустошить или удалить в обход диспетчера - она просто покидает обход
+            if queue.is_empty or key not in self._slot_of \
+                    or self._collection._node_data[self._slot_of[key]] is not queue:
+                self._drop_front()
+                continue
+            if self._turn is None:
+                self._turn = self._weights.get(key, 1)
+                if self._mode == 'drr':
+                    self._deficit[key] = self._deficit.get(key, 0) + self._quantum * self._turn
+            if self._mode == 'drr':
+                cost = self._cost(queue.peek())
+                if cost > self._deficit[key]:
+                    self._end_turn()
+                    continue
+                self._deficit[key] -= cost
+            item = queue.dequeue()
+            self._record(key)
+            if queue.is_empty:
+                self._drop_front()
+            elif self._mode == 'rr':
+                self._end_turn()
+            elif self._mode == 'weighted':
+                self._turn -= 1
+                if not self._turn:
+                    self._end_turn()
+            return self._slot_of[key], item
+        raise IndexError("All queues are empty")
+
+    def dispatch_many(self, count: int) -> List[Tuple[int, Any]]:
+        """ Извлекает до count элементов; пустой список, если все очереди пусты """
+        batch = []
+        try:
+            for _ in range(count):
+                batch.append(self.dispatch())
+        except IndexError:
+            pass
+        return batch
+
+    def _record(self, key: int) -> None:
+        """ Учитывает обслуживание очереди и самый долгий перерыв в нем """
+        gap = self._dispatched - self._waiting_since[key]
+        if gap > self._max_gap[key]:
+            self._max_gap[key] = gap
+        self._served[key] += 1
+        self._dispatched += 1
+        self._waiting_since[key] = self._dispatched
+
+    @property
+    def active_count(self) -> int:
+        """ Количество очередей в обходе """
+        return len(self._active)
+
+    @property
+    def served(self) -> Dict[int, int]:
+        """ Количество выданных элементов по позициям очередей """
+        return {self._slot_of[key]: count for key, count in self._served.items() if key in self._slot_of}
+
+    def starvation(self) -> Dict[int, Dict[str, int]]:
+        """ Перерывы в обслуживании (в выданных элементах): текущий у ожидающих очередей и наибольший """
+        metrics = {}
+        for key, slot in self._slot_of.items():
+            waiting = self._dispatched - self._waiting_since[key] if key in self._active_ids else 0
+            max_gap = max(self._max_gap[key], waiting)
+            if waiting or max_gap:
+                metrics[slot] = {'waiting': waiting, 'max_gap': max_gap}
+        return metrics
+
+    def stats(self) -> Dict[str, Any]:
+        """ Сводка: всего выдано, очередей в обходе, наибольший перерыв среди всех очередей """
+        starvation = self.starvation()
+        return {
+            'dispatched': self._dispatched,
+            'active': len(self._active),
+            'max_gap': max((metric['max_gap'] for metric in starvation.values()), default=0),
+        }
+
+    def close(self) -> None:
+        """ Отписывается от очередей коллекции """
+        for queue in self._queues.values():
+            queue.remove_listener(self._on_change)
+        self._queues.clear()
+        self._active.clear()
+        self._active_ids.clear()
+
+
+def _tenants() -> QueueCollection:
+    """ Коллекция очередей арендаторов с неравной нагрузкой для демонстрации """
+    tenants = QueueCollection()
+    for name, jobs in (("alpha", 6), ("beta", 2), ("gamma", 3)):
+        queue = Queue()
+        for i in range(jobs):
+            queue.enqueue(f"{name}-{i}")
+        tenants.add(queue, name=name)
+    return tenants
+
+
+if __name__ == "__main__":
+    for mode in MODES:
+        tenants = _tenants()
+        dispatcher = Dispatcher(tenants, mode=mode, weights={"alpha": 3})
+        order = [item for _, item in dispatcher.dispatch_many(100)]
+        print(f"{mode}: {order}")
+        print(f"  выдано по очередям: {dispatcher.served}, перерывы: {dispatcher.starvation()}")
+
+    # Очередь, ставшая непустой, сама встает в обход
+    tenants = _tenants()
+    dispatcher = Dispatcher(tenants)
+    dispatcher.dispatch_many(100)
+    tenants["beta"].enqueue("beta-late")
+    print(f"После опустошения: {dispatcher.dispatch()}, {dispatcher.stats()}")
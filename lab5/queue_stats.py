@@ -0,0 +1,123 @@
+import json
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List
+
+
+class QueueStats:
+    """ Счетчики очереди: операции, отказы, пиковый размер и гистограмма времени ожидания элементов """
+
+    # Границы корзин гистограммы в микросекундах: 1, 2, 4, ... до ~1.2 часа, последняя - «больше»
+    BUCKETS = tuple(1 << power for power in range(33))
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """ Инициализирует пустую статистику; clock - источник времени в секундах """
+        self._clock = clock
+        # Моменты постановки последних элементов очереди в порядке FIFO
+        self._stamps: Deque[float] = deque()
+        self.reset()
+
+    def reset(self) -> None:
+        """ Обнуляет счетчики, не забывая моменты постановки элементов, еще лежащих в очереди """
+        self.enqueued = 0
+        self.dequeued = 0
+        self.cleared = 0
+        self.rejected_full = 0
+        self.rejected_empty = 0
+        self.peak_size = len(self._stamps)
+        self._histogram: List[int] = [0] * (len(self.BUCKETS) + 1)
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._started = self._clock()
+
+    def on_put(self, size: int) -> None:
+        """ Учитывает добавленный элемент; size - размер очереди после добавления """
+        self.enqueued += 1
+        self._stamps.append(self._clock())
+        if size > self.peak_size:
+            self.peak_size = size
+
+    def on_put_many(self, count: int, size: int) -> None:
+        """ Учитывает порцию добавленных элементов с общим моментом постановки """
+        self.enqueued += count
+        self._stamps.extend([self._clock()] * count)
+        if size > self.peak_size:
+            self.peak_size = size
+
+    def on_get(self, size: int) -> None:
+        """ Учитывает извлеченный элемент; size - размер очереди после извлечения """
+        self.dequeued += 1
+        # Моменты известны только для последних len(self._stamps) элементов: элементы,
+        # попавшие в очередь в обход счетчиков (загрузка, восстановление), в гистограмму не входят
+        if len(self._stamps) > size:
+            wait = self._clock() - self._stamps.popleft()
+            self._wait_total += wait
+            if wait > self._wait_max:
+                self._wait_max = wait
+            micros = int(wait * 1e6)
+            self._histogram[micros.bit_length() if micros < self.BUCKETS[-1] else len(self.BUCKETS)] += 1
+            while len(self._stamps) > size:
+                self._stamps.popleft()
+
+    def on_clear(self, count: int) -> None:
+        """ Учитывает удаление count элементов очисткой очереди """
+        self.cleared += count
+        self._stamps.clear()
+
+    def on_reject_full(self) -> None:
+        """ Учитывает отказ в добавлении в полную очередь """
+        self.rejected_full += 1
+
+    def on_reject_empty(self) -> None:
+        """ Учитывает отказ в извлечении из пустой очереди """
+        self.rejected_empty += 1
+
+    def _percentile(self, fraction: float) -> float:
+        """ Оценивает перцентиль ожидания в секундах по верхней границе корзины гистограммы """
+        total = sum(self._histogram)
+        if not total:
+            return 0.0
+        threshold = fraction * total
+        running = 0
+        for bound, count in zip(self.BUCKETS, self._histogram):
+            running += count
+            if running >= threshold:
+                return bound / 1e6
+        return self._wait_max
+
+    def snapshot(self) -> Dict[str, Any]:
+        """ Возвращает снимок статистики в виде словаря """
+        elapsed = self._clock() - self._started
+        waited = sum(self._histogram)
+        histogram = {f'<{bound}us': count for bound, count in zip(self.BUCKETS, self._histogram) if count}
+        if self._histogram[-1]:
+            histogram[f'>={self.BUCKETS[-1]}us'] = self._histogram[-1]
+        return {
+            'elapsed': elapsed,
+            'enqueued': self.enqueued,
+            'dequeued': self.dequeued,
+            'cleared': self.cleared,
+            'rejected_full': self.rejected_full,
+            'rejected_empty': self.rejected_empty,
+            'enqueue_rate': self.enqueued / elapsed if elapsed > 0 else 0.0,
+            'dequeue_rate': self.dequeued / elapsed if elapsed > 0 else 0.0,
+            'peak_size': self.peak_size,
+            'wait': {
+                'count': waited,
+                'mean': self._wait_total / waited if waited else 0.0,
+                'max': self._wait_max,
+                'p50': self._percentile(0.5),
+                'p90': self._percentile(0.9),
+                'p99': self._percentile(0.99),
+                'histogram': histogram,
+            },
+        }
+
+    def to_json(self) -> str:
+        """ Возвращает снимок статистики одной строкой JSON для журналов и сборщиков метрик """
+        return json.dumps(self.snapshot(), separators=(',', ':'))
+
+    def __repr__(self) -> str:
+        """ Возвращает краткое строковое представление статистики """
+        return (f"QueueStats(enqueued={self.enqueued}, dequeued={self.dequeued}, "
+                f"peak_size={self.peak_size}, rejected={self.rejected_full + self.rejected_empty})")
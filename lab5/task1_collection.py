@@ -1,13 +1,49 @@
-import json
-from typing import Any, Optional, List, Union
+import os
+import tempfile
+import weakref
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, List, Tuple, Union
+
+import collection_shards
+from collection_aggregates import CollectionAggregates
+from consistent_hash import HashRing
+import queue_codecs
+from queue_stats import QueueStats
 
 class Queue:
     """ Класс для реализации очереди с ограниченным размером """
 
-    def __init__(self, max_size: Optional[int] = None):
-        """ Инициализирует объект очереди с возможностью задания максимального размера """
+    def __init__(self, max_size: Optional[int] = None, stats: Union[bool, QueueStats] = False):
+        """ Инициализирует объект очереди с возможностью задания максимального размера и сбора статистики """
         self._items = []
         self._max_size = max_size
+        # Номер версии растет при каждом изменении - по нему коллекция находит измененные очереди
+        self._version = 0
+        self._stats: Optional[QueueStats] = QueueStats() if stats is True else stats or None
+        # Подписчики на изменение размера: listener(очередь, прежний размер, новый размер)
+        self._listeners: Optional[List[Callable[['Queue', int, int], None]]] = None
+
+    def add_listener(self, listener: Callable[['Queue', int, int], None]) -> None:
+        """ Подписывает listener(очередь, прежний размер, новый размер) на изменения размера очереди """
+        if self._listeners is None:
+            self._listeners = []
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[['Queue', int, int], None]) -> None:
+        """ Отписывает listener от изменений очереди """
+        if self._listeners is not None and listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, old_size: int) -> None:
+        """ Сообщает подписчикам об изменении размера """
+        new_size = len(self._items)
+        for listener in list(self._listeners):
+            listener(self, old_size, new_size)
+
+    @property
+    def stats(self) -> Optional[QueueStats]:
+        """ Возвращает статистику очереди или None, если она не собирается """
+        return self._stats
 
     @property
     def size(self) -> int:
@@ -27,14 +63,29 @@ class Queue:
     def enqueue(self, item: Any) -> None:
         """ Добавляет элемент в очередь, если она не полна """
         if self.is_full:
+            if self._stats is not None:
+                self._stats.on_reject_full()
             raise OverflowError("Queue is full")
         self._items.append(item)
+        self._version += 1
+        if self._stats is not None:
+            self._stats.on_put(len(self._items))
+        if self._listeners:
+            self._notify(len(self._items) - 1)
 
     def dequeue(self) -> Any:
         """ Удаляет и возвращает первый элемент из очереди """
         if self.is_empty:
+            if self._stats is not None:
+                self._stats.on_reject_empty()
             raise IndexError("Queue is empty")
-        return self._items.pop(0)
+        item = self._items.pop(0)
+        self._version += 1
+        if self._stats is not None:
+            self._stats.on_get(len(self._items))
+        if self._listeners:
+            self._notify(len(self._items) + 1)
+        return item
 
     def peek(self) -> Any:
         """ Возвращает первый элемент очереди без его удаления """
@@ -44,7 +95,13 @@ class Queue:
 
     def clear(self) -> None:
         """ Очищает очередь от всех элементов """
+        if self._stats is not None:
+            self._stats.on_clear(len(self._items))
+        old_size = len(self._items)
         self._items.clear()
+        self._version += 1
+        if self._listeners and old_size:
+            self._notify(old_size)
 
     def __str__(self) -> str:
         """ Возвращает строковое представление очереди """
@@ -84,80 +141,586 @@ class Queue:
                 queue.enqueue(item)
         return queue
 
-    def save(self, filename: str) -> None:
-        """ Сохраняет очередь в файл в формате JSON """
+    def save(self, filename: str, codec: str = 'json') -> None:
+        """ Сохраняет очередь в файл: JSON по умолчанию, 'pickle' или 'struct' для числовых очередей """
         data = {
             'max_size': self._max_size,
             'items': self._items
         }
-        with open(filename, 'w') as f:
-            json.dump(data, f)
+        queue_codecs.dump(data, filename, codec)
 
     @classmethod
-    def load(cls, filename: str) -> 'Queue':
-        """ Загружает очередь из файла в формате JSON """
-        with open(filename, 'r') as f:
-            data = json.load(f)
+    def load(cls, filename: str, allow_pickle: bool = False) -> 'Queue':
+        """ Загружает очередь из файла, определяя формат автоматически; pickle - только с allow_pickle=True """
+        data = queue_codecs.load(filename, allow_pickle)
         queue = cls(max_size=data['max_size'])
-        queue._items = data['items']
+        queue._items = list(data['items'])
         return queue
 
+class _StoredQueue:
+    """Очередь шардированной коллекции: положение записи на диске и загруженный объект, если он в памяти"""
+
+    __slots__ = ('file', 'offset', 'length', 'max_size', 'size', 'queue', 'version', 'ref')
+
+    def __init__(self, file: Optional[str], offset: int, length: int, max_size: Optional[int], size: int,
+                 queue: Optional['Queue'] = None, version: int = 0):
+        """Запоминает положение записи; version - версия очереди на момент записи на диск"""
+        self.file = file
+        self.offset = offset
+        self.length = length
+        self.max_size = max_size
+        self.size = size
+        self.queue = queue
+        self.version = version
+        # Слабая ссылка на вытесненную очередь: пока вызывающий код держит её, она остается той же очередью
+        self.ref: Optional[weakref.ref] = None
+
+    def resident(self) -> Optional['Queue']:
+        """Очередь в памяти: загруженная или вытесненная, но еще используемая вызывающим кодом"""
+        if self.queue is None and self.ref is not None:
+            return self.ref()
+        return self.queue
+
+    @property
+    def dirty(self) -> bool:
+        """Проверяет, изменилась ли очередь в памяти после записи на диск"""
+        queue = self.resident()
+        return queue is not None and queue._version != self.version
+
+
+class QueueCollectionView:
+    """Срез коллекции без копирования: диапазон позиций поверх хранилища исходной коллекции"""
+    
+    def __init__(self, collection: 'QueueCollection', slots: range):
+        """Запоминает исходную коллекцию и диапазон её позиций"""
+        self._collection = collection
+        self._slots = slots
+        self._epoch = collection._epoch
+    
+    def _check(self) -> None:
+        """Проверяет, что позиции исходной коллекции не менялись уплотнением"""
+        if self._epoch != self._collection._epoch:
+            raise RuntimeError("Collection was compacted, slice view is stale")
+    
+    def __len__(self) -> int:
+        """Количество очередей в срезе без учета удаленных; индексы среза - range(slot_count)"""
+        self._check()
+        node_data = self._collection._node_data
+        return sum(1 for slot in self._slots if node_data[slot] is not None)
+    
+    @property
+    def slot_count(self) -> int:
+        """Количество позиций среза вместе с удаленными: граница индексов, в отличие от len"""
+        self._check()
+        return len(self._slots)
+    
+    def items(self) -> Iterator[Tuple[int, 'Queue']]:
+        """Пары (индекс в срезе, очередь) для неудаленных очередей"""
+        self._check()
+        for index, slot in enumerate(self._slots):
+            if self._collection._node_data[slot] is not None:
+                yield index, self._collection._resolve(slot)
+    
+    def __iter__(self) -> Iterator['Queue']:
+        """Перебор очередей среза, удаленные пропускаются"""
+        self._check()
+        for slot in self._slots:
+            if self._collection._node_data[slot] is not None:
+                yield self._collection._resolve(slot)
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union['Queue', 'QueueCollectionView']:
+        """Индексация позициями среза, как у коллекции: удаленные позиции не сдвигают остальные; срез среза - тоже представление"""
+        self._check()
+        if isinstance(index, slice):
+            return QueueCollectionView(self._collection, self._slots[index])
+        try:
+            slot = self._slots[index]
+        except IndexError:
+            raise IndexError("Index out of range") from None
+        return self._collection[slot]
+    
+    def __str__(self) -> str:
+        """Строковое представление среза"""
+        return f"QueueCollection view with {len(self)} queues"
+    
+    def copy(self) -> 'QueueCollection':
+        """Независимая коллекция с очередями среза"""
+        return QueueCollection(list(self))
+
+
 class QueueCollection:
     """Класс-контейнер для хранения коллекции объектов Queue"""
     
-    def __init__(self, queues: List['Queue'] = None):
-        """Инициализация контейнера"""
+    def __init__(self, queues: List['Queue'] = None, compact_ratio: Optional[float] = 0.5):
+        """Инициализация контейнера; compact_ratio - доля надгробий, при превышении которой remove уплотняет позиции"""
+        # Позиции очередей стабильны: удаленная очередь оставляет надгробие None до уплотнения.
+        # Индекс - позиция, а не порядковый номер: пока надгробия есть, len (число очередей) меньше slot_count
+        # (число позиций), c[len(c) - 1] может быть другой очередью, а c[-1] - последняя позиция, даже удаленная.
+        # Уплотнение после доли compact_ratio удалений (None - только явный compact) стоит амортизированно O(1)
+        if compact_ratio is not None and not 0 <= compact_ratio < 1:
+            raise ValueError("compact_ratio must be in [0, 1) or None")
+        self._compact_ratio = compact_ratio
         self._node_data = queues if queues is not None else []
+        self._live = sum(1 for node in self._node_data if node is not None)
+        self._names: Dict[str, int] = {}
+        self._slot_names: Dict[int, str] = {}
+        # Номер раскладки растет при уплотнении и делает устаревшими срезы-представления
+        self._epoch = 0
+        # Маршрутизация по ключу: кольцо строится при первом route, узлы - постоянные метки очередей
+        self._ring: Optional[HashRing] = None
+        self._ring_vnodes = 64
+        self._ring_labels: Dict[int, str] = {}
+        self._ring_slots: Dict[str, int] = {}
+        self._ring_serial = 0
+        self._routed: Counter = Counter()
+        # Агрегаты по уведомлениям очередей: подписка создается при первом запросе
+        self._aggregates: Optional[CollectionAggregates] = None
+        # Шардированная коллекция: каталог на диске и загруженные очереди в порядке последнего обращения
+        self._directory: Optional[str] = None
+        self._generation = 0
+        self._max_loaded: Optional[int] = None
+        self._loaded: 'OrderedDict[int, _StoredQueue]' = OrderedDict()
     
     def __str__(self) -> str:
         """Строковое представление коллекции"""
-        return f"QueueCollection with {len(self._node_data)} queues"
+        return f"QueueCollection with {len(self)} queues"
     
-    def __getitem__(self, index: Union[int, slice]) -> Union['Queue', 'QueueCollection']:
-        """Поддержка индексации и срезов"""
-        if isinstance(index, slice):
-            return QueueCollection(self._node_data[index])
-        return self._node_data[index]
+    def __len__(self) -> int:
+        """Количество очередей в коллекции без учета удаленных; индексы - range(slot_count)"""
+        return self._live
+    
+    @property
+    def slot_count(self) -> int:
+        """Количество позиций вместе с удаленными: граница индексов, в отличие от len"""
+        return len(self._node_data)
+    
+    def items(self) -> Iterator[Tuple[int, 'Queue']]:
+        """Пары (позиция, очередь) для неудаленных очередей по порядку позиций"""
+        for slot, node in enumerate(self._node_data):
+            if node is not None:
+                yield slot, self._resolve(slot)
+    
+    def __iter__(self) -> Iterator['Queue']:
+        """Перебор очередей по порядку позиций, удаленные пропускаются"""
+        for slot, node in enumerate(self._node_data):
+            if node is not None:
+                yield self._resolve(slot)
+    
+    def _slot(self, key: Union[int, str]) -> int:
+        """Находит позицию очереди по номеру или имени"""
+        if isinstance(key, str):
+            try:
+                return self._names[key]
+            except KeyError:
+                raise KeyError(f"No queue named {key!r}") from None
+        slot = key + len(self._node_data) if key < 0 else key
+        if not 0 <= slot < len(self._node_data):
+            raise IndexError("Index out of range")
+        if self._node_data[slot] is None:
+            raise IndexError(f"Queue at index {key} was removed")
+        return slot
+    
+    def _resolve(self, slot: int) -> 'Queue':
+        """Возвращает очередь на позиции, загружая её из шарда при необходимости"""
+        node = self._node_data[slot]
+        if isinstance(node, _StoredQueue):
+            return self._fetch(node)
+        return node
+    
+    def __getitem__(self, key: Union[int, str, slice]) -> Union['Queue', QueueCollectionView]:
+        """Поддержка индексации позициями, имен и срезов; отрицательный индекс считается от slot_count; срез - представление без копирования"""
+        if isinstance(key, slice):
+            return QueueCollectionView(self, range(len(self._node_data))[key])
+        return self._resolve(self._slot(key))
+    
+    def index_of(self, name: str) -> int:
+        """Позиция очереди с заданным именем"""
+        return self._slot(name)
+    
+    @property
+    def names(self) -> Dict[str, int]:
+        """Имена очередей и их позиции"""
+        return dict(self._names)
     
-    def add(self, value: 'Queue') -> None:
-        """Добавление очереди в коллекцию"""
+    def add(self, value: 'Queue', name: Optional[str] = None) -> int:
+        """Добавление очереди в коллекцию, при необходимости под именем; возвращает позицию очереди"""
         if not isinstance(value, Queue):
             raise TypeError("Only Queue objects can be added")
-        self._node_data.append(value)
+        if name is not None and name in self._names:
+            raise ValueError(f"Queue named {name!r} already exists")
+        slot = len(self._node_data)
+        if self._directory is None:
+            self._node_data.append(value)
+        else:
+            # Новая очередь еще не записана на диск - версия -1 делает её измененной
+            stored = _StoredQueue(None, 0, 0, value._max_size, value.size, value, version=-1)
+            self._node_data.append(stored)
+            self._touch(stored)
+        self._live += 1
+        if name is not None:
+            self._names[name] = slot
+            self._slot_names[slot] = name
+        if self._ring is not None:
+            self._ring_add(slot)
+        if self._aggregates is not None:
+            self._aggregates.attach(value, slot)
+        return slot
     
-    def remove(self, index: int) -> None:
-        """Удаление очереди по индексу"""
-        if not 0 <= index < len(self._node_data):
-            raise IndexError("Index out of range")
-        del self._node_data[index]
+    def remove(self, key: Union[int, str]) -> Optional[Dict[int, int]]:
+        """Удаление очереди по индексу или имени за амортизированное O(1); возвращает отображение позиций, если remove уплотнил коллекцию"""
+        slot = self._slot(key)
+        node = self._node_data[slot]
+        self._node_data[slot] = None
+        self._live -= 1
+        name = self._slot_names.pop(slot, None)
+        if name is not None:
+            del self._names[name]
+        # Метки восстановленной коллекции существуют и до построения кольца
+        label = self._ring_labels.pop(slot, None)
+        if label is not None:
+            del self._ring_slots[label]
+            if self._ring is not None:
+                self._ring.remove(label)
+        if self._aggregates is not None:
+            self._aggregates.detach(node, slot)
+        if isinstance(node, _StoredQueue):
+            self._loaded.pop(id(node), None)
+        if self._compact_ratio is not None and self.tombstones > self._compact_ratio * len(self._node_data):
+            return self.compact()
+        return None
+    
+    @property
+    def tombstones(self) -> int:
+        """Количество пустых позиций, оставшихся от удаленных очередей"""
+        return len(self._node_data) - self._live
+    
+    def compact(self) -> Dict[int, int]:
+        """Убирает пустые позиции и возвращает отображение прежних позиций в новые"""
+        remap = {}
+        node_data = []
+        for slot, node in enumerate(self._node_data):
+            if node is not None:
+                remap[slot] = len(node_data)
+                node_data.append(node)
+        self._node_data = node_data
+        self._restore_names({name: remap[slot] for name, slot in self._names.items()})
+        # Метки на кольце не меняются, поэтому уплотнение не перемещает ключи
+        self._ring_labels = {remap[slot]: label for slot, label in self._ring_labels.items()}
+        self._ring_slots = {label: slot for slot, label in self._ring_labels.items()}
+        if self._aggregates is not None:
+            self._aggregates.remap(remap)
+        self._epoch += 1
+        return remap
+    
+    def _restore_names(self, names: Dict[str, int]) -> None:
+        """Заполняет индекс имен по отображению имя - позиция"""
+        self._names = dict(names)
+        self._slot_names = {slot: name for name, slot in self._names.items()}
+    
+    def _compact_names(self) -> Dict[str, int]:
+        """Позиции именованных очередей после уплотнения, без изменения самой коллекции"""
+        positions = {}
+        live = 0
+        for slot, node in enumerate(self._node_data):
+            if node is not None:
+                positions[slot] = live
+                live += 1
+        return {name: positions[slot] for name, slot in self._names.items()}
+    
+    def _ring_add(self, slot: int) -> None:
+        """Ставит очередь на кольцо под постоянной меткой: сохраненной, имени или порядковым номером"""
+        label = self._ring_labels.get(slot)
+        if label is None:
+            name = self._slot_names.get(slot)
+            if name is not None:
+                label = f'name:{name}'
+            else:
+                label = f'#{self._ring_serial}'
+                self._ring_serial += 1
+        self._ring_labels[slot] = label
+        self._ring_slots[label] = slot
+        self._ring.add(label)
+    
+    def _ring_state(self, slots: Iterable[int]) -> Dict[str, Any]:
+        """Метки кольца для позиций slots (None - очередь без метки) и счетчик номеров для сохранения"""
+        return {'labels': [self._ring_labels.get(slot) for slot in slots], 'serial': self._ring_serial}
+    
+    def _restore_ring(self, ring: Optional[Dict[str, Any]]) -> None:
+        """Восстанавливает сохраненные метки; кольцо по ним строится при первом route"""
+        if not ring:
+            return
+        self._ring_labels = {slot: label for slot, label in enumerate(ring['labels']) if label is not None}
+        self._ring_slots = {label: slot for slot, label in self._ring_labels.items()}
+        self._ring_serial = ring['serial']
+    
+    def route(self, key: Any, item: Any) -> int:
+        """Кладет элемент в очередь, выбранную согласованным хешированием ключа: один ключ - одна очередь"""
+        if self._ring is None:
+            self._ring = HashRing(self._ring_vnodes)
+            for slot, node in enumerate(self._node_data):
+                if node is not None:
+                    self._ring_add(slot)
+        label = self._ring.lookup(key)
+        slot = self._ring_slots[label]
+        self._resolve(slot).enqueue(item)
+        self._routed[label] += 1
+        return slot
+    
+    def route_stats(self) -> Dict[str, Any]:
+        """Баланс маршрутизации: элементы по очередям, отношение максимума к среднему, доли кольца"""
+        routed = {self._ring_slots[label]: count for label, count in self._routed.items()
+                  if label in self._ring_slots}
+        total = sum(routed.values())
+        mean = total / len(self._ring_slots) if self._ring_slots else 0
+        ownership = self._ring.ownership() if self._ring is not None else {}
+        return {
+            'routed': total,
+            'per_queue': routed,
+            'max_over_mean': max(routed.values(), default=0) / mean if mean else 0.0,
+            'ownership_min': min(ownership.values(), default=0.0),
+            'ownership_max': max(ownership.values(), default=0.0),
+        }
+    
+    def _tracked(self) -> CollectionAggregates:
+        """Агрегаты коллекции; при первом обращении подписывается на все очереди за O(n)"""
+        if self._aggregates is None:
+            if self._directory is not None:
+                raise ValueError("Aggregates require an in-memory collection")
+            self._aggregates = CollectionAggregates()
+            for slot, node in enumerate(self._node_data):
+                if node is not None:
+                    self._aggregates.attach(node, slot)
+        return self._aggregates
+    
+    @property
+    def total_items(self) -> int:
+        """Общее количество элементов во всех очередях за O(1)"""
+        return self._tracked().total
+    
+    @property
+    def full_count(self) -> int:
+        """Количество заполненных до max_size очередей за O(1)"""
+        return self._tracked().full
+    
+    def fullest(self) -> Optional[int]:
+        """Позиция очереди с наибольшим числом элементов за амортизированное O(log n)"""
+        return self._tracked().fullest()
+    
+    def emptiest(self) -> Optional[int]:
+        """Позиция очереди с наименьшим числом элементов за амортизированное O(log n)"""
+        return self._tracked().emptiest()
+    
+    def aggregates(self) -> Dict[str, Any]:
+        """Сводка для мониторинга: очереди, элементы, полные очереди, самая полная и самая пустая"""
+        tracked = self._tracked()
+        fullest, emptiest = tracked.fullest(), tracked.emptiest()
+        return {
+            'queues': len(self),
+            'items': tracked.total,
+            'full': tracked.full,
+            'fullest': fullest,
+            'fullest_size': None if fullest is None else self._node_data[fullest].size,
+            'emptiest': emptiest,
+            'emptiest_size': None if emptiest is None else self._node_data[emptiest].size,
+        }
+    
+    @property
+    def loaded_count(self) -> int:
+        """Количество очередей шардированной коллекции, находящихся в памяти"""
+        if self._directory is None:
+            return len(self)
+        return len(self._loaded)
+    
+    def _fetch(self, stored: _StoredQueue) -> 'Queue':
+        """Возвращает очередь, загружая её запись из шарда при необходимости"""
+        if stored.queue is None:
+            # Вытесненная очередь, на которую еще есть ссылки, возвращается тем же объектом со всеми изменениями
+            queue = stored.resident()
+            if queue is None:
+                record = collection_shards.read_record(self._directory, stored.file, stored.offset, stored.length)
+                data = collection_shards.decode_queue(record)
+                queue = Queue(max_size=data['max_size'])
+                queue._items = data['items']
+                stored.version = queue._version
+            stored.queue = queue
+            stored.ref = None
+        self._touch(stored)
+        return stored.queue
+    
+    def _touch(self, stored: _StoredQueue) -> None:
+        """Отмечает обращение к очереди и вытесняет давно не используемые сверх лимита"""
+        self._loaded[id(stored)] = stored
+        self._loaded.move_to_end(id(stored))
+        if self._max_loaded is not None:
+            while len(self._loaded) > self._max_loaded:
+                _, oldest = self._loaded.popitem(last=False)
+                self._evict(oldest)
     
-    def save(self, filename: str) -> None:
-        """Сохранение коллекции в JSON-файл"""
+    def _evict(self, stored: _StoredQueue) -> None:
+        """Выгружает очередь из памяти; измененная очередь сначала дописывается в свой шард"""
+        if stored.dirty:
+            self._write_back(stored)
+        # Изменения через оставшиеся у вызывающего кода ссылки увидят save и следующее обращение
+        stored.ref = weakref.ref(stored.queue)
+        stored.queue = None
+    
+    def _write_back(self, stored: _StoredQueue) -> None:
+        """Дописывает новую запись очереди в конец шарда и перенаправляет на неё ссылку"""
+        queue = stored.resident()
+        record = collection_shards.encode_queue(queue._max_size, queue._items)
+        if stored.file is None:
+            stored.file = collection_shards.shard_name(self._generation, 0)
+        stored.offset = collection_shards.append_record(self._directory, stored.file, record)
+        stored.length = len(record)
+        stored.max_size = queue._max_size
+        stored.size = queue.size
+        stored.version = queue._version
+    
+    def _index_entries(self) -> List[Optional[list]]:
+        """Строит записи индекса по текущему положению очередей в шардах; удаленным соответствует None"""
+        return [None if node is None else [node.file, node.offset, node.length, node.max_size, node.size]
+                for node in self._node_data]
+    
+    def save(self, filename: Optional[str] = None, codec: str = 'json') -> None:
+        """Сохранение коллекции в файл: JSON, 'pickle' или 'struct'; без имени - дописывание измененных очередей в шарды"""
+        if filename is None:
+            if self._directory is None:
+                raise ValueError("Collection is not bound to a sharded directory")
+            for node in self._node_data:
+                if node is not None and node.dirty:
+                    self._write_back(node)
+            collection_shards.write_index(self._directory, self._generation, self._index_entries(), self._names,
+                                          self._sharded_ring())
+            return
+        # В файл попадают только живые очереди, позиции имен пересчитываются как после уплотнения
         data = {
             'queues': [
                 {
                     'max_size': queue._max_size,
                     'items': queue._items
                 }
-                for queue in self._node_data
+                for queue in self
             ]
         }
-        with open(filename, 'w') as f:
-            json.dump(data, f)
+        if self._names:
+            data['names'] = self._compact_names()
+        if self._ring_labels:
+            # Метки сохраняются по живым очередям, чтобы после загрузки ключи попадали в те же очереди
+            data['ring'] = self._ring_state(slot for slot, node in enumerate(self._node_data) if node is not None)
+        queue_codecs.dump(data, filename, codec)
+    
+    def _sharded_ring(self) -> Optional[Dict[str, Any]]:
+        """Метки кольца для индекса шардов: по всем позициям, включая надгробия"""
+        return self._ring_state(range(len(self._node_data))) if self._ring_labels else None
+    
+    def _records(self) -> List[tuple]:
+        """Записи живых очередей с позицией, max_size и размером: невыгруженные копируются из шардов без разбора"""
+        records = []
+        for slot, node in enumerate(self._node_data):
+            if node is None:
+                continue
+            if isinstance(node, _StoredQueue):
+                queue = node.resident()
+                if queue is None:
+                    record = collection_shards.read_record(self._directory, node.file, node.offset, node.length)
+                    records.append((slot, record, node.max_size, node.size))
+                    continue
+                node = queue
+            records.append((slot, (node._max_size, node._items), node._max_size, node.size))
+        return records
+    
+    def save_sharded(self, directory: str, queues_per_shard: int = 256, workers: int = 1,
+                     processes: bool = True) -> None:
+        """Сохраняет коллекцию в каталог: индекс и шарды по queues_per_shard очередей, кодируемые в workers процессах"""
+        if queues_per_shard < 1:
+            raise ValueError("queues_per_shard must be positive")
+        os.makedirs(directory, exist_ok=True)
+        generation = 0
+        if os.path.exists(os.path.join(directory, collection_shards.INDEX_NAME)):
+            generation = collection_shards.read_index(directory)['generation'] + 1
+        records = self._records()
+        chunks = [records[start:start + queues_per_shard]
+                  for start in range(0, max(len(records), 1), queues_per_shard)]
+        names = [collection_shards.shard_name(generation, number) for number in range(len(chunks))]
+        # Каждый шард кодируется и записывается независимо; длины записей возвращаются по порядку,
+        # поэтому результат побайтно совпадает с однопоточным сохранением
+        tasks = [(os.path.join(directory, name), [record for _, record, _, _ in chunk])
+                 for name, chunk in zip(names, chunks)]
+        shard_lengths = collection_shards.run_tasks(collection_shards.write_shard, tasks, workers, processes)
+        # Позиции сохраняются вместе с надгробиями, чтобы номера очередей не менялись после открытия
+        entries: List[Optional[list]] = [None] * len(self._node_data)
+        for name, chunk, lengths in zip(names, chunks, shard_lengths):
+            offset = 0
+            for length, (slot, _, max_size, size) in zip(lengths, chunk):
+                entries[slot] = [name, offset, length, max_size, size]
+                offset += length
+        # Новое поколение становится видимым одной атомарной заменой индекса
+        collection_shards.write_index(directory, generation, entries, self._names, self._sharded_ring())
+        if self._directory is not None and os.path.samefile(directory, self._directory):
+            self._rebind(generation, entries)
+        collection_shards.remove_stale_shards(directory, generation)
+    
+    def _rebind(self, generation: int, entries: List[Optional[list]]) -> None:
+        """Перенаправляет очереди на записи нового поколения шардов"""
+        self._generation = generation
+        for node, entry in zip(self._node_data, entries):
+            if node is None:
+                continue
+            node.file, node.offset, node.length, node.max_size, node.size = entry
+            queue = node.resident()
+            if queue is not None:
+                node.version = queue._version
+    
+    @classmethod
+    def open(cls, directory: str, max_loaded: Optional[int] = None) -> 'QueueCollection':
+        """Открывает шардированную коллекцию: очереди загружаются при обращении, сверх max_loaded вытесняются (LRU)"""
+        index = collection_shards.read_index(directory)
+        collection = cls([None if entry is None else _StoredQueue(*entry) for entry in index['queues']])
+        collection._restore_names(index.get('names', {}))
+        collection._restore_ring(index.get('ring'))
+        collection._directory = directory
+        collection._generation = index['generation']
+        collection._max_loaded = max_loaded
+        return collection
+    
+    @classmethod
+    def load_sharded(cls, directory: str, workers: int = 1, processes: bool = True) -> 'QueueCollection':
+        """Загружает все очереди шардированной коллекции сразу, декодируя шарды в workers процессах"""
+        index = collection_shards.read_index(directory)
+        spans = OrderedDict()
+        for position, entry in enumerate(index['queues']):
+            if entry is not None:
+                file, offset, length, _, _ = entry
+                spans.setdefault(file, []).append((position, offset, length))
+        tasks = [(os.path.join(directory, file), [(offset, length) for _, offset, length in entries])
+                 for file, entries in spans.items()]
+        results = collection_shards.run_tasks(collection_shards.read_shard, tasks, workers, processes)
+        queues: List[Optional[Queue]] = [None] * len(index['queues'])
+        for entries, shard in zip(spans.values(), results):
+            for (position, _, _), data in zip(entries, shard):
+                queue = Queue(max_size=data['max_size'])
+                queue._items = data['items']
+                queues[position] = queue
+        collection = cls(queues)
+        collection._restore_names(index.get('names', {}))
+        collection._restore_ring(index.get('ring'))
+        return collection
     
     @classmethod
-    def load(cls, filename: str) -> 'QueueCollection':
-        """Загрузка коллекции из JSON-файла"""
-        with open(filename, 'r') as f:
-            data = json.load(f)
+    def load(cls, filename: str, allow_pickle: bool = False) -> 'QueueCollection':
+        """Загрузка коллекции из файла с автоматическим определением формата; pickle - только с allow_pickle=True"""
+        data = queue_codecs.load(filename, allow_pickle)
         
         queues = []
         for queue_data in data['queues']:
             queue = Queue(max_size=queue_data['max_size'])
-            queue._items = queue_data['items']
+            queue._items = list(queue_data['items'])
             queues.append(queue)
         
-        return cls(queues)
+        collection = cls(queues)
+        collection._restore_names(data.get('names', {}))
+        collection._restore_ring(data.get('ring'))
+        return collection
     
 if __name__ == "__main__":
     # Создаем несколько очередей
@@ -193,4 +756,39 @@ if __name__ == "__main__":
     print(f"\nЗагруженная коллекция: {loaded_collection}")
     
     # 6. Проверка работы среза
-    print(f"\nПервый элемент загруженной коллекции: {loaded_collection[0]}")
\ No newline at end of file
+    print(f"\nПервый элемент загруженной коллекции: {loaded_collection[0]}")
+    
+    # 7. Шардированное хранение: очередь загружается при первом обращении
+    with tempfile.TemporaryDirectory() as directory:
+        big = QueueCollection()
+        for i in range(1000):
+            queue = Queue(max_size=10)
+            queue.enqueue(i)
+            big.add(queue)
+        big.save_sharded(directory, queues_per_shard=100)
+        lazy = QueueCollection.open(directory, max_loaded=3)
+        print(f"\nОчередь 500 шардированной коллекции: {lazy[500]}, загружено очередей: {lazy.loaded_count}")
+        lazy[500].enqueue(-1)
+        for i in range(10):
+            lazy[i]
+        lazy.save()
+        print(f"После вытеснения и сохранения: {QueueCollection.open(directory)[500]}")
+    
+    # 8. Именованные очереди, удаление без сдвига позиций и уплотнение
+    tenants = QueueCollection()
+    for tenant in ("alpha", "beta", "gamma"):
+        tenants.add(Queue(max_size=5), name=tenant)
+    tenants["beta"].enqueue("job")
+    tenants.remove("alpha")
+    print(f"\nПосле удаления alpha: {tenants}, beta по-прежнему на позиции {tenants.index_of('beta')}")
+    print(f"Уплотнение: {tenants.compact()}, beta теперь на позиции {tenants.index_of('beta')}: {tenants['beta']}")
+    
+    # 9. Маршрутизация по ключу: элементы одного ключа попадают в одну очередь
+    for user in ("ann", "bob", "ann", "cid", "ann"):
+        tenants.route(user, f"{user}-event")
+    print(f"\nМаршрутизация по ключу: {[str(queue) for queue in tenants]}, {tenants.route_stats()['per_queue']}")
+    
+    # 10. Сводка по коллекции без перебора очередей
+    print(f"\nСводка по коллекции: {tenants.aggregates()}")
+    tenants["beta"].clear()
+    print(f"После очистки beta: всего элементов {tenants.total_items}, самая полная очередь {tenants.fullest()}")